@@ -0,0 +1,500 @@
+"""
+Бенчмарки отрисовки Eco Ranger
+
+Запуск: python bench.py blit [--levels 1,2,3] [--repeats 200]
+        python bench.py backend [--levels 1,2,3] [--frames 300] [--scale 1.0]
+        python bench.py blits [--sizes 100,1000,10000] [--repeats 50]
+        python bench.py ysort [--sizes 100,1000,10000] [--frames 200] [--moving 0.05]
+        python bench.py suite [--frames 600] [--seed 1] [--scenarios ...] [--output bench_output.json]
+        python bench.py sprites [--repeats 50] [--sort draw|update|construct] [--classes Trash,Obstacle,...]
+По умолчанию работает в безоконном режиме игры (ECO_RANGER_HEADLESS=1).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import time
+
+os.environ.setdefault("ECO_RANGER_HEADLESS", "1")
+
+import numpy as np
+import pygame
+
+import main
+
+
+def parse_list(text):
+    """"1,2,3" -> [1, 2, 3]"""
+    return [int(item) for item in text.split(",")]
+
+
+def load_level(level):
+    """Игра с загруженным уровнем"""
+    game = main.Game()
+    game.current_level = level
+    game.load_level(level)
+    game.state = main.GameState.PLAYING
+    return game
+
+
+def unconverted_copy(image):
+    """Копия в формате по умолчанию, как до SurfaceFactory (без convert и RLE)"""
+    copy = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    copy.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    return copy
+
+
+def converted_copy(image):
+    """Копия в формате экрана без RLE"""
+    return unconverted_copy(image).convert_alpha()
+
+
+def time_blits(screen, batch, repeats):
+    """Сколько блитов в секунду выдает список (поверхность, позиция)"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for image, pos in batch:
+            screen.blit(image, pos)
+    elapsed = time.perf_counter() - start
+    return len(batch) * repeats / elapsed, elapsed / repeats * 1000
+
+
+def bench_blit(levels, repeats):
+    """Пропускная способность блита спрайтов уровня: до и после SurfaceFactory"""
+    print(f"{'уровень':>7} {'вариант':>14} {'спрайтов':>8} {'блит/с':>10} {'мс/проход':>10}")
+    for level in levels:
+        game = load_level(level)
+        screen = game.screen
+        width, height = screen.get_size()
+
+        # Все спрайты мира, сдвинутые на экран
+        sprites = [sprite for sprite in game.all_sprites if sprite.image.get_width() < width]
+        positions = [(sprite.rect.x % (width - sprite.rect.width), sprite.rect.y % (height - sprite.rect.height))
+                     for sprite in sprites]
+        variants = {
+            "unconverted": [unconverted_copy(sprite.image) for sprite in sprites],
+            "convert_alpha": [converted_copy(sprite.image) for sprite in sprites],
+            "factory": [sprite.image for sprite in sprites],
+        }
+
+        for name, images in variants.items():
+            batch = list(zip(images, positions))
+            time_blits(screen, batch, 5)  # Прогрев (RLE кодируется при первом блите)
+            rate, ms = time_blits(screen, batch, repeats)
+            print(f"{level:>7} {name:>14} {len(batch):>8} {rate:>10.0f} {ms:>10.3f}")
+
+
+def bench_blits(sizes, repeats):
+    """Блит по одному спрайту против одного Surface.blits на слой"""
+    game = load_level(3)
+    screen = game.screen
+    width, height = screen.get_size()
+    images = [sprite.image for sprite in game.all_sprites if sprite.image.get_width() < width]
+
+    print(f"{'спрайтов':>8} {'blit, мс':>9} {'blits, мс':>10} {'ускорение':>10}")
+    for size in sizes:
+        rng = random.Random(size)
+        batch = [(images[i % len(images)], (rng.uniform(0, width - 64), rng.uniform(0, height - 64)))
+                 for i in range(size)]
+
+        def one_by_one():
+            for image, pos in batch:
+                screen.blit(image, pos)
+
+        def batched():
+            screen.blits(batch, doreturn=False)
+
+        results = []
+        for draw in (one_by_one, batched):
+            draw()  # Прогрев
+            start = time.perf_counter()
+            for _ in range(repeats):
+                draw()
+            results.append((time.perf_counter() - start) / repeats * 1000)
+        print(f"{size:>8} {results[0]:>9.3f} {results[1]:>10.3f} {results[0] / results[1]:>9.2f}x")
+
+
+class Actor(pygame.sprite.Sprite):
+    """Спрайт-заглушка слоя персонажей для бенчмарка сортировки"""
+    layer = main.RenderLayer.ACTORS
+
+    def __init__(self, rng, moving):
+        super().__init__()
+        self.rect = pygame.Rect(rng.randrange(main.WORLD_WIDTH), rng.randrange(main.WORLD_HEIGHT), 32, 40)
+        self.moving = moving
+
+
+def bench_ysort(sizes, frames, moving_share):
+    """Полная сортировка видимых каждый кадр против DepthBands (кадр: движение, refresh, выборка)"""
+    layer = main.RenderLayer.ACTORS
+    print(f"{'актеров':>8} {'sort, мс':>9} {'depth, мс':>10} {'ускорение':>10}")
+    for size in sizes:
+        rng = random.Random(size)
+        actors = [Actor(rng, i < size * moving_share) for i in range(size)]
+        movers = [actor for actor in actors if actor.moving]
+        view = pygame.Rect(600, 350, main.SCREEN_WIDTH + 2, main.SCREEN_HEIGHT + 2)
+
+        # Одинаковая группа без DepthBands - прежний путь с сортировкой видимых
+        sorted_group = main.IndexedGroup()
+        sorted_group.depth = {}
+        sorted_group.add(*actors)
+        depth_group = main.IndexedGroup(*actors)
+
+        results = []
+        for group in (sorted_group, depth_group):
+            start = time.perf_counter()
+            for frame in range(frames):
+                for actor in movers:
+                    actor.rect.y += 2 if frame % 40 < 20 else -2
+                group.refresh()
+                group.visible(view, layer)
+            results.append((time.perf_counter() - start) / frames * 1000)
+        print(f"{size:>8} {results[0]:>9.3f} {results[1]:>10.3f} {results[0] / results[1]:>9.2f}x")
+
+
+def time_frames(game, frames):
+    """Средняя длительность update + draw одного кадра, мс"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.update()
+        game.draw()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_backend(levels, frames, scale):
+    """Кадр игрового процесса на бэкендах surface и texture (SDL2 Renderer)"""
+    print(f"{'уровень':>7} {'бэкенд':>8} {'мс/кадр':>9} {'загрузок':>9}")
+    for level in levels:
+        for backend in ("surface", "texture"):
+            random.seed(level)
+            game = load_level(level)
+            game.renderer = game.create_renderer(backend)
+            game.set_render_scale(scale)
+            if backend == "texture" and game.renderer is game.surface_renderer:
+                print(f"{level:>7} {backend:>8} {'недоступен':>9}")
+                continue
+            time_frames(game, 10)  # Прогрев: загрузка текстур и кэши
+            ms = time_frames(game, frames)
+            uploads = getattr(game.renderer, "uploads", 0)
+            print(f"{level:>7} {backend:>8} {ms:>9.3f} {uploads:>9}")
+
+
+def unblock_river(game):
+    """Убрать мусор из ручья: следующий шаг разблокирует его и запустит катсцену"""
+    for trash in [trash for trash in game.trash_group if trash.river_trash]:
+        main.EntityPool.release(trash)
+
+
+def deliver_at_max_combo(game):
+    """Каждый кадр сдавать полную сумку на станции при комбо x5 с тряской и вспышкой"""
+    player = game.player
+    player.carrying_trash = player.max_trash
+    player.rect.center = game.recycling_station.rect.center
+    game.combo_count = max(game.combo_count, 24)
+    game.combo_multiplier = 5.0
+    game.combo_timer = game.combo_max_time
+    game.screen_shake = 15
+    game.flash_color = (255, 100, 255)
+    game.flash_alpha = 50
+
+
+def fill_litter_caps(game):
+    """Прогнать шаги, пока каждый мусорщик не выбросит мусор до своего лимита"""
+    while any(litterer.trash_spawned < litterer.max_trash_spawned for litterer in game.litterers_group):
+        for litterer in game.litterers_group:
+            litterer.litter_timer = 0
+            litterer.stunned = False
+        game.update()
+
+
+# Сценарий: (уровень, подготовка один раз, действие перед каждым кадром)
+SCENARIOS = {
+    "level1": (1, None, None),
+    "level2": (2, None, None),
+    "level3": (3, None, None),
+    "river_cutscene": (1, unblock_river, None),
+    "max_combo_delivery": (2, None, deliver_at_max_combo),
+    "desert_litter_cap": (3, fill_litter_caps, None),
+}
+PHASES = ("events", "update", "draw", "frame")
+
+
+def summarize(samples):
+    """mean/p50/p95/p99/max в миллисекундах"""
+    values = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def run_scenario(name, frames, seed):
+    """Сыграть сценарий по HEADLESS_SCRIPT, замеряя фазы каждого кадра"""
+    level, setup, before_frame = SCENARIOS[name]
+    random.seed(seed)
+    game = load_level(level)
+    if setup:
+        setup(game)
+
+    samples = {phase: [] for phase in PHASES}
+    states = {}
+    script = main.InputSource.script = main.ScriptedInput()
+    try:
+        for _ in range(frames):
+            if before_frame:
+                before_frame(game)
+            script.advance()
+            start = time.perf_counter()
+            game.handle_events()
+            events_done = time.perf_counter()
+            game.update()
+            update_done = time.perf_counter()
+            game.draw()
+            draw_done = time.perf_counter()
+
+            samples["events"].append(events_done - start)
+            samples["update"].append(update_done - events_done)
+            samples["draw"].append(draw_done - update_done)
+            samples["frame"].append(draw_done - start)
+            states[game.state.name] = states.get(game.state.name, 0) + 1
+    finally:
+        main.InputSource.script = None
+
+    return {
+        "level": level,
+        "frames": frames,
+        "states": states,
+        "phases": {phase: summarize(values) for phase, values in samples.items()},
+    }
+
+
+def bench_suite(names, frames, seed, output):
+    """Все сценарии подряд, результат - JSON в output"""
+    result = {
+        "meta": {
+            "frames": frames,
+            "seed": seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "video_driver": pygame.display.get_driver(),
+            "render_backend": main.RENDER_BACKEND,
+            "render_scale": main.RENDER_SCALE,
+        },
+        "scenarios": {},
+    }
+    print(f"{'сценарий':>20} {'фаза':>7} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}")
+    for name in names:
+        scenario = run_scenario(name, frames, seed)
+        result["scenarios"][name] = scenario
+        for phase, stats in scenario["phases"].items():
+            print(f"{name:>20} {phase:>7} " + " ".join(f"{stats[key]:>7.3f}" for key in ("mean", "p50", "p95", "p99", "max")))
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"Записано в {output}")
+
+
+TRASH_TYPES = ("plastic", "bottle", "can", "paper", "glass", "metal")
+TRASH_RARITIES = ("normal", "golden", "dangerous")
+OBSTACLE_TYPES = ("tree", "tree_big", "tree_small", "building", "toxic", "cactus")
+# Декорации по уровням, как их расставляет load_level
+DECORATION_TYPES = {
+    1: ("bush", "rock", "flower", "mushroom"),
+    2: ("streetlight", "bench", "sign", "hydrant"),
+    3: ("small_rock", "skull", "dead_tree", "tumbleweed"),
+}
+
+
+def blank(sprite):
+    """Чистый холст вместо запеченного образа - для процедур, рисующих в self.image"""
+    sprite.image = main.SurfaceFactory.create(sprite.image.get_size())
+    return sprite
+
+
+def stunned(litterer):
+    """Оглушенный мусорщик (рисует звездочки)"""
+    litterer.stunned = True
+    litterer.stun_timer = 10 ** 9
+    return litterer
+
+
+def flowing(segment):
+    """Ручей после расчистки"""
+    segment.start_flowing()
+    return segment
+
+
+def sprite_cases(game):
+    """Варианты спрайтов: (класс, вариант, создание, подготовка к отрисовке, отрисовка без кэша)"""
+    player = game.player
+    quest = main.Quest(99, "Бенчмарк", 0, "bins")
+    keep = lambda sprite: sprite
+    cases = []
+
+    for tractor in (False, True):
+        for direction in range(4):
+            def make(direction=direction, tractor=tractor):
+                sprite = main.Player(400, 300, game)
+                sprite.direction = direction
+                sprite.has_tractor = tractor
+                return sprite
+            cases.append(("Player", f"dir={direction}{' tractor' if tractor else ''}", make, keep,
+                          lambda sprite: sprite.render_character(0)))
+
+    for trash_type in TRASH_TYPES:
+        for rarity in TRASH_RARITIES:
+            for needs_drone in (False, True):
+                for river_trash in (False, True):
+                    variant = " ".join([trash_type, rarity] + ["drone"] * needs_drone + ["river"] * river_trash)
+                    cases.append(("Trash", variant,
+                                  lambda t=trash_type, r=rarity, d=needs_drone, w=river_trash:
+                                      main.Trash(400, 300, t, 1, d, w, r),
+                                  keep, lambda sprite: sprite.render_frame(0)))
+
+    for obs_type in OBSTACLE_TYPES:
+        if obs_type == "toxic":
+            cases.append(("Obstacle", obs_type, lambda: main.Obstacle(400, 300, "toxic"), keep,
+                          lambda sprite: sprite.render_frame(0)))
+        else:
+            cases.append(("Obstacle", obs_type, lambda t=obs_type: main.Obstacle(400, 300, t), blank,
+                          lambda sprite: sprite.draw_obstacle()))
+
+    for level, deco_types in DECORATION_TYPES.items():
+        for deco_type in deco_types:
+            cases.append(("Decoration", deco_type, lambda t=deco_type, l=level: main.Decoration(400, 300, t, l),
+                          blank, lambda sprite: sprite.draw_decoration()))
+
+    for orientation, size in (("horizontal", (400, 80)), ("vertical", (80, 400))):
+        cases.append(("Road", orientation, lambda o=orientation, s=size: main.Road(0, 0, *s, o), keep,
+                      lambda sprite: sprite.draw_road()))
+
+    for blockage in (False, True):
+        label = " blockage" if blockage else ""
+        cases.append(("RiverSegment", "stagnant" + label,
+                      lambda b=blockage: main.RiverSegment(0, 0, 120, 100, is_blockage_point=b), blank,
+                      lambda sprite: sprite.draw_stagnant(random.Random(1))))
+    cases.append(("RiverSegment", "flowing", lambda: main.RiverSegment(0, 0, 120, 100, flowing=True), keep,
+                  lambda sprite: sprite.render_flow_frame(sprite.width, sprite.height, 0)))
+
+    for is_stunned in (False, True):
+        cases.append(("Litterer", "stunned" if is_stunned else "walking",
+                      lambda: main.Litterer(400, 300, main.WORLD_WIDTH, main.WORLD_HEIGHT), stunned if is_stunned else keep,
+                      lambda sprite: sprite.render_litterer(45 if sprite.stunned else 0)))
+
+    for has_quest in (True, False):
+        def make(has_quest=has_quest):
+            sprite = main.QuestGiver(400, 300, quest)
+            sprite.has_quest = has_quest
+            return sprite
+        cases.append(("QuestGiver", "quest" if has_quest else "done", make, keep,
+                      lambda sprite: sprite.render_npc(25 if sprite.has_quest else 0)))
+
+    for collected in (False, True):
+        def make(collected=collected):
+            sprite = main.QuestObjective(400, 300, quest.quest_id)
+            sprite.collected = collected
+            return sprite
+        cases.append(("QuestObjective", "collected" if collected else "active", make, keep,
+                      lambda sprite: sprite.render_frame(0)))
+
+    cases += [
+        ("RecyclingStation", "", lambda: main.RecyclingStation(400, 300), keep, lambda sprite: sprite.render_frame(0)),
+        ("HealingStation", "", lambda: main.HealingStation(400, 300), keep, lambda sprite: sprite.render_frame(0)),
+        ("PoisonPlant", "", lambda: main.PoisonPlant(400, 300), keep, lambda sprite: sprite.render_frame(0)),
+        ("Drone", "", lambda: main.Drone(player), keep, lambda sprite: sprite.draw_drone()),
+        ("AdvancedDrone", "", lambda: main.AdvancedDrone(player), keep, lambda sprite: sprite.draw_drone()),
+        ("NPC", "", lambda: main.NPC(400, 300), keep, lambda sprite: sprite.render_npc()),
+        ("GrassTile", "", lambda: main.GrassTile(400, 300), blank, lambda sprite: sprite.draw_grass()),
+        ("House", "", lambda: main.House(400, 300), blank, lambda sprite: sprite.draw_house()),
+        ("CelebratingVillager", "", lambda: main.CelebratingVillager(400, 300), keep,
+         lambda sprite: sprite.render_villager(0)),
+    ]
+    return cases
+
+
+def time_call(call, repeats):
+    """Среднее время вызова, мкс"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def bench_sprites(classes, repeats, sort):
+    """Создание, update и процедурная отрисовка каждого варианта спрайта по отдельности"""
+    game = load_level(1)
+    rows = []
+    for name, variant, make, prepare, draw in sprite_cases(game):
+        if classes and name not in classes:
+            continue
+        # Первое создание заполняет FrameAtlas / CharacterSheet - дальше меряем путь из игры
+        sprite = prepare(make())
+        construct = time_call(make, repeats)
+        update = time_call(sprite.update, repeats)
+        sprite = prepare(make())
+        draw_time = time_call(lambda: draw(sprite), repeats)
+        rows.append((name, variant, construct, update, draw_time))
+
+    column = {"construct": 2, "update": 3, "draw": 4}[sort]
+    rows.sort(key=lambda row: row[column], reverse=True)
+    print(f"{'#':>3} {'класс':>19} {'вариант':>28} {'создание, мкс':>14} {'update, мкс':>12} {'отрисовка, мкс':>15}")
+    for rank, (name, variant, construct, update, draw_time) in enumerate(rows, 1):
+        print(f"{rank:>3} {name:>19} {variant:>28} {construct:>14.1f} {update:>12.1f} {draw_time:>15.1f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Бенчмарки отрисовки Eco Ranger")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    blit = sub.add_parser("blit", help="блит спрайтов уровня до и после конвертации поверхностей")
+    blit.add_argument("--levels", default="1,2,3")
+    blit.add_argument("--repeats", type=int, default=200)
+
+    backend = sub.add_parser("backend", help="кадр игрового процесса: блит на Surface против текстур SDL2")
+    backend.add_argument("--levels", default="1,2,3")
+    backend.add_argument("--frames", type=int, default=300)
+    backend.add_argument("--scale", type=float, default=1.0)
+
+    blits = sub.add_parser("blits", help="blit по одному против Surface.blits при 100/1k/10k спрайтов")
+    blits.add_argument("--sizes", default="100,1000,10000")
+    blits.add_argument("--repeats", type=int, default=50)
+
+    ysort = sub.add_parser("ysort", help="сортировка слоя персонажей: каждый кадр против DepthBands")
+    ysort.add_argument("--sizes", default="100,1000,10000")
+    ysort.add_argument("--frames", type=int, default=200)
+    ysort.add_argument("--moving", type=float, default=0.05, help="доля движущихся актеров")
+
+    suite = sub.add_parser("suite", help="время кадра по фазам для уровней и стресс-сценариев (JSON)")
+    suite.add_argument("--frames", type=int, default=600)
+    suite.add_argument("--seed", type=int, default=1)
+    suite.add_argument("--scenarios", default=",".join(SCENARIOS))
+    suite.add_argument("--output", default="bench_output.json")
+
+    sprites = sub.add_parser("sprites", help="создание, update и отрисовка каждого варианта спрайта (рейтинг)")
+    sprites.add_argument("--repeats", type=int, default=50)
+    sprites.add_argument("--sort", choices=("draw", "update", "construct"), default="draw")
+    sprites.add_argument("--classes", default="", help="только эти классы, через запятую")
+
+    args = parser.parse_args()
+    if args.command == "blit":
+        bench_blit(parse_list(args.levels), args.repeats)
+    elif args.command == "backend":
+        bench_backend(parse_list(args.levels), args.frames, args.scale)
+    elif args.command == "blits":
+        bench_blits(parse_list(args.sizes), args.repeats)
+    elif args.command == "ysort":
+        bench_ysort(parse_list(args.sizes), args.frames, args.moving)
+    elif args.command == "suite":
+        bench_suite(args.scenarios.split(","), args.frames, args.seed, args.output)
+    elif args.command == "sprites":
+        bench_sprites(set(filter(None, args.classes.split(","))), args.repeats, args.sort)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -4,43 +4,81 @@ ENHANCED GRAPHICS VERSION
 Максимальная графика для Pygame
 """
 
-import pygame
+import argparse
+import os
 import sys
+
+# Безоконный режим (--headless или ECO_RANGER_HEADLESS=1): заглушки SDL вместо окна и звука,
+# драйверы нужно выбрать до импорта pygame
+HEADLESS = "--headless" in sys.argv[1:] or os.environ.get("ECO_RANGER_HEADLESS", "0") not in ("", "0")
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
 import random
 import math
+import time
+import weakref
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from operator import attrgetter
 from enum import Enum
 
+import numpy as np
+
+try:
+    from pygame._sdl2 import video  # Рендерер и текстуры SDL2 (необязательный бэкенд)
+except ImportError:
+    video = None
+
 # Инициализация Pygame
 pygame.init()
 pygame.mixer.init()
 
-# Загрузка звуков
-try:
-    # Звуковые эффекты
-    sound_pickup = pygame.mixer.Sound('pickup.wav')
-    sound_trash_dump = pygame.mixer.Sound('trash_dump.wav')
-    sound_dash = pygame.mixer.Sound('dash.wav')
-    sound_poison = pygame.mixer.Sound('poison.wav')
-    sound_heal = pygame.mixer.Sound('heal.wav')
-    sound_button = pygame.mixer.Sound('button.wav')
-
-    # Устанавливаем громкость эффектов
-    sound_pickup.set_volume(0.3)
-    sound_trash_dump.set_volume(0.4)
-    sound_dash.set_volume(0.5)
-    sound_poison.set_volume(0.6)
-    sound_heal.set_volume(0.5)
-    sound_button.set_volume(0.3)
-
-    SOUNDS_ENABLED = True
-except:
-    SOUNDS_ENABLED = False
-    print("Не удалось загрузить звуки")
+# Загрузка звуков (в безоконном режиме не грузим)
+SOUNDS_ENABLED = False
+if not HEADLESS:
+    try:
+        # Звуковые эффекты
+        sound_pickup = pygame.mixer.Sound('pickup.wav')
+        sound_trash_dump = pygame.mixer.Sound('trash_dump.wav')
+        sound_dash = pygame.mixer.Sound('dash.wav')
+        sound_poison = pygame.mixer.Sound('poison.wav')
+        sound_heal = pygame.mixer.Sound('heal.wav')
+        sound_button = pygame.mixer.Sound('button.wav')
+
+        # Устанавливаем громкость эффектов
+        sound_pickup.set_volume(0.3)
+        sound_trash_dump.set_volume(0.4)
+        sound_dash.set_volume(0.5)
+        sound_poison.set_volume(0.6)
+        sound_heal.set_volume(0.5)
+        sound_button.set_volume(0.3)
+
+        SOUNDS_ENABLED = True
+    except:
+        print("Не удалось загрузить звуки")
 
 # Константы экрана
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 700
-FPS = 60
+FPS = 60  # Частота симуляции: Game.update идет фиксированным шагом 1/FPS, таймеры считают шаги
+RENDER_FPS = 60  # Ограничение частоты отрисовки (0 - без ограничения)
+PAUSED_FPS = 10  # Частота цикла на паузе и экране конца уровня
+MAX_CATCHUP_STEPS = 5  # Сколько шагов симуляции догоняем за один кадр на медленной машине
+
+# Внутренний буфер мира: доля логического экрана (0.5 - 600x350, пиксельный вид).
+# Камера охватывает столько же пикселей мира: при 0.5 это приближение x2 и видна
+# четверть прежней площади - меняется не только разрешение, но и обзор игрока
+RENDER_SCALE = 1.0
+
+# Окно: растягиваемое (SCALED сохраняет логические 1200x700) и полноэкранное
+WINDOW_RESIZABLE = True
+WINDOW_FULLSCREEN = False
+
+# Бэкенд отрисовки игрового процесса: "surface" (блит процессором) или "texture" (SDL2 Renderer)
+RENDER_BACKEND = "surface"
 
 # Размер мира (больше чем экран)
 WORLD_WIDTH = 2400
@@ -49,6 +87,50 @@ WORLD_HEIGHT = 1400
 # Размер тайла
 TILE_SIZE = 32
 
+# Размер чанка запеченной земли
+GROUND_CHUNK_SIZE = 512
+
+# Прозрачный цвет запеченных пропов
+PROP_COLORKEY = (255, 0, 255)
+
+# Буфер прокрутки фона: включен и запас вокруг экрана (поглощает тряску и мелкие сдвиги)
+SCROLL_BUFFER = True
+SCROLL_BUFFER_MARGIN = 64
+
+# Размер ячейки пространственного индекса
+SPATIAL_CELL_SIZE = 128
+
+# Частицы (ParticleSystem)
+MAX_PARTICLES = 10000
+MAX_PARTICLE_SIZE = 6
+WATER_PARTICLE_COLOR = (100, 180, 255)
+
+# Период волны фона меню в строках экрана (фаза sin(3y/H + t)) и отступ панели меню
+MENU_WAVE_PERIOD = round(math.pi * 2 * SCREEN_HEIGHT / 3)
+MENU_PANEL_Y = 50
+
+# Миникарта: размер и частота обновления точек
+MINIMAP_SIZE = 180
+MINIMAP_REFRESH_HZ = 10
+
+# RLE-сжатие статичных спрайтов с альфой (SurfaceFactory)
+SURFACE_RLE = True
+
+# Ширина полосы перезарядки Dash в HUD (виджет перерисовывается при смене заполнения на пиксель)
+DASH_BAR_WIDTH = 130
+
+# Сколько отрисованных строк держит TextCache
+TEXT_CACHE_SIZE = 512
+
+# Сколько облаков сообщений NPC держим отрисованными
+BUBBLE_CACHE_SIZE = 16
+
+# Количество кадров в цикле анимации пропов
+ANIMATION_FRAMES = 32
+
+# Варианты раскладки листьев ядовитого растения
+POISON_PLANT_VARIANTS = 4
+
 # Цвета
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -70,6 +152,14 @@ WATER_BLUE = (64, 164, 223)
 # Настройки игрока
 PLAYER_SPEED = 4
 
+# Сценарий безоконного прогона по кругу: (шагов, удерживаемые клавиши, нажатия в первом шаге)
+HEADLESS_SCRIPT = (
+    (90, (pygame.K_RIGHT,), (pygame.K_e,)),
+    (60, (pygame.K_DOWN,), (pygame.K_e, pygame.K_SPACE)),
+    (90, (pygame.K_LEFT,), (pygame.K_e, pygame.K_f)),
+    (60, (pygame.K_UP,), (pygame.K_e,)),
+)
+
 # Состояния игры
 class GameState(Enum):
     MENU = 1
@@ -80,31 +170,463 @@ class GameState(Enum):
     SHOP = 6
     CUTSCENE = 7
 
+# Состояния, в которых мир стоит и рисуется снимок кадра
+FROZEN_STATES = (GameState.PAUSE, GameState.LEVEL_COMPLETE)
+
+# Слои отрисовки (рисуются по порядку значений)
+class RenderLayer(Enum):
+    GROUND = 0  # Запеченная земля (GroundLayer)
+    WATER = 1  # Река
+    DECALS = 2  # Дороги и декорации под персонажами
+    ACTORS = 3  # Объекты и персонажи с сортировкой по Y
+    OVERLAY = 4  # Вспышки и облака сообщений
+    UI = 5  # HUD и миникарта
+
+# Слои, в которых живут спрайты мира
+SPRITE_LAYERS = (RenderLayer.WATER, RenderLayer.DECALS, RenderLayer.ACTORS)
+
+# Слои с постоянным порядком по глубине (DepthBands) вместо сортировки каждый кадр
+DEPTH_ORDERED_LAYERS = (RenderLayer.ACTORS,)
+
+# Ширина вертикальной полосы мира со своим DepthOrder (выборка видимых - только по полосам камеры)
+DEPTH_BAND_WIDTH = 256
+
+# Категории эффектов (бюджет частиц)
+class EffectCategory(Enum):
+    FEEDBACK = 0  # Отклик на действия игрока
+    WATER = 1  # Течение реки
+    DAMAGE = 2  # Урон и отравление
+    CELEBRATION = 3  # Сдача мусора, квесты
+
+# Лимит живых частиц по категориям (при качестве "high")
+EFFECT_BUDGETS = {
+    EffectCategory.FEEDBACK: 400,
+    EffectCategory.WATER: 1200,
+    EffectCategory.DAMAGE: 200,
+    EffectCategory.CELEBRATION: 600,
+}
+
+# Кто вытесняет кого при заполненном массиве (больше - важнее)
+EFFECT_PRIORITY = {
+    EffectCategory.DAMAGE: 3,
+    EffectCategory.FEEDBACK: 2,
+    EffectCategory.CELEBRATION: 1,
+    EffectCategory.WATER: 0,
+}
+
+# Множитель лимитов для уровней качества
+EFFECT_QUALITY_SCALE = {"low": 0.25, "medium": 0.5, "high": 1.0}
+EFFECT_QUALITY = "high"
+
+# Сколько новых частиц за кадр, остальное откладывается
+EFFECT_EMIT_PER_FRAME = 120
+
 class Camera:
-    """Класс камеры для плавного следования за игроком"""
+    """Класс камеры для плавного следования за игроком (width, height - размер буфера мира)"""
     def __init__(self, width, height):
         self.width = width
         self.height = height
         self.x = 0
         self.y = 0
+        self.previous = {}  # Спрайт -> позиция на прошлом шаге симуляции (для интерполяции)
+        self.alpha = 1.0  # Доля пути от прошлого шага к текущему
+
+    def interpolate(self, previous_pos, previous, alpha):
+        """Камера для отрисовки между прошлым и текущим шагом симуляции"""
+        camera = Camera(self.width, self.height)
+        camera.x = previous_pos[0] + (self.x - previous_pos[0]) * alpha
+        camera.y = previous_pos[1] + (self.y - previous_pos[1]) * alpha
+        camera.previous = previous
+        camera.alpha = alpha
+        return camera
+
+    def view_rect(self):
+        """Видимая область мира"""
+        return pygame.Rect(int(self.x), int(self.y), self.width, self.height)
 
     def apply(self, entity, shake_offset=(0, 0)):
-        """Применить смещение камеры к объекту (с учетом тряски)"""
-        return entity.rect.x - self.x + shake_offset[0], entity.rect.y - self.y + shake_offset[1]
+        """Применить смещение камеры к объекту (с учетом тряски и интерполяции)"""
+        x, y = entity.rect.x, entity.rect.y
+        previous = self.previous.get(entity)
+        if previous is not None:
+            x = previous[0] + (x - previous[0]) * self.alpha
+            y = previous[1] + (y - previous[1]) * self.alpha
+        return x - self.x + shake_offset[0], y - self.y + shake_offset[1]
 
     def update(self, target):
         """Обновить позицию камеры (плавное следование)"""
         # Центрируем камеру на цели
-        target_x = -target.rect.centerx + SCREEN_WIDTH // 2
-        target_y = -target.rect.centery + SCREEN_HEIGHT // 2
+        target_x = -target.rect.centerx + self.width // 2
+        target_y = -target.rect.centery + self.height // 2
 
         # Плавное движение камеры (всегда следует за персонажем)
         self.x += ((-target_x - self.x) * 0.1)
         self.y += ((-target_y - self.y) * 0.1)
 
+class SpatialGrid:
+    """Равномерная сетка для быстрого поиска спрайтов в области мира"""
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (col, row) -> множество спрайтов
+        self.sprite_cells = {}  # спрайт -> (col0, row0, col1, row1)
+
+    def cell_range(self, rect):
+        """Диапазон ячеек, которые покрывает прямоугольник"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, sprite):
+        """Добавить спрайт во все ячейки, которые он покрывает"""
+        cell_range = self.cell_range(sprite.rect)
+        self.sprite_cells[sprite] = cell_range
+        col0, row0, col1, row1 = cell_range
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                self.cells.setdefault((col, row), set()).add(sprite)
+
+    def remove(self, sprite):
+        """Убрать спрайт из индекса"""
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        col0, row0, col1, row1 = cell_range
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                cell = self.cells.get((col, row))
+                if cell is not None:
+                    cell.discard(sprite)
+                    if not cell:
+                        del self.cells[(col, row)]
+
+    def move(self, sprite):
+        """Переложить спрайт, только если он перешел в другую ячейку"""
+        if self.sprite_cells.get(sprite) != self.cell_range(sprite.rect):
+            self.remove(sprite)
+            self.insert(sprite)
+
+    def query(self, rect):
+        """Все спрайты из ячеек, пересекающихся с прямоугольником"""
+        col0, row0, col1, row1 = self.cell_range(rect)
+        found = set()
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                cell = self.cells.get((col, row))
+                if cell:
+                    found |= cell
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+class DepthOrder:
+    """Статичные спрайты слоя, всегда упорядоченные по rect.bottom (порядок отрисовки)
+
+    Спрайт вставляется один раз бинарным поиском и больше не сортируется.
+    """
+    def __init__(self):
+        self.sprites = []
+        self.keys = []  # rect.bottom, с которым спрайт стоит в списке
+        self.sprite_keys = {}
+        self.max_height = 0  # Для поиска по диапазону низов
+
+    def insert(self, sprite):
+        key = sprite.rect.bottom
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.sprites.insert(index, sprite)
+        self.sprite_keys[sprite] = key
+        self.max_height = max(self.max_height, sprite.rect.height)
+
+    def index(self, sprite):
+        """Позиция спрайта в списке (по сохраненному ключу)"""
+        index = bisect_left(self.keys, self.sprite_keys[sprite])
+        while self.sprites[index] is not sprite:
+            index += 1
+        return index
+
+    def remove(self, sprite):
+        if sprite not in self.sprite_keys:
+            return
+        index = self.index(sprite)
+        del self.keys[index]
+        del self.sprites[index]
+        del self.sprite_keys[sprite]
+
+    def visible(self, rect, inside=False):
+        """Спрайты, пересекающие область мира, уже в порядке отрисовки
+
+        inside - спрайты заведомо попадают в область по x (полоса внутри камеры).
+        """
+        keys, sprites = self.keys, self.sprites
+        first = bisect_right(keys, rect.top)
+        if not inside:
+            last = bisect_left(keys, rect.bottom + self.max_height, first)
+            return [sprite for sprite in sprites[first:last] if rect.colliderect(sprite.rect)]
+        # Низ внутри области - спрайт виден по y целиком, проверяем только хвост ниже области
+        middle = bisect_right(keys, rect.bottom, first)
+        last = bisect_left(keys, rect.bottom + self.max_height, middle)
+        return sprites[first:middle] + [sprite for sprite in sprites[middle:last] if sprite.rect.top < rect.bottom]
+
+    def clear(self):
+        self.sprites.clear()
+        self.keys.clear()
+        self.sprite_keys.clear()
+        self.max_height = 0
+
+
+class DepthBands:
+    """Порядок отрисовки слоя без сортировки всего видимого каждый кадр
+
+    Статичные спрайты лежат в DepthOrder своей вертикальной полосы мира (по rect.left),
+    выборка смотрит только полосы камеры. Движущиеся (moving = True) хранятся отдельно
+    и вливаются в готовые отрезки одной сортировкой (Timsort склеивает отрезки).
+    """
+    bottom = attrgetter("rect.bottom")
+
+    def __init__(self, band_width=DEPTH_BAND_WIDTH):
+        self.band_width = band_width
+        self.bands = {}  # Номер полосы -> DepthOrder
+        self.sprite_bands = {}
+        self.moving = set()
+        self.max_width = 0  # Спрайт из левой полосы может заходить в правую
+
+    def insert(self, sprite):
+        if getattr(sprite, 'moving', False):
+            self.moving.add(sprite)
+            return
+        band = sprite.rect.left // self.band_width
+        order = self.bands.get(band)
+        if order is None:
+            order = self.bands[band] = DepthOrder()
+        order.insert(sprite)
+        self.sprite_bands[sprite] = band
+        self.max_width = max(self.max_width, sprite.rect.width)
+
+    def remove(self, sprite):
+        self.moving.discard(sprite)
+        band = self.sprite_bands.pop(sprite, None)
+        if band is not None:
+            self.bands[band].remove(sprite)
+
+    def visible(self, rect):
+        """Спрайты, пересекающие область мира, уже в порядке отрисовки"""
+        width = self.band_width
+        visible_sprites = []
+        runs = 0
+        for band in range((rect.left - self.max_width) // width, (rect.right - 1) // width + 1):
+            order = self.bands.get(band)
+            if order is not None:
+                visible_sprites += order.visible(rect, rect.left <= band * width and (band + 1) * width <= rect.right)
+                runs += 1
+        moving = [sprite for sprite in self.moving if rect.colliderect(sprite.rect)]
+        if moving or runs > 1:
+            visible_sprites += moving
+            visible_sprites.sort(key=self.bottom)
+        return visible_sprites
+
+    def clear(self):
+        self.bands.clear()
+        self.sprite_bands.clear()
+        self.moving.clear()
+        self.max_width = 0
+
+
+class IndexedGroup(pygame.sprite.Group):
+    """Группа спрайтов с пространственным индексом по слоям (обновляется при add/kill)"""
+    def __init__(self, *sprites):
+        self.grids = {layer: SpatialGrid() for layer in SPRITE_LAYERS}
+        self.depth = {layer: DepthBands() for layer in DEPTH_ORDERED_LAYERS}
+        self.moving = set()  # Спрайты с moving = True, их перекладываем в refresh()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grids[sprite.layer].insert(sprite)
+        if sprite.layer in self.depth:
+            self.depth[sprite.layer].insert(sprite)
+        if getattr(sprite, 'moving', False):
+            self.moving.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grids[sprite.layer].remove(sprite)
+        if sprite.layer in self.depth:
+            self.depth[sprite.layer].remove(sprite)
+        self.moving.discard(sprite)
+
+    def refresh(self):
+        """Обновить ячейки движущихся спрайтов"""
+        for sprite in self.moving:
+            self.grids[sprite.layer].move(sprite)
+
+    def query(self, rect, layer):
+        """Спрайты слоя рядом с областью мира"""
+        return self.grids[layer].query(rect)
+
+    def visible(self, rect, layer):
+        """Спрайты слоя в области мира, отсортированные по rect.bottom"""
+        if layer in self.depth:
+            return self.depth[layer].visible(rect)
+        visible_sprites = [sprite for sprite in self.query(rect, layer) if rect.colliderect(sprite.rect)]
+        visible_sprites.sort(key=lambda sprite: sprite.rect.bottom)
+        return visible_sprites
+
+class MinimapGroup(pygame.sprite.Group):
+    """Группа, которая сообщает миникарте о появлении и удалении спрайтов"""
+    def __init__(self, minimap, *sprites):
+        self.minimap = minimap
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.minimap.add_marker(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.minimap.remove_marker(sprite)
+
+
+class ScriptedKeys(frozenset):
+    """Удерживаемые клавиши сценария с интерфейсом pygame.key.get_pressed()"""
+    def __getitem__(self, key):
+        return key in self
+
+
+class ScriptedInput:
+    """Ввод по сценарию вместо клавиатуры, продвигается на шаг симуляции"""
+    def __init__(self, script=HEADLESS_SCRIPT):
+        self.script = script
+        self.entry = -1
+        self.left = 0  # Шагов до следующей записи
+        self.keys = ScriptedKeys()
+
+    def advance(self):
+        """Перейти к следующему шагу; нажатия новой записи идут в очередь событий KEYDOWN"""
+        if self.left <= 0:
+            self.entry = (self.entry + 1) % len(self.script)
+            self.left, held, taps = self.script[self.entry]
+            self.keys = ScriptedKeys(held)
+            for key in taps:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        self.left -= 1
+
+    def pressed(self):
+        return self.keys
+
+
+class InputSource:
+    """Откуда игра берет удерживаемые клавиши: клавиатура или сценарий"""
+    script = None  # ScriptedInput в безоконном прогоне
+
+    @classmethod
+    def pressed(cls):
+        if cls.script is not None:
+            return cls.script.pressed()
+        return pygame.key.get_pressed()
+
+
+class FontRegistry:
+    """Общий реестр шрифтов по размеру (файл шрифта загружается один раз)"""
+    fonts = {}
+
+    @classmethod
+    def get(cls, size):
+        """Шрифт по умолчанию нужного размера"""
+        font = cls.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            cls.fonts[size] = font
+        return font
+
+
+class TextCache:
+    """Общий LRU-кэш отрисованного текста"""
+    cache = OrderedDict()  # (шрифт, текст, цвет, сглаживание, прозрачность) -> Surface
+    max_size = TEXT_CACHE_SIZE
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def render(cls, font, text, color, antialias=True, alpha=None):
+        """Отрисовать строку или взять готовую из кэша (поверхность общая - не изменять)"""
+        key = (font, text, color, antialias, alpha)
+        image = cls.cache.get(key)
+        if image is not None:
+            cls.hits += 1
+            cls.cache.move_to_end(key)
+            return image
+
+        cls.misses += 1
+        image = SurfaceFactory.finish(font.render(text, antialias, color))
+        if alpha is not None:
+            image.set_alpha(alpha)
+        cls.cache[key] = image
+        if len(cls.cache) > cls.max_size:
+            cls.cache.popitem(last=False)
+        return image
+
+    @classmethod
+    def stats(cls):
+        """Счетчики попаданий для подбора размера кэша"""
+        total = cls.hits + cls.misses
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_rate": cls.hits / total if total else 0.0,
+            "size": len(cls.cache),
+        }
+
+
+class HudWidget:
+    """Элемент HUD с закэшированной поверхностью, перерисовывается только при смене значения"""
+    def __init__(self, render, keep=1, premultiplied=False):
+        self.render = render  # render(value) -> Surface
+        self.keep = keep  # Сколько последних значений держать (для анимации по кругу)
+        self.premultiplied = premultiplied  # Слой собран через SurfaceFactory.composite
+        self.images = {}
+        self.renders = 0
+
+    def get(self, value=None):
+        """Поверхность для значения (рисуется, если ее нет среди keep последних)"""
+        image = self.images.get(value)
+        if image is None:
+            if len(self.images) >= self.keep:
+                del self.images[next(iter(self.images))]  # Самое старое значение
+            image = self.images[value] = SurfaceFactory.finish(self.render(value))
+            self.renders += 1
+        return image
+
+    def draw(self, surface, pos, value=None):
+        """Нарисовать виджет, обновив кэш если значение изменилось"""
+        image = self.get(value)
+        if self.premultiplied:
+            surface.blit(image, pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+        else:
+            surface.blit(image, pos)
+
+
+class BlitBatch:
+    """Собирает пары (поверхность, позиция) вместо блита и сдает их одним вызовом blits"""
+    def __init__(self):
+        self.items = []
+
+    def blit(self, image, pos):
+        self.items.append((image, pos))
+
+    def flush(self, target):
+        """Нарисовать накопленное на target и очистить список"""
+        if self.items:
+            target.blits(self.items, doreturn=False)
+            self.items = []
+
+
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = self.create_window()
+        self.surface_renderer = SurfaceRenderer(self.screen)
+        self.renderer = self.create_renderer(RENDER_BACKEND)
         pygame.display.set_caption("Eco Ranger - Жақсартылған Нұсқа")
         self.clock = pygame.time.Clock()
         self.running = True
@@ -113,30 +635,43 @@ class Game:
         self.score = 0
         self.health = 100
 
-        # Камера
-        self.camera = Camera(WORLD_WIDTH, WORLD_HEIGHT)
+        # Буфер мира и камера
+        self.set_render_scale(RENDER_SCALE)
+        self.view_camera = self.camera  # Камера кадра (интерполированная между шагами)
+        self.previous_camera = None  # Позиция камеры на прошлом шаге симуляции
+        self.previous_positions = {}  # Движущийся спрайт -> позиция на прошлом шаге
 
         # Загрузка шрифтов
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
-        self.font_tiny = pygame.font.Font(None, 20)
+        self.font_large = FontRegistry.get(72)
+        self.font_medium = FontRegistry.get(48)
+        self.font_small = FontRegistry.get(32)
+        self.font_tiny = FontRegistry.get(20)
+
+        # Виджеты HUD и закэшированные фоны экранов
+        self.hud = self.create_hud()
+        self.backgrounds = self.create_backgrounds()
+
+        # Снимок кадра для паузы и конца уровня
+        self.frozen_frame = None
+        self.frozen_state = None
 
         # Музыка
         self.current_music = None
         pygame.mixer.music.set_volume(0.3)
 
-        # Группы спрайтов
-        self.all_sprites = pygame.sprite.Group()
-        self.trash_group = pygame.sprite.Group()
+        # Группы спрайтов (all_sprites с пространственным индексом для отрисовки)
+        self.all_sprites = IndexedGroup()
+        self.minimap = Minimap()
+        self.trash_group = MinimapGroup(self.minimap)
         self.obstacles_group = pygame.sprite.Group()
-        self.particles_group = pygame.sprite.Group()
-        self.ground_tiles = pygame.sprite.Group()
+        self.particles = ParticleSystem()
         self.decorations = pygame.sprite.Group()
 
         self.player = None
         self.recycling_station = None
         self.drone = None
+        self.ground_layer = None
+        self.prop_layer = None
 
         # Магазин и улучшения
         self.total_coins = 0  # Всего заработанных монет
@@ -162,7 +697,6 @@ class Game:
         self.poison_plants = pygame.sprite.Group()
         self.heal_stations = pygame.sprite.Group()
         self.river_segments = pygame.sprite.Group()
-        self.water_flow_particles = pygame.sprite.Group()
 
         # Состояние игрока
         self.player_poisoned = False
@@ -219,18 +753,24 @@ class Game:
 
     def load_level(self, level_num):
         """Загрузить уровень"""
+        # Между уровнями интерполировать нечего
+        self.previous_camera = None
+        self.previous_positions = {}
+
+        # Временные сущности прошлого уровня возвращаем в пул
+        for group in (self.trash_group, self.heal_stations, self.celebrating_villagers):
+            EntityPool.release_all(group)
+
         # Очистка всех групп
         self.all_sprites.empty()
         self.trash_group.empty()
         self.obstacles_group.empty()
-        self.particles_group.empty()
-        self.ground_tiles.empty()
+        self.particles.clear()
         self.decorations.empty()
         self.grass_tiles.empty()
         self.poison_plants.empty()
         self.heal_stations.empty()
         self.river_segments.empty()
-        self.water_flow_particles.empty()
         self.npcs_group.empty()
         self.litterers_group.empty()
         self.quest_objectives.empty()
@@ -285,12 +825,27 @@ class Game:
             self.drone = Drone(self.player)
             self.all_sprites.add(self.drone)
 
+        # Запекаем статичные пропы в чанки
+        self.bake_static_props()
+
+        # Буфер прокрутки фона; пропы над водой рисуются после нее, поэтому на уровне с ручьем
+        # в буфер идет только земля
+        layers = [self.ground_layer] if self.river_segments else [self.ground_layer, self.prop_layer]
+        self.scroll_buffer = ScrollBuffer(layers)
+
+        # Статичный слой миникарты
+        self.minimap.build(self)
+
+    def bake_static_props(self):
+        """Запечь статичные пропы под персонажами и убрать их из покадровой отрисовки"""
+        props = [sprite for sprite in self.all_sprites if getattr(sprite, 'static_prop', False)]
+        self.prop_layer = PropLayer(props)
+        # Спрайты остаются в своих группах (decorations, grass_tiles), но не в all_sprites
+        self.all_sprites.remove(*props)
+
     def create_ground(self, level_num):
         """Создать землю"""
-        for x in range(0, WORLD_WIDTH, TILE_SIZE):
-            for y in range(0, WORLD_HEIGHT, TILE_SIZE):
-                tile = GroundTile(x, y, level_num)
-                self.ground_tiles.add(tile)
+        self.ground_layer = GroundLayer(level_num)
 
     def create_forest_level(self):
         """Создать уровень 1 - Лес"""
@@ -377,7 +932,8 @@ class Game:
                     break
 
             if not collision:
-                trash = Trash(x, y, random.choice(["plastic", "paper", "bottle", "can"]), 1, river_trash=is_river_trash)
+                trash = EntityPool.acquire(Trash, x, y, random.choice(["plastic", "paper", "bottle", "can"]), 1,
+                                           river_trash=is_river_trash)
                 self.trash_group.add(trash)
                 self.all_sprites.add(trash)
                 trash_count += 1
@@ -485,6 +1041,9 @@ class Game:
             self.river_segments.add(segment)
             self.all_sprites.add(segment)
 
+        # Кадры течения рисуются при загрузке, а не в кадр расчистки ручья
+        RiverSegment.bake_flow(self.river_segments)
+
         # Спавн 3-5 мусорщиков в лесу
         num_litterers = random.randint(3, 5)
         for i in range(num_litterers):
@@ -574,7 +1133,7 @@ class Game:
 
             if not collision:
                 trash_type = random.choice(["plastic", "paper", "glass"])
-                trash = Trash(x, y, trash_type, 2)
+                trash = EntityPool.acquire(Trash, x, y, trash_type, 2)
                 self.trash_group.add(trash)
                 self.all_sprites.add(trash)
                 trash_count += 1
@@ -628,7 +1187,7 @@ class Game:
             if not collision:
                 trash_type = random.choice(["plastic", "paper", "glass", "metal"])
                 needs_drone = random.random() < 0.3
-                trash = Trash(x, y, trash_type, 3, needs_drone=needs_drone)
+                trash = EntityPool.acquire(Trash, x, y, trash_type, 3, needs_drone=needs_drone)
                 self.trash_group.add(trash)
                 self.all_sprites.add(trash)
                 trash_count += 1
@@ -644,6 +1203,42 @@ class Game:
             self.litterers_group.add(litterer)
             self.all_sprites.add(litterer)
 
+    def create_window(self):
+        """Окно с логическим размером экрана (SDL масштабирует его и координаты мыши)"""
+        screen = pygame.display.get_surface()
+        if screen is not None:
+            return screen  # Окно уже открыто, второй SCALED-рендерер SDL не создаст
+        flags = pygame.SCALED
+        if WINDOW_RESIZABLE:
+            flags |= pygame.RESIZABLE
+        if WINDOW_FULLSCREEN:
+            flags |= pygame.FULLSCREEN
+        return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+
+    def create_renderer(self, backend):
+        """Бэкенд отрисовки по имени; без рендерера SDL2 остается блит на Surface"""
+        if backend == "texture" and video is not None:
+            try:
+                return TextureRenderer(self.screen)
+            except pygame.error as e:
+                print(f"Текстурный бэкенд недоступен: {e}")
+        return self.surface_renderer
+
+    def set_render_scale(self, scale):
+        """Буфер мира размером scale от экрана; при 1.0 мир рисуется прямо на экран"""
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        if scale < 1:
+            size = (max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale)))
+        for renderer in {self.surface_renderer, self.renderer}:
+            renderer.set_view_size(size)
+        self.render_scale = size[0] / SCREEN_WIDTH
+        self.camera = Camera(*size)
+
+    def screen_to_world(self, pos):
+        """Координаты экрана (логические) -> мировые с учетом масштаба буфера"""
+        return (pos[0] * self.render_scale + self.camera.x,
+                pos[1] * self.render_scale + self.camera.y)
+
     def handle_events(self):
         """Обработка событий"""
         for event in pygame.event.get():
@@ -651,6 +1246,9 @@ class Game:
                 self.running = False
 
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F11:
+                    pygame.display.toggle_fullscreen()
+
                 if event.key == pygame.K_ESCAPE:
                     if self.state == GameState.PLAYING:
                         self.state = GameState.PAUSE
@@ -689,11 +1287,8 @@ class Game:
                             if punch_rect.colliderect(litterer.rect) and not litterer.stunned:
                                 litterer.get_stunned()
                                 # Эффект удара (желтые частицы)
-                                for _ in range(15):
-                                    particle = Particle(litterer.rect.centerx,
-                                                      litterer.rect.centery, YELLOW)
-                                    self.particles_group.add(particle)
-                                    self.all_sprites.add(particle)
+                                self.particles.emit(litterer.rect.centerx, litterer.rect.centery,
+                                                    YELLOW, 15)
 
                     if event.key == pygame.K_e:
                         result = self.player.collect_trash(self.trash_group)
@@ -703,21 +1298,15 @@ class Game:
                             if result["damage"] > 0:
                                 self.health -= result["damage"]
                                 # Красные частицы для урона
-                                for _ in range(10):
-                                    particle = Particle(self.player.rect.centerx,
-                                                      self.player.rect.centery, RED)
-                                    self.particles_group.add(particle)
-                                    self.all_sprites.add(particle)
+                                self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                                    RED, 10, category=EffectCategory.DAMAGE)
 
                             # Добавляем бонусные очки сразу
                             if result["bonus_points"] > 0:
                                 self.score += int(result["bonus_points"] * self.combo_multiplier)
                                 # Золотые частицы для бонусов
-                                for _ in range(8):
-                                    particle = Particle(self.player.rect.centerx,
-                                                      self.player.rect.centery, (255, 215, 0))
-                                    self.particles_group.add(particle)
-                                    self.all_sprites.add(particle)
+                                self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                                    (255, 215, 0), 8)
 
                             # Обновление комбо
                             self.combo_count += collected
@@ -749,14 +1338,8 @@ class Game:
                     if event.key == pygame.K_SPACE or event.key == pygame.K_LSHIFT:
                         if self.player.perform_dash():
                             # Визуальные эффекты для dash
-                            for _ in range(8):
-                                particle = Particle(
-                                    self.player.rect.centerx,
-                                    self.player.rect.centery,
-                                    (150, 200, 255)  # Голубые частицы
-                                )
-                                self.particles_group.add(particle)
-                                self.all_sprites.add(particle)
+                            self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                                (150, 200, 255), 8)  # Голубые частицы
                             # Небольшая тряска при dash
                             self.screen_shake = 3
 
@@ -781,9 +1364,7 @@ class Game:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.state == GameState.PLAYING and self.drone and isinstance(self.drone, AdvancedDrone):
                     # Конвертировать экранные координаты в мировые
-                    mouse_x, mouse_y = event.pos
-                    world_x = mouse_x + self.camera.x
-                    world_y = mouse_y + self.camera.y
+                    world_x, world_y = self.screen_to_world(event.pos)
                     self.drone.set_target(world_x, world_y)
 
     def next_level(self):
@@ -816,8 +1397,19 @@ class Game:
                 self.drone = AdvancedDrone(self.player)
                 self.all_sprites.add(self.drone)
 
+    def snapshot(self):
+        """Запомнить позиции камеры и движущихся спрайтов перед шагом симуляции"""
+        self.previous_camera = (self.camera.x, self.camera.y)
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.all_sprites.moving}
+
+    def interpolated_camera(self, alpha):
+        """Камера кадра: позиции между прошлым и текущим шагом симуляции"""
+        if self.previous_camera is None or alpha >= 1:
+            return self.camera
+        return self.camera.interpolate(self.previous_camera, self.previous_positions, alpha)
+
     def update(self):
-        """Обновление игровой логики"""
+        """Обновление игровой логики (один шаг симуляции 1/FPS)"""
         if self.state != GameState.PLAYING and self.state != GameState.CUTSCENE:
             return
 
@@ -832,6 +1424,7 @@ class Game:
 
         # Обновление всех спрайтов (включая игрока - он двигается с учетом флага)
         self.all_sprites.update()
+        self.particles.update()
 
         # Применение течения реки ПОСЛЕ движения игрока
         if self.current_level == 1:
@@ -862,7 +1455,8 @@ class Game:
 
                 # Создаем новый мусор на месте мусорщика
                 trash_type = random.choice(["plastic", "paper", "bottle", "can"])
-                new_trash = Trash(
+                new_trash = EntityPool.acquire(
+                    Trash,
                     litterer.rect.centerx,
                     litterer.rect.centery,
                     trash_type,
@@ -873,14 +1467,8 @@ class Game:
                 self.all_sprites.add(new_trash)
 
                 # Небольшая визуальная обратная связь
-                for _ in range(5 if rarity != "normal" else 3):
-                    particle = Particle(
-                        litterer.rect.centerx,
-                        litterer.rect.centery,
-                        particle_color
-                    )
-                    self.particles_group.add(particle)
-                    self.all_sprites.add(particle)
+                self.particles.emit(litterer.rect.centerx, litterer.rect.centery,
+                                    particle_color, 5 if rarity != "normal" else 3)
 
         # Проверка столкновений с препятствиями
         for obstacle in self.obstacles_group:
@@ -891,32 +1479,23 @@ class Game:
                 if obstacle.toxic:
                     if random.random() < 0.02:
                         self.health -= 1
-                        for _ in range(3):
-                            particle = Particle(self.player.rect.centerx,
-                                              self.player.rect.centery, RED)
-                            self.particles_group.add(particle)
-                            self.all_sprites.add(particle)
+                        self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                            RED, 3, category=EffectCategory.DAMAGE)
 
         # Старый дрон (уровень 3, базовый)
         if self.drone and isinstance(self.drone, Drone) and self.drone.active:
             if self.drone.collect_trash(self.trash_group):
                 self.score += 15
-                for _ in range(5):
-                    particle = Particle(self.drone.rect.centerx,
-                                      self.drone.rect.centery, BLUE)
-                    self.particles_group.add(particle)
-                    self.all_sprites.add(particle)
+                self.particles.emit(self.drone.rect.centerx, self.drone.rect.centery,
+                                    BLUE, 5)
 
         # Продвинутый дрон (купленный в магазине)
         if self.drone and isinstance(self.drone, AdvancedDrone):
             # Автосбор мусора
             if self.drone.collect_trash_auto(self.trash_group):
                 self.score += 15
-                for _ in range(5):
-                    particle = Particle(self.drone.rect.centerx,
-                                      self.drone.rect.centery, GREEN)
-                    self.particles_group.add(particle)
-                    self.all_sprites.add(particle)
+                self.particles.emit(self.drone.rect.centerx, self.drone.rect.centery,
+                                    GREEN, 5)
 
             # Передача мусора игроку
             collected = self.drone.return_to_player()
@@ -941,17 +1520,13 @@ class Game:
                         # Создаем аптечку рядом
                         heal_x = poison_plant.rect.x + random.randint(80, 150)
                         heal_y = poison_plant.rect.y + random.randint(-50, 50)
-                        heal = HealingStation(heal_x, heal_y)
+                        heal = EntityPool.acquire(HealingStation, heal_x, heal_y)
                         self.heal_stations.add(heal)
                         self.all_sprites.add(heal)
 
                         # Эффект отравления
-                        for _ in range(10):
-                            particle = Particle(self.player.rect.centerx,
-                                              self.player.rect.centery,
-                                              (150, 50, 200))
-                            self.particles_group.add(particle)
-                            self.all_sprites.add(particle)
+                        self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                            (150, 50, 200), 10, category=EffectCategory.DAMAGE)
 
             # Обновление эффекта отравления
             if self.player_poisoned:
@@ -965,19 +1540,15 @@ class Game:
                     if self.player_poisoned:
                         self.player_poisoned = False
                         self.poison_timer = 0
-                        heal_station.kill()
+                        EntityPool.release(heal_station)
 
                         # Звук лечения
                         if SOUNDS_ENABLED:
                             sound_heal.play()
 
                         # Эффект исцеления
-                        for _ in range(15):
-                            particle = Particle(self.player.rect.centerx,
-                                              self.player.rect.centery,
-                                              (0, 255, 100))
-                            self.particles_group.add(particle)
-                            self.all_sprites.add(particle)
+                        self.particles.emit(self.player.rect.centerx, self.player.rect.centery,
+                                            (0, 255, 100), 15)
 
         # Проверка доставки мусора
         if self.player.carrying_trash and self.player.rect.colliderect(self.recycling_station.rect):
@@ -1000,12 +1571,8 @@ class Game:
 
             # Больше частиц при высоком комбо
             particle_count = 15 + int(self.combo_multiplier * 5)
-            for _ in range(particle_count):
-                particle = Particle(self.recycling_station.rect.centerx,
-                                  self.recycling_station.rect.centery,
-                                  random.choice([GREEN, YELLOW, BLUE]))
-                self.particles_group.add(particle)
-                self.all_sprites.add(particle)
+            self.particles.emit(self.recycling_station.rect.centerx, self.recycling_station.rect.centery,
+                                [GREEN, YELLOW, BLUE], particle_count, category=EffectCategory.CELEBRATION)
 
         # Проверка разблокировки ручья (уровень 1)
         if self.current_level == 1 and self.river_blocked:
@@ -1019,14 +1586,10 @@ class Game:
                     segment.start_flowing()
 
                 # Создать эффект течения воды
-                for _ in range(50):
-                    for segment in self.river_segments:
-                        particle = WaterFlowParticle(
-                            segment.rect.x + random.randint(0, segment.width),
-                            segment.rect.y + random.randint(0, segment.height)
-                        )
-                        self.water_flow_particles.add(particle)
-                        self.all_sprites.add(particle)
+                for segment in self.river_segments:
+                    self.particles.emit(segment.rect.x, segment.rect.y, WATER_PARTICLE_COLOR, 50,
+                                        spread=(segment.width, segment.height), flow=True,
+                                        category=EffectCategory.WATER)
 
                 # Запуск катсцены праздования!
                 self.start_river_restoration_cutscene()
@@ -1036,12 +1599,9 @@ class Game:
             if random.random() < 0.15:  # 15% шанс каждый кадр
                 for segment in self.river_segments:
                     if segment.flowing:  # Только текущие сегменты
-                        particle = WaterFlowParticle(
-                            segment.rect.x + random.randint(0, segment.width),
-                            segment.rect.y + random.randint(0, segment.height // 2)
-                        )
-                        self.water_flow_particles.add(particle)
-                        self.all_sprites.add(particle)
+                        self.particles.emit(segment.rect.x, segment.rect.y, WATER_PARTICLE_COLOR, 1,
+                                            spread=(segment.width, segment.height // 2), flow=True,
+                                            category=EffectCategory.WATER)
 
         # Логика квестов
         if self.current_level == 1:
@@ -1049,7 +1609,7 @@ class Game:
             for quest_giver in self.quest_givers:
                 if quest_giver.check_player_nearby(self.player):
                     # Проверяем нажата ли клавиша E для взаимодействия
-                    keys = pygame.key.get_pressed()
+                    keys = InputSource.pressed()
                     if keys[pygame.K_e] and quest_giver.has_quest:
                         # Активировать квест
                         if quest_giver.quest not in self.active_quests:
@@ -1072,14 +1632,8 @@ class Game:
                                 self.score += quest.reward
 
                                 # Эффект завершения квеста
-                                for _ in range(20):
-                                    particle = Particle(
-                                        objective.rect.centerx,
-                                        objective.rect.centery,
-                                        YELLOW
-                                    )
-                                    self.particles_group.add(particle)
-                                    self.all_sprites.add(particle)
+                                self.particles.emit(objective.rect.centerx, objective.rect.centery,
+                                                    YELLOW, 20, category=EffectCategory.CELEBRATION)
 
                                 objective.kill()  # Удаляем объект
 
@@ -1091,12 +1645,12 @@ class Game:
                 self.cutscene_active = False
                 self.cutscene_timer = 0
                 self.cutscene_type = None
-                self.celebrating_villagers.empty()
+                EntityPool.release_all(self.celebrating_villagers)
                 self.state = GameState.PLAYING
 
         # Обновление таймера уровня
         if self.state == GameState.PLAYING:
-            self.level_timer -= 1 / FPS  # Уменьшаем на 1/60 секунды каждый кадр
+            self.level_timer -= 1 / FPS  # Уменьшаем на 1/60 секунды каждый шаг симуляции
             if self.level_timer <= 0:
                 self.level_timer = 0
                 self.state = GameState.GAME_OVER  # Время вышло = проигрыш
@@ -1112,11 +1666,12 @@ class Game:
         # Обновление эффектов сочности
         if self.screen_shake > 0:
             self.screen_shake -= 1
-            # Случайное смещение для тряски
-            shake_amount = self.screen_shake * 0.5
+            # Случайное смещение для тряски: целые пиксели экрана, в буфер мира переводится без округления
+            # (при масштабе < 1 легкая тряска не обнуляется, на экране та же сила)
+            shake_amount = int(self.screen_shake * 0.5)
             self.screen_shake_offset = (
-                random.randint(-int(shake_amount), int(shake_amount)),
-                random.randint(-int(shake_amount), int(shake_amount))
+                random.randint(-shake_amount, shake_amount) * self.render_scale,
+                random.randint(-shake_amount, shake_amount) * self.render_scale
             )
         else:
             self.screen_shake_offset = (0, 0)
@@ -1149,33 +1704,36 @@ class Game:
         if self.health <= 0:
             self.state = GameState.GAME_OVER
 
-    def draw(self):
-        """Отрисовка"""
-        self.screen.fill(BLACK)
+    def draw(self, alpha=1.0):
+        """Отрисовка (alpha - доля пути между прошлым и текущим шагом симуляции)"""
+        self.view_camera = self.interpolated_camera(alpha) if self.state == GameState.PLAYING else self.camera
+
+        # Игровой процесс идет через выбранный бэкенд, остальные экраны - блитом на экран
+        renderer = self.renderer if self.state == GameState.PLAYING else self.surface_renderer
+        if self.state not in FROZEN_STATES:
+            self.frozen_state = None  # Снимок устарел
+            renderer.begin()
 
         if self.state == GameState.MENU:
             self.draw_menu()
         elif self.state == GameState.SHOP:
             self.draw_shop()
         elif self.state == GameState.PLAYING:
-            self.draw_game()
-            self.draw_hud()
-        elif self.state == GameState.PAUSE:
-            self.draw_game()
-            self.draw_hud()
-            self.draw_pause()
+            self.draw_game(renderer)
+            self.draw_hud(renderer)
+        elif self.state in FROZEN_STATES:
+            self.draw_frozen()
         elif self.state == GameState.CUTSCENE:
             self.draw_cutscene()
-        elif self.state == GameState.LEVEL_COMPLETE:
-            self.draw_game()
-            self.draw_level_complete()
         elif self.state == GameState.GAME_OVER:
             self.draw_game_over()
 
-        pygame.display.flip()
+        renderer.present()
 
     def play_music(self, music_file):
         """Воспроизвести музыку с зацикливанием"""
+        if HEADLESS:
+            return
         if self.current_music != music_file:
             try:
                 pygame.mixer.music.load(music_file)
@@ -1184,22 +1742,29 @@ class Game:
             except:
                 pass
 
+    def create_backgrounds(self):
+        """Закэшированные фоны меню, магазина и катсцены"""
+        return {
+            "menu_gradient": HudWidget(self.render_menu_background),
+            "menu_wave": HudWidget(self.render_menu_wave),
+            "menu": HudWidget(self.render_menu_panel, premultiplied=True),
+            "shop_wave": HudWidget(self.render_shop_background),
+            "shop": HudWidget(self.render_shop_panel, premultiplied=True),
+            "vignette": HudWidget(self.render_vignette),
+            "dim": HudWidget(self.render_dim_overlay),
+        }
+
     def draw_menu(self):
         """Отрисовка меню - современный дизайн"""
         # Воспроизводим музыку меню
         self.play_music('menu_music.wav')
 
-        # Анимированный градиентный фон (зелено-синий природный)
+        # Анимированный градиентный фон: статичный градиент + окно ленты волны (без масштабирования)
         time_offset = pygame.time.get_ticks() / 1000
-        for y in range(0, SCREEN_HEIGHT, 2):
-            ratio = y / SCREEN_HEIGHT
-            wave = math.sin(ratio * 3 + time_offset) * 20
-
-            r = int(20 + ratio * 40 + wave)
-            g = int(80 + ratio * 60 + wave)
-            b = int(60 + ratio * 40)
-
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y), 2)
+        self.backgrounds["menu_gradient"].draw(self.screen, (0, 0))
+        wave_y = int(time_offset * SCREEN_HEIGHT / 3) % MENU_WAVE_PERIOD
+        self.screen.blit(self.backgrounds["menu_wave"].get(), (0, 0), (0, wave_y, SCREEN_WIDTH, SCREEN_HEIGHT),
+                         special_flags=pygame.BLEND_RGB_ADD)
 
         # Декоративные элементы (листья падающие)
         for i in range(15):
@@ -1208,16 +1773,53 @@ class Game:
             pygame.draw.circle(self.screen, (100, 200, 100, 100), (leaf_x, leaf_y), 8)
             pygame.draw.circle(self.screen, (80, 180, 80), (leaf_x, leaf_y), 8, 2)
 
+        # Главная панель с кнопками (перерисовывается только при смене монет)
+        self.backgrounds["menu"].draw(self.screen, (0, 0), self.total_coins)
+
+        # ЛОГОТИП с эффектом
+        logo_y = MENU_PANEL_Y + 40
+        pulse = abs(math.sin(time_offset * 2)) * 10
+
+        # Тени заголовка (многослойные)
+        for offset in [(8, 8), (5, 5), (2, 2)]:
+            alpha = int(100 - offset[0] * 10)
+            shadow_surf = TextCache.render(self.font_large, "ECO RANGER", (0, 50, 0), alpha=alpha)
+            shadow_rect = shadow_surf.get_rect(center=(SCREEN_WIDTH // 2 + offset[0], logo_y + offset[1]))
+            self.screen.blit(shadow_surf, shadow_rect)
+
+        # Основной заголовок с пульсацией
+        title = TextCache.render(self.font_large, "ECO RANGER", (100 + int(pulse), 255, 100 + int(pulse)))
+        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, logo_y))
+        self.screen.blit(title, title_rect)
+
+    def render_menu_background(self, value):
+        """Градиент меню без волны (строится один раз)"""
+        image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, 2):
+            ratio = y / SCREEN_HEIGHT
+            image.fill((int(ratio * 40), int(60 + ratio * 60), int(60 + ratio * 40)), (0, y, SCREEN_WIDTH, 2))
+        return image
+
+    def render_menu_wave(self, value):
+        """Лента волны (красный и зеленый, 0..40) на период выше экрана - кадр берется окном со сдвигом"""
+        column = pygame.Surface((1, SCREEN_HEIGHT + MENU_WAVE_PERIOD))
+        for y in range(column.get_height()):
+            wave = int(20 + math.sin(y * 3 / SCREEN_HEIGHT) * 20)
+            column.fill((wave, wave, 0), (0, y, 1, 1))
+        return pygame.transform.scale(column, (SCREEN_WIDTH, column.get_height()))
+
+    def render_menu_panel(self, total_coins):
+        """Панель меню: подзаголовок, монеты, кнопки и подсказка управления (премультиплицированная альфа)"""
+        image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
         # Главная панель меню
         panel_width = 900
         panel_height = 600
         panel_x = (SCREEN_WIDTH - panel_width) // 2
-        panel_y = 50
+        panel_y = MENU_PANEL_Y
 
         # Панель с закругленными углами и тенью
-        shadow = pygame.Surface((panel_width + 10, panel_height + 10), pygame.SRCALPHA)
-        shadow.fill((0, 0, 0, 100))
-        self.screen.blit(shadow, (panel_x + 5, panel_y + 5))
+        image.fill((0, 0, 0, 100), (panel_x + 5, panel_y + 5, panel_width + 10, panel_height + 10))
 
         panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
         # Градиент на панели
@@ -1226,49 +1828,32 @@ class Game:
             pygame.draw.line(panel, (30, 60, 40, alpha), (0, i), (panel_width, i))
 
         pygame.draw.rect(panel, (100, 200, 150), (0, 0, panel_width, panel_height), 5, 15)
-        self.screen.blit(panel, (panel_x, panel_y))
-
-        # ЛОГОТИП с эффектом
-        logo_y = panel_y + 40
-        pulse = abs(math.sin(time_offset * 2)) * 10
-
-        # Тени заголовка (многослойные)
-        for offset in [(8, 8), (5, 5), (2, 2)]:
-            alpha = int(100 - offset[0] * 10)
-            shadow_surf = self.font_large.render("ECO RANGER", True, (0, 50, 0))
-            shadow_surf.set_alpha(alpha)
-            shadow_rect = shadow_surf.get_rect(center=(SCREEN_WIDTH // 2 + offset[0], logo_y + offset[1]))
-            self.screen.blit(shadow_surf, shadow_rect)
-
-        # Основной заголовок с пульсацией
-        title = self.font_large.render("ECO RANGER", True, (100 + int(pulse), 255, 100 + int(pulse)))
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, logo_y))
-        self.screen.blit(title, title_rect)
+        SurfaceFactory.composite(image, panel, (panel_x, panel_y))
 
         # Подзаголовок с иконкой
-        subtitle_y = logo_y + 60
-        pygame.draw.circle(self.screen, (50, 200, 50), (SCREEN_WIDTH // 2 - 150, subtitle_y), 12)
-        pygame.draw.circle(self.screen, WHITE, (SCREEN_WIDTH // 2 - 150, subtitle_y), 12, 2)
+        subtitle_y = panel_y + 100
+        pygame.draw.circle(image, (50, 200, 50), (SCREEN_WIDTH // 2 - 150, subtitle_y), 12)
+        pygame.draw.circle(image, WHITE, (SCREEN_WIDTH // 2 - 150, subtitle_y), 12, 2)
 
-        subtitle = self.font_medium.render("Планетаны сақта!", True, (200, 255, 200))
+        subtitle = TextCache.render(self.font_medium, "Планетаны сақта!", (200, 255, 200))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2 + 20, subtitle_y))
-        self.screen.blit(subtitle, subtitle_rect)
+        SurfaceFactory.composite(image, subtitle, subtitle_rect)
 
         # Монеты с красивой иконкой
         coin_y = subtitle_y + 60
         coin_panel = pygame.Surface((250, 50), pygame.SRCALPHA)
         coin_panel.fill((255, 200, 0, 180))
         pygame.draw.rect(coin_panel, (255, 215, 0), (0, 0, 250, 50), 3, 10)
-        self.screen.blit(coin_panel, (SCREEN_WIDTH // 2 - 125, coin_y - 15))
+        SurfaceFactory.composite(image, coin_panel, (SCREEN_WIDTH // 2 - 125, coin_y - 15))
 
         # Иконка монеты
-        pygame.draw.circle(self.screen, YELLOW, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 18)
-        pygame.draw.circle(self.screen, ORANGE, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 18, 3)
-        pygame.draw.circle(self.screen, ORANGE, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 12, 2)
+        pygame.draw.circle(image, YELLOW, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 18)
+        pygame.draw.circle(image, ORANGE, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 18, 3)
+        pygame.draw.circle(image, ORANGE, (SCREEN_WIDTH // 2 - 80, coin_y + 10), 12, 2)
 
-        coins_text = self.font_medium.render(f"{self.total_coins}", True, WHITE)
+        coins_text = TextCache.render(self.font_medium, f"{total_coins}", WHITE)
         coins_rect = coins_text.get_rect(center=(SCREEN_WIDTH // 2 + 10, coin_y + 10))
-        self.screen.blit(coins_text, coins_rect)
+        SurfaceFactory.composite(image, coins_text, coins_rect)
 
         # КНОПКИ (красивые современные)
         buttons = [
@@ -1287,7 +1872,7 @@ class Game:
             # Тень кнопки
             shadow_btn = pygame.Surface((btn_width, btn_height), pygame.SRCALPHA)
             shadow_btn.fill((0, 0, 0, 80))
-            self.screen.blit(shadow_btn, (btn_x + 4, btn_y + 4))
+            SurfaceFactory.composite(image, shadow_btn, (btn_x + 4, btn_y + 4))
 
             # Кнопка с градиентом
             btn_surf = pygame.Surface((btn_width, btn_height), pygame.SRCALPHA)
@@ -1300,110 +1885,127 @@ class Game:
                 pygame.draw.line(btn_surf, (r, g, b, 230), (5, i), (btn_width - 5, i))
 
             pygame.draw.rect(btn_surf, WHITE, (0, 0, btn_width, btn_height), 3, 12)
-            self.screen.blit(btn_surf, (btn_x, btn_y))
+            SurfaceFactory.composite(image, btn_surf, (btn_x, btn_y))
 
             # Текст кнопки
-            btn_text = self.font_medium.render(button["text"], True, WHITE)
+            btn_text = TextCache.render(self.font_medium, button["text"], WHITE)
             btn_text_rect = btn_text.get_rect(center=(SCREEN_WIDTH // 2, btn_y + btn_height // 2))
-            self.screen.blit(btn_text, btn_text_rect)
+            SurfaceFactory.composite(image, btn_text, btn_text_rect)
 
             # Подсказка клавиши
-            key_hint = self.font_tiny.render(f"[{button['key']}]", True, (200, 200, 200))
+            key_hint = TextCache.render(self.font_tiny, f"[{button['key']}]", (200, 200, 200))
             key_hint_rect = key_hint.get_rect(center=(SCREEN_WIDTH // 2 + btn_width // 2 - 50, btn_y + btn_height // 2))
-            self.screen.blit(key_hint, key_hint_rect)
+            SurfaceFactory.composite(image, key_hint, key_hint_rect)
 
         # Управление внизу (компактно)
         control_y = SCREEN_HEIGHT - 60
         controls = "WASD/Бағдаршалар - қозғалу  |  E - жинау  |  T - дрон"
-        control_text = self.font_tiny.render(controls, True, (150, 200, 150))
+        control_text = TextCache.render(self.font_tiny, controls, (150, 200, 150))
         control_rect = control_text.get_rect(center=(SCREEN_WIDTH // 2, control_y))
-        self.screen.blit(control_text, control_rect)
+        SurfaceFactory.composite(image, control_text, control_rect)
+        return image
 
-    def draw_game(self):
-        """Отрисовка игрового процесса"""
+    def draw_game(self, renderer):
+        """Отрисовка игрового процесса через бэкенд renderer"""
         # Воспроизводим игровую музыку
         self.play_music('game_music.wav')
 
-        # Рисуем тайлы земли с учетом камеры и тряски
-        for tile in self.ground_tiles:
-            screen_pos = self.camera.apply(tile, self.screen_shake_offset)
-            # Отрисовываем только видимые тайлы
-            if -TILE_SIZE < screen_pos[0] < SCREEN_WIDTH and -TILE_SIZE < screen_pos[1] < SCREEN_HEIGHT:
-                self.screen.blit(tile.image, screen_pos)
-
-        # ВАЖНО: Рисуем реку РАНЬШЕ всех объектов (на уровне леса)
-        if self.current_level == 1:
-            for river_segment in self.river_segments:
-                screen_pos = self.camera.apply(river_segment, self.screen_shake_offset)
-                if -200 < screen_pos[0] < SCREEN_WIDTH + 200 and -200 < screen_pos[1] < SCREEN_HEIGHT + 200:
-                    self.screen.blit(river_segment.image, screen_pos)
-
-        # Сортируем спрайты по Y для правильного наложения (исключая реку)
-        visible_sprites = []
-        for sprite in self.all_sprites:
-            # Пропускаем сегменты реки - они уже нарисованы
-            if sprite in self.river_segments:
-                continue
-
-            screen_pos = self.camera.apply(sprite, self.screen_shake_offset)
-            if -100 < screen_pos[0] < SCREEN_WIDTH + 100 and -100 < screen_pos[1] < SCREEN_HEIGHT + 100:
-                visible_sprites.append((sprite, screen_pos))
-
-        # Сортируем по Y координате
-        visible_sprites.sort(key=lambda x: x[0].rect.bottom)
-
-        # Рисуем сначала декорации
-        for sprite, screen_pos in visible_sprites:
-            if sprite in self.decorations:
-                self.screen.blit(sprite.image, screen_pos)
-                # Тени для декораций
-                if hasattr(sprite, 'draw_shadow'):
-                    sprite.draw_shadow(self.screen, screen_pos)
-
-        # Затем все остальное
-        for sprite, screen_pos in visible_sprites:
-            if sprite not in self.decorations:
-                self.screen.blit(sprite.image, screen_pos)
+        # Мир рисуется в буфер размера камеры (при RENDER_SCALE < 1 он меньше экрана)
+        renderer.begin_world()
+        camera = self.view_camera
 
+        # Рисуем запеченные чанки земли с учетом камеры и тряски
+        # (на Surface - через буфер прокрутки, который дорисовывает только открывшиеся полосы)
+        if SCROLL_BUFFER and renderer.scrolling:
+            self.scroll_buffer.draw(renderer, camera, self.screen_shake_offset)
+            loose_props = self.prop_layer not in self.scroll_buffer.layers
+        else:
+            self.ground_layer.draw(renderer, camera, self.screen_shake_offset)
+            loose_props = True
+
+        # Слои спрайтов по порядку: вода, декорации, персонажи
+        # Кандидаты берем из пространственного индекса слоя по области камеры
+        self.all_sprites.refresh()
+        # Запас 16 пикселей: спрайты рисуются в интерполированных позициях, а ищутся по текущим
+        view_rect = pygame.Rect(int(camera.x - self.screen_shake_offset[0]) - 16,
+                                int(camera.y - self.screen_shake_offset[1]) - 16,
+                                camera.width + 32, camera.height + 32)
+        for layer in SPRITE_LAYERS:
+            # Запеченные пропы лежат под спрайтами слоя декораций
+            if layer == RenderLayer.DECALS and loose_props:
+                self.prop_layer.draw(renderer, camera, self.screen_shake_offset)
+
+            # По Y координате для правильного наложения (слой персонажей уже упорядочен),
+            # рисуем слой одним blits
+            visible_sprites = self.all_sprites.visible(view_rect, layer)
+            renderer.blits([(sprite.image, camera.apply(sprite, self.screen_shake_offset))
+                            for sprite in visible_sprites], doreturn=False)
+
+        # Частицы поверх персонажей
+        self.particles.draw(renderer, camera, self.screen_shake_offset)
+
+        # Растягиваем буфер на экран; оверлей и текст дальше рисуются в полном разрешении
+        renderer.end_world()
+
+        # Слой OVERLAY
         # Цветная вспышка при высоком комбо
         if self.flash_alpha > 0:
-            flash_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            flash_surface.fill((*self.flash_color, self.flash_alpha))
-            self.screen.blit(flash_surface, (0, 0))
+            renderer.fill((*self.flash_color, self.flash_alpha))
 
         # Сообщения от NPC
         for npc in self.npcs_group:
             if hasattr(npc, 'showing_message') and npc.showing_message:
-                screen_pos = self.camera.apply(npc, self.screen_shake_offset)
+                npc_x, npc_y = camera.apply(npc, self.screen_shake_offset)
+                screen_x = (npc_x + 17) / self.render_scale
+                screen_y = npc_y / self.render_scale
                 # Облако с сообщением над NPC
-                message_surface = self.font_tiny.render(npc.message, True, BLACK)
-                msg_width = message_surface.get_width() + 20
-                msg_height = 30
-
-                # Белое облако сообщения
-                bubble_rect = pygame.Rect(screen_pos[0] - msg_width//2 + 17,
-                                         screen_pos[1] - 50, msg_width, msg_height)
-                pygame.draw.rect(self.screen, WHITE, bubble_rect, 0, 8)
-                pygame.draw.rect(self.screen, BLACK, bubble_rect, 2, 8)
+                bubble = self.hud["bubble"].get(npc.message)
+                renderer.blit(bubble, (screen_x - bubble.get_width() // 2, screen_y - 50))
+
+    def render_bubble(self, message):
+        """Белое облако с сообщением NPC"""
+        message_surface = TextCache.render(self.font_tiny, message, BLACK)
+        bubble = pygame.Surface((message_surface.get_width() + 20, 30), pygame.SRCALPHA)
+        bubble_rect = bubble.get_rect()
+        pygame.draw.rect(bubble, WHITE, bubble_rect, 0, 8)
+        pygame.draw.rect(bubble, BLACK, bubble_rect, 2, 8)
+
+        # Текст
+        bubble.blit(message_surface, (10, 7))
+        return bubble
+
+    def create_hud(self):
+        """Виджеты HUD (каждый хранит свою поверхность)"""
+        return {
+            "background": HudWidget(self.render_hud_background),
+            "timer": HudWidget(self.render_hud_timer),
+            "score": HudWidget(self.render_hud_score),
+            "level": HudWidget(lambda level: TextCache.render(self.font_small, f"Деңгей {level}/3", WHITE)),
+            "trash": HudWidget(self.render_hud_trash),
+            "health": HudWidget(self.render_hud_health),
+            "bag": HudWidget(self.render_hud_bag),
+            "drone": HudWidget(self.render_hud_drone),
+            "dash": HudWidget(self.render_hud_dash),
+            "poison": HudWidget(self.render_hud_poison),
+            "river": HudWidget(self.render_hud_river),
+            "combo": HudWidget(self.render_hud_combo, keep=4),  # Все ширины пульсации текущего множителя
+            "quests": HudWidget(self.render_hud_quests),
+            "hint": HudWidget(self.render_hud_hint),
+            "bubble": HudWidget(self.render_bubble, keep=BUBBLE_CACHE_SIZE),  # Облака сообщений NPC
+        }
 
-                # Текст
-                self.screen.blit(message_surface, (bubble_rect.x + 10, bubble_rect.y + 7))
+    def draw_hud(self, renderer):
+        """Отрисовка интерфейса (виджеты перерисовываются только при смене значений)"""
+        hud = self.hud
+        # Виджеты копятся в пакет и рисуются одним blits (до полосок комбо и в конце)
+        screen = BlitBatch()
 
-    def draw_hud(self):
-        """Отрисовка интерфейса"""
         # Полупрозрачная панель с градиентом
-        hud_panel = pygame.Surface((SCREEN_WIDTH, 100), pygame.SRCALPHA)
-        for y in range(100):
-            alpha = int(180 - (y * 1.5))
-            color = (0, 0, 0, alpha)
-            pygame.draw.rect(hud_panel, color, (0, y, SCREEN_WIDTH, 1))
-        self.screen.blit(hud_panel, (0, 0))
+        hud["background"].draw(screen, (0, 0))
 
         # ТАЙМЕР (большой, в центре вверху)
         minutes = int(self.level_timer // 60)
         seconds = int(self.level_timer % 60)
-        timer_text = f"{minutes}:{seconds:02d}"
-
         # Цвет таймера зависит от оставшегося времени
         if self.level_timer > 60:
             timer_color = GREEN
@@ -1411,321 +2013,328 @@ class Game:
             timer_color = YELLOW
         else:
             timer_color = RED
+        hud["timer"].draw(screen, (SCREEN_WIDTH // 2 - 100, 15), (minutes, seconds, timer_color))
 
-        # Панель таймера
-        timer_panel = pygame.Surface((200, 60), pygame.SRCALPHA)
-        timer_panel.fill((0, 0, 0, 180))
-        pygame.draw.rect(timer_panel, timer_color, (0, 0, 200, 60), 3, 10)
-        self.screen.blit(timer_panel, (SCREEN_WIDTH // 2 - 100, 15))
-
-        # Текст таймера
-        timer_surf = self.font_large.render(timer_text, True, timer_color)
-        timer_rect = timer_surf.get_rect(center=(SCREEN_WIDTH // 2, 45))
-        self.screen.blit(timer_surf, timer_rect)
-
-        # Очки с иконкой
-        pygame.draw.circle(self.screen, YELLOW, (35, 25), 15)
-        score_text = self.font_small.render(f"{self.score}", True, WHITE)
-        self.screen.blit(score_text, (55, 12))
-
-        # Уровень
-        level_text = self.font_small.render(f"Деңгей {self.current_level}/3", True, WHITE)
-        self.screen.blit(level_text, (20, 55))
+        # Очки и уровень
+        hud["score"].draw(screen, (20, 10), self.score)
+        hud["level"].draw(screen, (20, 55), self.current_level)
 
         # Оставшийся мусор
-        remaining_trash = len(self.trash_group)
-        trash_color = RED if remaining_trash > 0 else GREEN
-        trash_icon = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.rect(trash_icon, trash_color, (5, 5, 20, 20), 0, 3)
-        self.screen.blit(trash_icon, (SCREEN_WIDTH // 2 - 100, 10))
-
-        trash_count_text = self.font_small.render(f"{remaining_trash}", True, trash_color)
-        self.screen.blit(trash_count_text, (SCREEN_WIDTH // 2 - 60, 12))
+        hud["trash"].draw(screen, (SCREEN_WIDTH // 2 - 100, 10), len(self.trash_group))
 
         # Здоровье
-        health_text = self.font_small.render("HP", True, WHITE)
-        self.screen.blit(health_text, (SCREEN_WIDTH - 230, 12))
-
-        # Красивая полоса здоровья
-        bar_width = 180
-        bar_height = 28
-        bar_x = SCREEN_WIDTH - 200
-        bar_y = 50
-
-        # Фон полосы
-        pygame.draw.rect(self.screen, (50, 0, 0), (bar_x, bar_y, bar_width, bar_height), 0, 5)
-
-        # Градиент здоровья
-        health_width = int((self.health / 100) * bar_width)
-        for x in range(health_width):
-            ratio = x / bar_width
-            if self.health > 50:
-                color = (int(100 * ratio), 255 - int(100 * ratio), 0)
-            else:
-                color = (255, int(100 * (1 - ratio)), 0)
-            pygame.draw.rect(self.screen, color, (bar_x + x, bar_y + 2, 1, bar_height - 4))
-
-        # Обводка
-        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 3, 5)
-
-        # Текст HP
-        hp_text = self.font_small.render(f"{self.health}", True, WHITE)
-        hp_rect = hp_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
-        self.screen.blit(hp_text, hp_rect)
+        hud["health"].draw(screen, (SCREEN_WIDTH - 230, 12), self.health)
 
         # Инвентарь
         if self.player and self.player.carrying_trash > 0:
-            inv_panel = pygame.Surface((200, 50), pygame.SRCALPHA)
-            inv_panel.fill((0, 100, 0, 200))
-            self.screen.blit(inv_panel, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 70))
-
-            inv_text = self.font_small.render(f"Сөмке: {self.player.carrying_trash}/{self.player.max_trash}", True, WHITE)
-            self.screen.blit(inv_text, (SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT - 63))
+            hud["bag"].draw(screen, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 70),
+                            (self.player.carrying_trash, self.player.max_trash))
 
         # Статус дрона
         if self.current_level == 3 and self.drone:
-            drone_panel = pygame.Surface((120, 35), pygame.SRCALPHA)
-            drone_color = (0, 150, 0, 200) if self.drone.active else (150, 0, 0, 200)
-            drone_panel.fill(drone_color)
-            self.screen.blit(drone_panel, (350, 10))
-
-            drone_status = "ДРОН ҚОС" if self.drone.active else "ДРОН ӨШІР"
-            drone_text = self.font_small.render(drone_status, True, WHITE)
-            self.screen.blit(drone_text, (360, 15))
+            hud["drone"].draw(screen, (350, 10), self.drone.active)
 
         # Индикатор Dash (слева внизу)
-        dash_panel_w = 150
-        dash_panel_h = 50
-        dash_x = 20
-        dash_y = SCREEN_HEIGHT - 130
-
-        # Фон панели
-        dash_panel = pygame.Surface((dash_panel_w, dash_panel_h), pygame.SRCALPHA)
-        dash_panel.fill((50, 50, 50, 180))
-        pygame.draw.rect(dash_panel, (150, 200, 255), (0, 0, dash_panel_w, dash_panel_h), 2, 5)
-        self.screen.blit(dash_panel, (dash_x, dash_y))
-
-        # Текст DASH
-        dash_label = self.font_tiny.render("СЕКІРУ [SPACE]", True, (150, 200, 255))
-        self.screen.blit(dash_label, (dash_x + 10, dash_y + 5))
-
-        # Прогресс-бар cooldown
-        bar_width = dash_panel_w - 20
-        bar_height = 10
-        bar_x = dash_x + 10
-        bar_y = dash_y + 30
-
-        # Фон бара
-        pygame.draw.rect(self.screen, (30, 30, 30), (bar_x, bar_y, bar_width, bar_height), 0, 3)
-
-        # Заполнение бара
         if self.player.dash_cooldown > 0:
-            # Перезарядка
             progress = 1 - (self.player.dash_cooldown / self.player.dash_cooldown_max)
-            fill_width = int(bar_width * progress)
-            bar_color = (100, 100, 100) if fill_width < bar_width else (150, 200, 255)
-            pygame.draw.rect(self.screen, bar_color, (bar_x, bar_y, fill_width, bar_height), 0, 3)
-
-            # Текст cooldown
-            cd_text = self.font_tiny.render(f"{self.player.dash_cooldown // 60 + 1}с", True, WHITE)
-            self.screen.blit(cd_text, (bar_x + bar_width // 2 - 10, bar_y - 15))
+            dash_state = (int(progress * DASH_BAR_WIDTH), self.player.dash_cooldown // 60 + 1)
         else:
-            # Готов к использованию
-            pygame.draw.rect(self.screen, (150, 255, 150), (bar_x, bar_y, bar_width, bar_height), 0, 3)
-            ready_text = self.font_tiny.render("ДАЙЫН!", True, (150, 255, 150))
-            self.screen.blit(ready_text, (bar_x + bar_width // 2 - 20, bar_y - 15))
+            dash_state = None  # Готов к использованию
+        hud["dash"].draw(screen, (20, SCREEN_HEIGHT - 130), dash_state)
 
         # Статус отравления (только на уровне леса)
         if self.current_level == 1 and self.player_poisoned:
-            poison_panel = pygame.Surface((180, 45), pygame.SRCALPHA)
-            poison_panel.fill((120, 50, 150, 200))
-            self.screen.blit(poison_panel, (SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT - 130))
-
-            poison_text = self.font_small.render("УЛАНДЫ!", True, (255, 100, 255))
-            self.screen.blit(poison_text, (SCREEN_WIDTH // 2 - 70, SCREEN_HEIGHT - 125))
-
-            # Таймер
-            time_left = self.poison_timer // 60
-            timer_text = self.font_tiny.render(f"Дәріхананы тап! {time_left}с", True, WHITE)
-            self.screen.blit(timer_text, (SCREEN_WIDTH // 2 - 70, SCREEN_HEIGHT - 105))
+            hud["poison"].draw(screen, (SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT - 130), self.poison_timer // 60)
 
         # Статус ручья (только на уровне леса)
         if self.current_level == 1:
             river_trash_count = sum(1 for trash in self.trash_group if trash.river_trash)
             if river_trash_count > 0:
-                river_panel = pygame.Surface((220, 40), pygame.SRCALPHA)
-                river_panel.fill((0, 100, 150, 200))
-                self.screen.blit(river_panel, (20, SCREEN_HEIGHT - 60))
-
-                river_text = self.font_tiny.render(f"Өзен бұғатталған! Қоқыс: {river_trash_count}", True, WATER_BLUE)
-                self.screen.blit(river_text, (30, SCREEN_HEIGHT - 50))
+                hud["river"].draw(screen, (20, SCREEN_HEIGHT - 60), river_trash_count)
             elif not self.river_blocked:
-                river_panel = pygame.Surface((180, 35), pygame.SRCALPHA)
-                river_panel.fill((0, 150, 200, 200))
-                self.screen.blit(river_panel, (20, SCREEN_HEIGHT - 55))
-
-                river_text = self.font_small.render("Өзен ағады!", True, WHITE)
-                self.screen.blit(river_text, (30, SCREEN_HEIGHT - 48))
+                hud["river"].draw(screen, (20, SCREEN_HEIGHT - 55), 0)
 
         # КОМБО (компактное отображение справа вверху)
         if self.combo_count > 0:
             combo_x = SCREEN_WIDTH - 220
             combo_y = 95
-
-            # Пульсирующий эффект (меньше)
+            # Пульсирующий эффект (меньше): 4 ширины панели, каждая рисуется один раз
             pulse = abs(math.sin(pygame.time.get_ticks() / 100)) * 3
-
-            # Цвет зависит от множителя
-            if self.combo_multiplier >= 4:
-                combo_color = (255, 100, 255)  # Фиолетовый
-            elif self.combo_multiplier >= 3:
-                combo_color = (255, 50, 50)  # Красный
-            elif self.combo_multiplier >= 2:
-                combo_color = ORANGE  # Оранжевый
-            else:
-                combo_color = YELLOW  # Желтый
-
-            # Панель комбо (компактная)
             combo_width = 200 + int(pulse)
             combo_height = 70
-            combo_panel = pygame.Surface((combo_width, combo_height), pygame.SRCALPHA)
-            combo_panel.fill((0, 0, 0, 180))
-            pygame.draw.rect(combo_panel, combo_color, (0, 0, combo_width, combo_height), 3, 10)
-            self.screen.blit(combo_panel, (combo_x, combo_y))
-
-            # Текст COMBO (меньше)
-            combo_label = self.font_medium.render("COMBO", True, combo_color)
-            combo_label_rect = combo_label.get_rect(center=(combo_x + combo_width // 2, combo_y + 20))
-            self.screen.blit(combo_label, combo_label_rect)
-
-            # Множитель
-            multiplier_text = f"x{self.combo_multiplier:.1f}"
-            multiplier_surf = self.font_medium.render(multiplier_text, True, WHITE)
-            multiplier_rect = multiplier_surf.get_rect(center=(combo_x + combo_width // 2, combo_y + 45))
-            self.screen.blit(multiplier_surf, multiplier_rect)
-
-            # Прогресс-бар комбо-таймера (внизу панели, тоньше)
+            hud["combo"].draw(screen, (combo_x, combo_y), (self.combo_multiplier, combo_width))
+
+            # Прогресс-бар комбо-таймера меняется каждый кадр - рисуем поверх панели
             bar_width = combo_width - 20
             bar_height = 6
             bar_x = combo_x + 10
             bar_y = combo_y + combo_height - 12
-
-            # Фон бара
-            pygame.draw.rect(self.screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height), 0, 3)
-
-            # Заполненная часть
             fill_width = int((self.combo_timer / self.combo_max_time) * bar_width)
+            screen.flush(renderer)
             if fill_width > 0:
-                pygame.draw.rect(self.screen, combo_color, (bar_x, bar_y, fill_width, bar_height), 0, 3)
-
-            # Обводка
-            pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1, 3)
+                renderer.rect(self.combo_color(), (bar_x, bar_y, fill_width, bar_height), 0, 3)
+            renderer.rect(WHITE, (bar_x, bar_y, bar_width, bar_height), 1, 3)
 
         # Активные квесты
         if self.active_quests:
-            quest_y = 150
-            for quest in self.active_quests:
-                if not quest.completed:
-                    quest_panel = pygame.Surface((280, 60), pygame.SRCALPHA)
-                    quest_panel.fill((200, 150, 0, 200))
-                    self.screen.blit(quest_panel, (SCREEN_WIDTH - 300, quest_y))
-
-                    quest_title = self.font_tiny.render("ТАПСЫРМА:", True, YELLOW)
-                    self.screen.blit(quest_title, (SCREEN_WIDTH - 290, quest_y + 5))
-
-                    quest_desc = self.font_tiny.render(quest.description, True, WHITE)
-                    self.screen.blit(quest_desc, (SCREEN_WIDTH - 290, quest_y + 25))
-
-                    reward_text = self.font_tiny.render(f"Сыйлық: {quest.reward} монета", True, GREEN)
-                    self.screen.blit(reward_text, (SCREEN_WIDTH - 290, quest_y + 42))
-
-                    quest_y += 70
+            quests = tuple((quest.description, quest.reward) for quest in self.active_quests if not quest.completed)
+            if quests:
+                hud["quests"].draw(screen, (SCREEN_WIDTH - 300, 150), quests)
 
         # Подсказка взаимодействия с NPC
         if self.current_level == 1:
             for quest_giver in self.quest_givers:
                 if quest_giver.check_player_nearby(self.player):
-                    hint_panel = pygame.Surface((200, 35), pygame.SRCALPHA)
-                    hint_panel.fill((255, 215, 0, 220))
-                    self.screen.blit(hint_panel, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 120))
-
-                    hint_text = self.font_small.render("E-ны бас", True, BLACK)
-                    self.screen.blit(hint_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT - 113))
+                    hud["hint"].draw(screen, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT - 120))
 
         # Миникарта
-        self.draw_minimap()
+        self.draw_minimap(screen)
+        screen.flush(renderer)
+
+    def combo_color(self):
+        """Цвет комбо зависит от множителя"""
+        if self.combo_multiplier >= 4:
+            return (255, 100, 255)  # Фиолетовый
+        elif self.combo_multiplier >= 3:
+            return (255, 50, 50)  # Красный
+        elif self.combo_multiplier >= 2:
+            return ORANGE  # Оранжевый
+        return YELLOW  # Желтый
+
+    def render_hud_background(self, value):
+        """Градиент верхней панели (строится один раз)"""
+        hud_panel = pygame.Surface((SCREEN_WIDTH, 100), pygame.SRCALPHA)
+        for y in range(100):
+            alpha = int(180 - (y * 1.5))
+            color = (0, 0, 0, alpha)
+            pygame.draw.rect(hud_panel, color, (0, y, SCREEN_WIDTH, 1))
+        return hud_panel
 
-    def draw_minimap(self):
-        """Миникарта"""
-        size = 180
-        x = SCREEN_WIDTH - size - 15
-        y = SCREEN_HEIGHT - size - 15
+    def render_hud_timer(self, value):
+        """Панель таймера"""
+        minutes, seconds, timer_color = value
+        timer_panel = pygame.Surface((200, 60), pygame.SRCALPHA)
+        timer_panel.fill((0, 0, 0, 180))
+        pygame.draw.rect(timer_panel, timer_color, (0, 0, 200, 60), 3, 10)
 
-        # Фон с градиентом
-        minimap = pygame.Surface((size, size), pygame.SRCALPHA)
-        for i in range(size):
-            alpha = int(200 - (i * 0.5))
-            pygame.draw.rect(minimap, (20, 20, 20, alpha), (0, i, size, 1))
-        self.screen.blit(minimap, (x, y))
+        timer_surf = TextCache.render(self.font_large, f"{minutes}:{seconds:02d}", timer_color)
+        timer_panel.blit(timer_surf, timer_surf.get_rect(center=(100, 30)))
+        return timer_panel
+
+    def render_hud_score(self, score):
+        """Очки с иконкой"""
+        score_text = TextCache.render(self.font_small, f"{score}", WHITE)
+        image = pygame.Surface((35 + score_text.get_width(), max(30, 2 + score_text.get_height())),
+                               pygame.SRCALPHA)
+        pygame.draw.circle(image, YELLOW, (15, 15), 15)
+        image.blit(score_text, (35, 2))
+        return image
+
+    def render_hud_trash(self, remaining_trash):
+        """Счетчик оставшегося мусора"""
+        trash_color = RED if remaining_trash > 0 else GREEN
+        trash_count_text = TextCache.render(self.font_small, f"{remaining_trash}", trash_color)
+        image = pygame.Surface((40 + trash_count_text.get_width(), 30), pygame.SRCALPHA)
+        pygame.draw.rect(image, trash_color, (5, 5, 20, 20), 0, 3)
+        image.blit(trash_count_text, (40, 2))
+        return image
 
-        # Рамка
-        pygame.draw.rect(self.screen, WHITE, (x, y, size, size), 3, 5)
+    def render_hud_health(self, health):
+        """Подпись HP и полоса здоровья"""
+        image = pygame.Surface((210, 66), pygame.SRCALPHA)
+        image.blit(TextCache.render(self.font_small, "HP", WHITE), (0, 0))
 
-        # Масштаб
-        scale_x = size / WORLD_WIDTH
-        scale_y = size / WORLD_HEIGHT
+        # Красивая полоса здоровья
+        bar_width = 180
+        bar_height = 28
+        bar_x = 30
+        bar_y = 38
 
-        # Игрок
-        if self.player:
-            px = x + int(self.player.rect.centerx * scale_x)
-            py = y + int(self.player.rect.centery * scale_y)
-            pygame.draw.circle(self.screen, BLUE, (px, py), 5)
-            pygame.draw.circle(self.screen, WHITE, (px, py), 5, 1)
+        # Фон полосы
+        pygame.draw.rect(image, (50, 0, 0), (bar_x, bar_y, bar_width, bar_height), 0, 5)
 
-        # Мусор
-        for trash in self.trash_group:
-            tx = x + int(trash.rect.centerx * scale_x)
-            ty = y + int(trash.rect.centery * scale_y)
-            color = RED if trash.needs_drone else YELLOW
-            pygame.draw.circle(self.screen, color, (tx, ty), 3)
+        # Градиент здоровья
+        health_width = int((health / 100) * bar_width)
+        for x in range(health_width):
+            ratio = x / bar_width
+            if health > 50:
+                color = (int(100 * ratio), 255 - int(100 * ratio), 0)
+            else:
+                color = (255, int(100 * (1 - ratio)), 0)
+            pygame.draw.rect(image, color, (bar_x + x, bar_y + 2, 1, bar_height - 4))
 
-        # Станция
-        if self.recycling_station:
-            sx = x + int(self.recycling_station.rect.centerx * scale_x)
-            sy = y + int(self.recycling_station.rect.centery * scale_y)
-            pygame.draw.rect(self.screen, GREEN, (sx - 4, sy - 4, 8, 8), 0, 2)
+        # Обводка
+        pygame.draw.rect(image, WHITE, (bar_x, bar_y, bar_width, bar_height), 3, 5)
 
-        # Заголовок
-        label = self.font_tiny.render("КАРТА", True, WHITE)
-        self.screen.blit(label, (x + 8, y + 5))
+        # Текст HP
+        hp_text = TextCache.render(self.font_small, f"{health}", WHITE)
+        image.blit(hp_text, hp_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2)))
+        return image
+
+    def render_hud_bag(self, value):
+        """Инвентарь"""
+        carrying, max_trash = value
+        inv_panel = pygame.Surface((200, 50), pygame.SRCALPHA)
+        inv_panel.fill((0, 100, 0, 200))
+        inv_panel.blit(TextCache.render(self.font_small, f"Сөмке: {carrying}/{max_trash}", WHITE), (10, 7))
+        return inv_panel
+
+    def render_hud_drone(self, active):
+        """Статус дрона"""
+        drone_panel = pygame.Surface((120, 35), pygame.SRCALPHA)
+        drone_panel.fill((0, 150, 0, 200) if active else (150, 0, 0, 200))
+        drone_status = "ДРОН ҚОС" if active else "ДРОН ӨШІР"
+        drone_panel.blit(TextCache.render(self.font_small, drone_status, WHITE), (10, 5))
+        return drone_panel
+
+    def render_hud_dash(self, dash_state):
+        """Индикатор Dash: None - готов, иначе (заполнение полосы в пикселях, секунды перезарядки)"""
+        dash_panel_w = DASH_BAR_WIDTH + 20
+        dash_panel_h = 50
 
-    def draw_pause(self):
-        """Пауза"""
+        # Фон панели
+        dash_panel = pygame.Surface((dash_panel_w, dash_panel_h), pygame.SRCALPHA)
+        dash_panel.fill((50, 50, 50, 180))
+        pygame.draw.rect(dash_panel, (150, 200, 255), (0, 0, dash_panel_w, dash_panel_h), 2, 5)
+
+        # Текст DASH
+        dash_panel.blit(TextCache.render(self.font_tiny, "СЕКІРУ [SPACE]", (150, 200, 255)), (10, 5))
+
+        # Прогресс-бар cooldown
+        bar_width = dash_panel_w - 20
+        bar_height = 10
+        bar_x = 10
+        bar_y = 30
+
+        # Фон бара
+        pygame.draw.rect(dash_panel, (30, 30, 30), (bar_x, bar_y, bar_width, bar_height), 0, 3)
+
+        if dash_state:
+            # Перезарядка
+            fill_width, seconds = dash_state
+            bar_color = (100, 100, 100) if fill_width < bar_width else (150, 200, 255)
+            pygame.draw.rect(dash_panel, bar_color, (bar_x, bar_y, fill_width, bar_height), 0, 3)
+
+            # Текст cooldown
+            cd_text = TextCache.render(self.font_tiny, f"{seconds}с", WHITE)
+            dash_panel.blit(cd_text, (bar_x + bar_width // 2 - 10, bar_y - 15))
+        else:
+            # Готов к использованию
+            pygame.draw.rect(dash_panel, (150, 255, 150), (bar_x, bar_y, bar_width, bar_height), 0, 3)
+            ready_text = TextCache.render(self.font_tiny, "ДАЙЫН!", (150, 255, 150))
+            dash_panel.blit(ready_text, (bar_x + bar_width // 2 - 20, bar_y - 15))
+        return dash_panel
+
+    def render_hud_poison(self, time_left):
+        """Статус отравления"""
+        poison_panel = pygame.Surface((180, 45), pygame.SRCALPHA)
+        poison_panel.fill((120, 50, 150, 200))
+        poison_panel.blit(TextCache.render(self.font_small, "УЛАНДЫ!", (255, 100, 255)), (20, 5))
+        poison_panel.blit(TextCache.render(self.font_tiny, f"Дәріхананы тап! {time_left}с", WHITE), (20, 25))
+        return poison_panel
+
+    def render_hud_river(self, river_trash_count):
+        """Статус ручья: сколько мусора блокирует или 0 - течет"""
+        if river_trash_count > 0:
+            river_panel = pygame.Surface((220, 40), pygame.SRCALPHA)
+            river_panel.fill((0, 100, 150, 200))
+            river_text = TextCache.render(self.font_tiny, f"Өзен бұғатталған! Қоқыс: {river_trash_count}", WATER_BLUE)
+            river_panel.blit(river_text, (10, 10))
+        else:
+            river_panel = pygame.Surface((180, 35), pygame.SRCALPHA)
+            river_panel.fill((0, 150, 200, 200))
+            river_panel.blit(TextCache.render(self.font_small, "Өзен ағады!", WHITE), (10, 7))
+        return river_panel
+
+    def render_hud_combo(self, value):
+        """Панель комбо без полосы таймера"""
+        combo_multiplier, combo_width = value
+        combo_color = self.combo_color()
+        combo_height = 70
+        combo_panel = pygame.Surface((combo_width, combo_height), pygame.SRCALPHA)
+        combo_panel.fill((0, 0, 0, 180))
+        pygame.draw.rect(combo_panel, combo_color, (0, 0, combo_width, combo_height), 3, 10)
+
+        # Текст COMBO (меньше)
+        combo_label = TextCache.render(self.font_medium, "COMBO", combo_color)
+        combo_panel.blit(combo_label, combo_label.get_rect(center=(combo_width // 2, 20)))
+
+        # Множитель
+        multiplier_surf = TextCache.render(self.font_medium, f"x{combo_multiplier:.1f}", WHITE)
+        combo_panel.blit(multiplier_surf, multiplier_surf.get_rect(center=(combo_width // 2, 45)))
+
+        # Фон полосы таймера
+        pygame.draw.rect(combo_panel, (50, 50, 50), (10, combo_height - 12, combo_width - 20, 6), 0, 3)
+        return combo_panel
+
+    def render_hud_quests(self, quests):
+        """Список активных квестов"""
+        image = pygame.Surface((280, 70 * len(quests) - 10), pygame.SRCALPHA)
+        for i, (description, reward) in enumerate(quests):
+            quest_y = i * 70
+            image.fill((200, 150, 0, 200), (0, quest_y, 280, 60))
+            image.blit(TextCache.render(self.font_tiny, "ТАПСЫРМА:", YELLOW), (10, quest_y + 5))
+            image.blit(TextCache.render(self.font_tiny, description, WHITE), (10, quest_y + 25))
+            image.blit(TextCache.render(self.font_tiny, f"Сыйлық: {reward} монета", GREEN), (10, quest_y + 42))
+        return image
+
+    def render_hud_hint(self, value):
+        """Подсказка взаимодействия с NPC"""
+        hint_panel = pygame.Surface((200, 35), pygame.SRCALPHA)
+        hint_panel.fill((255, 215, 0, 220))
+        hint_panel.blit(TextCache.render(self.font_small, "E-ны бас", BLACK), (50, 7))
+        return hint_panel
+
+    def draw_minimap(self, renderer):
+        """Миникарта"""
+        size = self.minimap.size
+        self.minimap.draw(renderer, (SCREEN_WIDTH - size - 15, SCREEN_HEIGHT - size - 15), self.player,
+                          self.camera.view_rect())
+
+    def draw_frozen(self):
+        """Пауза и конец уровня: мир стоит, рисуем снимок кадра, собранный при входе в состояние"""
+        if self.frozen_state == self.state:
+            self.screen.blit(self.frozen_frame, (0, 0))
+            return
+
+        self.screen.fill(BLACK)
+        self.draw_game(self.surface_renderer)
+        if self.state == GameState.PAUSE:
+            self.draw_hud(self.surface_renderer)
+            self.draw_pause()
+        else:
+            self.draw_level_complete()
+        self.frozen_frame = self.screen.copy()
+        self.frozen_state = self.state
+
+    def render_dim_overlay(self, value):
+        """Полупрозрачное затемнение экрана"""
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(180)
         overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        return overlay
 
-        pause_text = self.font_large.render("КІДІРІС", True, YELLOW)
+    def draw_pause(self):
+        """Пауза"""
+        self.backgrounds["dim"].draw(self.screen, (0, 0))
+
+        pause_text = TextCache.render(self.font_large, "КІДІРІС", YELLOW)
         pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
 
         # Тень
-        shadow = self.font_large.render("КІДІРІС", True, DARK_GRAY)
+        shadow = TextCache.render(self.font_large, "КІДІРІС", DARK_GRAY)
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 + 3))
         self.screen.blit(shadow, shadow_rect)
         self.screen.blit(pause_text, pause_rect)
 
     def draw_level_complete(self):
         """Уровень пройден"""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.backgrounds["dim"].draw(self.screen, (0, 0))
 
-        complete_text = self.font_large.render("ДЕҢГЕЙ ӨТІЛДІ!", True, GREEN)
+        complete_text = TextCache.render(self.font_large, "ДЕҢГЕЙ ӨТІЛДІ!", GREEN)
         complete_rect = complete_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60))
 
-        shadow = self.font_large.render("ДЕҢГЕЙ ӨТІЛДІ!", True, DARK_GREEN)
+        shadow = TextCache.render(self.font_large, "ДЕҢГЕЙ ӨТІЛДІ!", DARK_GREEN)
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 - 57))
         self.screen.blit(shadow, shadow_rect)
         self.screen.blit(complete_text, complete_rect)
@@ -1756,15 +2365,15 @@ class Game:
         time_spent = self.level_time_limit - self.level_timer
         time_minutes = int(time_spent // 60)
         time_seconds = int(time_spent % 60)
-        time_text = self.font_medium.render(f"Уақыт: {time_minutes}:{time_seconds:02d}", True, WHITE)
+        time_text = TextCache.render(self.font_medium, f"Уақыт: {time_minutes}:{time_seconds:02d}", WHITE)
         time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         self.screen.blit(time_text, time_rect)
 
-        score_text = self.font_medium.render(f"Ұпай: {self.score}", True, YELLOW)
+        score_text = TextCache.render(self.font_medium, f"Ұпай: {self.score}", YELLOW)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
         self.screen.blit(score_text, score_rect)
 
-        continue_text = self.font_small.render("ENTER-ді бас", True, WHITE)
+        continue_text = TextCache.render(self.font_small, "ENTER-ді бас", WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150))
         self.screen.blit(continue_text, continue_rect)
 
@@ -1776,19 +2385,19 @@ class Game:
             color = (intensity, 0, 0)
             pygame.draw.rect(self.screen, color, (0, y, SCREEN_WIDTH, 5))
 
-        game_over_text = self.font_large.render("ОЙЫН АЯҚТАЛДЫ", True, WHITE)
+        game_over_text = TextCache.render(self.font_large, "ОЙЫН АЯҚТАЛДЫ", WHITE)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
 
-        shadow = self.font_large.render("ОЙЫН АЯҚТАЛДЫ", True, DARK_GRAY)
+        shadow = TextCache.render(self.font_large, "ОЙЫН АЯҚТАЛДЫ", DARK_GRAY)
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 4, SCREEN_HEIGHT // 2 - 46))
         self.screen.blit(shadow, shadow_rect)
         self.screen.blit(game_over_text, game_over_rect)
 
-        score_text = self.font_medium.render(f"Ұпай: {self.score}", True, YELLOW)
+        score_text = TextCache.render(self.font_medium, f"Ұпай: {self.score}", YELLOW)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(score_text, score_rect)
 
-        continue_text = self.font_small.render("ENTER - мәзірге", True, WHITE)
+        continue_text = TextCache.render(self.font_small, "ENTER - мәзірге", WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
         self.screen.blit(continue_text, continue_rect)
 
@@ -1799,13 +2408,8 @@ class Game:
 
         time_offset = pygame.time.get_ticks() / 1000
 
-        # Красивый градиентный фон (золотисто-коричневый)
-        for y in range(0, SCREEN_HEIGHT, 2):
-            ratio = y / SCREEN_HEIGHT
-            r = int(40 + ratio * 60)
-            g = int(30 + ratio * 40)
-            b = int(10 + ratio * 30)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y), 2)
+        # Красивый градиентный фон (золотисто-коричневый, строится один раз)
+        self.backgrounds["shop_wave"].draw(self.screen, (0, 0))
 
         # Декоративные монеты летают
         for i in range(10):
@@ -1814,17 +2418,36 @@ class Game:
             pygame.draw.circle(self.screen, (255, 215, 0, 150), (coin_x, coin_y), 12)
             pygame.draw.circle(self.screen, (255, 180, 0), (coin_x, coin_y), 12, 2)
 
-        # Заголовок с эффектом
+        # Заголовок с эффектом (текст из TextCache, прямо на экран поверх монет)
         title_y = 50
         for offset in [(4, 4), (2, 2)]:
-            shadow = self.font_large.render("ЖАҚСАРТУ ДҮКЕНІ", True, (100, 70, 20))
+            shadow = TextCache.render(self.font_large, "ЖАҚСАРТУ ДҮКЕНІ", (100, 70, 20))
             shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + offset[0], title_y + offset[1]))
             self.screen.blit(shadow, shadow_rect)
 
-        title = self.font_large.render("ЖАҚСАРТУ ДҮКЕНІ", True, (255, 215, 0))
+        title = TextCache.render(self.font_large, "ЖАҚСАРТУ ДҮКЕНІ", (255, 215, 0))
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, title_y))
         self.screen.blit(title, title_rect)
 
+        # Баланс и карточки меняются только после покупки
+        state = (self.total_coins, tuple(self.upgrades.items()), tuple(self.upgrade_prices.items()))
+        self.backgrounds["shop"].draw(self.screen, (0, 0), state)
+
+    def render_shop_background(self, value):
+        """Градиентный фон магазина"""
+        image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, 2):
+            ratio = y / SCREEN_HEIGHT
+            r = int(40 + ratio * 60)
+            g = int(30 + ratio * 40)
+            b = int(10 + ratio * 30)
+            pygame.draw.line(image, (r, g, b), (0, y), (SCREEN_WIDTH, y), 2)
+        return image
+
+    def render_shop_panel(self, state):
+        """Баланс и карточки улучшений (слой в премультиплицированной альфе)"""
+        image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
         # Баланс монет (большая красивая панель)
         balance_y = 120
         balance_width = 350
@@ -1834,7 +2457,7 @@ class Game:
         # Тень
         shadow_surf = pygame.Surface((balance_width + 6, balance_height + 6), pygame.SRCALPHA)
         shadow_surf.fill((0, 0, 0, 100))
-        self.screen.blit(shadow_surf, (balance_x + 3, balance_y + 3))
+        SurfaceFactory.composite(image, shadow_surf, (balance_x + 3, balance_y + 3))
 
         # Панель баланса
         balance_surf = pygame.Surface((balance_width, balance_height), pygame.SRCALPHA)
@@ -1844,21 +2467,21 @@ class Game:
             pygame.draw.line(balance_surf, color, (0, i), (balance_width, i))
 
         pygame.draw.rect(balance_surf, (255, 215, 0), (0, 0, balance_width, balance_height), 4, 15)
-        self.screen.blit(balance_surf, (balance_x, balance_y))
+        SurfaceFactory.composite(image, balance_surf, (balance_x, balance_y))
 
         # Иконка монеты
         coin_icon_x = balance_x + 35
         coin_icon_y = balance_y + balance_height // 2
-        pygame.draw.circle(self.screen, (255, 230, 0), (coin_icon_x, coin_icon_y), 25)
-        pygame.draw.circle(self.screen, (255, 180, 0), (coin_icon_x, coin_icon_y), 25, 3)
-        pygame.draw.circle(self.screen, (255, 180, 0), (coin_icon_x, coin_icon_y), 18, 2)
+        pygame.draw.circle(image, (255, 230, 0), (coin_icon_x, coin_icon_y), 25)
+        pygame.draw.circle(image, (255, 180, 0), (coin_icon_x, coin_icon_y), 25, 3)
+        pygame.draw.circle(image, (255, 180, 0), (coin_icon_x, coin_icon_y), 18, 2)
 
         # Текст баланса
-        balance_label = self.font_small.render("Сіздің балансыңыз:", True, WHITE)
-        self.screen.blit(balance_label, (coin_icon_x + 40, balance_y + 12))
+        balance_label = TextCache.render(self.font_small, "Сіздің балансыңыз:", WHITE)
+        SurfaceFactory.composite(image, balance_label, (coin_icon_x + 40, balance_y + 12))
 
-        balance_amount = self.font_large.render(f"{self.total_coins}", True, WHITE)
-        self.screen.blit(balance_amount, (coin_icon_x + 40, balance_y + 28))
+        balance_amount = TextCache.render(self.font_large, f"{self.total_coins}", WHITE)
+        SurfaceFactory.composite(image, balance_amount, (coin_icon_x + 40, balance_y + 28))
 
         # Товары (карточки улучшений)
         items = [
@@ -1908,7 +2531,7 @@ class Game:
             # Тень карточки
             shadow = pygame.Surface((card_width + 6, card_height + 6), pygame.SRCALPHA)
             shadow.fill((0, 0, 0, 120))
-            self.screen.blit(shadow, (card_x + 4, card_y + 4))
+            SurfaceFactory.composite(image, shadow, (card_x + 4, card_y + 4))
 
             # Карточка
             card = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
@@ -1932,36 +2555,36 @@ class Game:
                 pygame.draw.line(card, (r, g, b, 240), (5, i), (card_width - 5, i))
 
             pygame.draw.rect(card, WHITE, (0, 0, card_width, card_height), 3, 12)
-            self.screen.blit(card, (card_x, card_y))
+            SurfaceFactory.composite(image, card, (card_x, card_y))
 
             # Иконка товара
             icon_x = card_x + 30
             icon_y = card_y + card_height // 2
-            pygame.draw.circle(self.screen, item["icon_color"], (icon_x, icon_y), 35)
-            pygame.draw.circle(self.screen, WHITE, (icon_x, icon_y), 35, 3)
+            pygame.draw.circle(image, item["icon_color"], (icon_x, icon_y), 35)
+            pygame.draw.circle(image, WHITE, (icon_x, icon_y), 35, 3)
 
             # Название
-            title_surf = self.font_medium.render(item["title"], True, WHITE)
-            self.screen.blit(title_surf, (icon_x + 50, card_y + 15))
+            title_surf = TextCache.render(self.font_medium, item["title"], WHITE)
+            SurfaceFactory.composite(image, title_surf, (icon_x + 50, card_y + 15))
 
             # Описание
-            desc_surf = self.font_tiny.render(item["description"], True, (220, 220, 220))
-            self.screen.blit(desc_surf, (icon_x + 50, card_y + 45))
+            desc_surf = TextCache.render(self.font_tiny, item["description"], (220, 220, 220))
+            SurfaceFactory.composite(image, desc_surf, (icon_x + 50, card_y + 45))
 
             # Статистика
-            stats_surf = self.font_tiny.render(item["stats"], True, (180, 180, 180))
-            self.screen.blit(stats_surf, (icon_x + 50, card_y + 65))
+            stats_surf = TextCache.render(self.font_tiny, item["stats"], (180, 180, 180))
+            SurfaceFactory.composite(image, stats_surf, (icon_x + 50, card_y + 65))
 
             # Цена и статус
             if owned:
-                status_surf = self.font_small.render("✓ САТЫП АЛЫНДЫ", True, (100, 255, 100))
-                self.screen.blit(status_surf, (icon_x + 50, card_y + 95))
+                status_surf = TextCache.render(self.font_small, "✓ САТЫП АЛЫНДЫ", (100, 255, 100))
+                SurfaceFactory.composite(image, status_surf, (icon_x + 50, card_y + 95))
             else:
-                price_surf = self.font_small.render(f"{item['price']} монета", True, YELLOW)
-                self.screen.blit(price_surf, (icon_x + 50, card_y + 95))
+                price_surf = TextCache.render(self.font_small, f"{item['price']} монета", YELLOW)
+                SurfaceFactory.composite(image, price_surf, (icon_x + 50, card_y + 95))
 
                 # Кнопка покупки
-                key_label = self.font_tiny.render(f"[{item['key']}]", True, WHITE)
+                key_label = TextCache.render(self.font_tiny, f"[{item['key']}]", WHITE)
                 key_rect = key_label.get_rect(right=card_x + card_width - 15, centery=card_y + card_height - 20)
 
                 key_bg = pygame.Surface((40, 25), pygame.SRCALPHA)
@@ -1970,18 +2593,19 @@ class Game:
                 else:
                     key_bg.fill((100, 100, 100, 200))
                 pygame.draw.rect(key_bg, WHITE, (0, 0, 40, 25), 2, 5)
-                self.screen.blit(key_bg, (key_rect.x - 10, key_rect.y - 5))
-                self.screen.blit(key_label, key_rect)
+                SurfaceFactory.composite(image, key_bg, (key_rect.x - 10, key_rect.y - 5))
+                SurfaceFactory.composite(image, key_label, key_rect)
 
         # Инструкции внизу
         inst_bg = pygame.Surface((SCREEN_WIDTH - 100, 50), pygame.SRCALPHA)
         inst_bg.fill((50, 50, 50, 200))
         pygame.draw.rect(inst_bg, WHITE, (0, 0, SCREEN_WIDTH - 100, 50), 2, 10)
-        self.screen.blit(inst_bg, (50, SCREEN_HEIGHT - 80))
+        SurfaceFactory.composite(image, inst_bg, (50, SCREEN_HEIGHT - 80))
 
-        inst_text = self.font_small.render("Сатып алу үшін 1, 2 немесе 3-ті басыңыз  |  ESC - мәзірге оралу", True, WHITE)
+        inst_text = TextCache.render(self.font_small, "Сатып алу үшін 1, 2 немесе 3-ті басыңыз  |  ESC - мәзірге оралу", WHITE)
         inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 55))
-        self.screen.blit(inst_text, inst_rect)
+        SurfaceFactory.composite(image, inst_text, inst_rect)
+        return image
 
     def draw_shop_item(self, x, y, title, price, description, owned):
         """Отрисовка товара в магазине"""
@@ -2005,22 +2629,32 @@ class Game:
         self.screen.blit(panel, (x, y))
 
         # Название
-        title_surf = self.font_medium.render(title, True, WHITE)
+        title_surf = TextCache.render(self.font_medium, title, WHITE)
         self.screen.blit(title_surf, (x + 20, y + 15))
 
         # Цена
-        price_surf = self.font_small.render(price, True, YELLOW)
+        price_surf = TextCache.render(self.font_small, price, YELLOW)
         self.screen.blit(price_surf, (x + 20, y + 50))
 
         # Описание
-        desc_surf = self.font_small.render(description, True, WHITE)
+        desc_surf = TextCache.render(self.font_small, description, WHITE)
         self.screen.blit(desc_surf, (x + 300, y + 50))
 
         # Статус
-        status_surf = self.font_medium.render(status_text, True, status_color)
+        status_surf = TextCache.render(self.font_medium, status_text, status_color)
         status_rect = status_surf.get_rect(right=x + panel_width - 20, centery=y + panel_height // 2)
         self.screen.blit(status_surf, status_rect)
 
+    def render_vignette(self, size):
+        """Затемнение краев экрана для катсцены"""
+        width, height = size
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        for i in range(100):
+            alpha = int((i / 100) * 150)
+            pygame.draw.rect(overlay, (0, 0, 0, alpha),
+                           (i, i, width - i * 2, height - i * 2), 1)
+        return overlay
+
     def start_river_restoration_cutscene(self):
         """Запустить катсцену восстановления реки"""
         self.cutscene_active = True
@@ -2039,7 +2673,8 @@ class Game:
             for i in range(6):
                 offset_x = random.randint(-80, 80)
                 offset_y = random.randint(-100, 100)
-                villager = CelebratingVillager(
+                villager = EntityPool.acquire(
+                    CelebratingVillager,
                     blockage_segment.rect.centerx + offset_x,
                     blockage_segment.rect.centery + offset_y
                 )
@@ -2048,26 +2683,20 @@ class Game:
 
     def draw_cutscene(self):
         """Рисовать катсцену"""
-        self.draw_game()
+        self.draw_game(self.surface_renderer)
 
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        for i in range(100):
-            alpha = int((i / 100) * 150)
-            pygame.draw.rect(overlay, (0, 0, 0, alpha),
-                           (i, i, SCREEN_WIDTH - i * 2, SCREEN_HEIGHT - i * 2), 1)
-        self.screen.blit(overlay, (0, 0))
+        # Виньетка строится один раз для размера экрана
+        self.backgrounds["vignette"].draw(self.screen, (0, 0), self.screen.get_size())
 
         if self.cutscene_type == "river_restoration":
             fade = min(1.0, self.cutscene_timer / 60)
             title_alpha = int(255 * fade)
 
             title_text = "ӨЗЕН ҚАЛПЫНА КЕЛТІРІЛДІ!"
-            title = self.font_large.render(title_text, True, (100, 200, 255))
-            title.set_alpha(title_alpha)
+            title = TextCache.render(self.font_large, title_text, (100, 200, 255), alpha=title_alpha)
             title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
 
-            shadow = self.font_large.render(title_text, True, (0, 50, 100))
-            shadow.set_alpha(title_alpha // 2)
+            shadow = TextCache.render(self.font_large, title_text, (0, 50, 100), alpha=title_alpha // 2)
             shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, 103))
 
             self.screen.blit(shadow, shadow_rect)
@@ -2075,73 +2704,245 @@ class Game:
 
             if self.cutscene_timer > 30:
                 subtitle_alpha = int(255 * min(1.0, (self.cutscene_timer - 30) / 40))
-                subtitle = self.font_medium.render("Ауыл тұрғындары қуанышты!", True, YELLOW)
-                subtitle.set_alpha(subtitle_alpha)
+                subtitle = TextCache.render(self.font_medium, "Ауыл тұрғындары қуанышты!", YELLOW,
+                                            alpha=subtitle_alpha)
                 subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, 160))
                 self.screen.blit(subtitle, subtitle_rect)
 
+    def run_headless(self, level=1, steps=None, draw=False, script=HEADLESS_SCRIPT):
+        """Прогон уровня без ожидания кадров: ввод по сценарию, отрисовка только при draw=True
+
+        Идет до конца уровня (или steps шагов) и возвращает счетчики прогона.
+        """
+        InputSource.script = ScriptedInput(script)
+        self.current_level = level
+        self.load_level(level)
+        self.state = GameState.PLAYING
+
+        done = 0
+        start = time.perf_counter()
+        while self.running and self.state in (GameState.PLAYING, GameState.CUTSCENE):
+            if steps is not None and done >= steps:
+                break
+            InputSource.script.advance()
+            self.handle_events()
+            self.update()
+            if draw:
+                self.draw()
+            done += 1
+        elapsed = time.perf_counter() - start
+        InputSource.script = None
+
+        return {
+            "level": level,
+            "steps": done,
+            "game_seconds": done / FPS,
+            "wall_seconds": elapsed,
+            "speedup": done / FPS / elapsed if elapsed else 0.0,
+            "state": self.state.name,
+            "score": self.score,
+            "trash_left": len(self.trash_group),
+        }
+
     def run(self):
-        """Главный игровой цикл"""
+        """Главный игровой цикл: симуляция фиксированным шагом, отрисовка с интерполяцией"""
+        step = 1 / FPS
+        accumulator = 0.0
+        previous = time.perf_counter()
         while self.running:
+            now = time.perf_counter()
+            # На медленной машине догоняем не больше MAX_CATCHUP_STEPS шагов, остальное время теряем
+            accumulator = min(accumulator + now - previous, MAX_CATCHUP_STEPS * step)
+            previous = now
+
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            while accumulator >= step:
+                self.snapshot()
+                self.update()
+                accumulator -= step
+            self.draw(accumulator / step)
+            # Пока мир стоит, крутим цикл реже
+            self.clock.tick(PAUSED_FPS if self.state in FROZEN_STATES else RENDER_FPS)
 
         pygame.quit()
         sys.exit()
 
 
-class GroundTile(pygame.sprite.Sprite):
-    """Тайл земли с улучшенной графикой"""
-    def __init__(self, x, y, level):
-        super().__init__()
-        self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
+class ChunkedLayer:
+    """Слой мира, запеченный в крупные чанки; рисуются только видимые"""
+    def __init__(self, chunk_size=GROUND_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.cols = (WORLD_WIDTH + chunk_size - 1) // chunk_size
+        self.rows = (WORLD_HEIGHT + chunk_size - 1) // chunk_size
+        self.chunks = {}  # (col, row) -> Surface; пустых чанков нет
+
+    def chunk_rect(self, col, row):
+        """Область чанка в мировых координатах"""
+        x0 = col * self.chunk_size
+        y0 = row * self.chunk_size
+        return pygame.Rect(x0, y0, min(self.chunk_size, WORLD_WIDTH - x0),
+                           min(self.chunk_size, WORLD_HEIGHT - y0))
+
+    def visible_chunks(self, view_rect):
+        """Чанки, пересекающиеся с видимой областью мира"""
+        first_col = max(0, view_rect.left // self.chunk_size)
+        last_col = min(self.cols - 1, (view_rect.right - 1) // self.chunk_size)
+        first_row = max(0, view_rect.top // self.chunk_size)
+        last_row = min(self.rows - 1, (view_rect.bottom - 1) // self.chunk_size)
+
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                chunk = self.chunks.get((col, row))
+                if chunk is not None:
+                    yield col, row, chunk
+
+    def draw(self, surface, camera, shake_offset=(0, 0)):
+        """Нарисовать только видимые чанки"""
+        view_rect = pygame.Rect(int(camera.x - shake_offset[0]) - 1,
+                                int(camera.y - shake_offset[1]) - 1,
+                                surface.get_width() + 2, surface.get_height() + 2)
+        surface.blits([(chunk, (col * self.chunk_size - camera.x + shake_offset[0],
+                                row * self.chunk_size - camera.y + shake_offset[1]))
+                       for col, row, chunk in self.visible_chunks(view_rect)], doreturn=False)
+
+
+class ScrollBuffer:
+    """Фон из слоев-чанков в буфере с запасом margin вокруг экрана
+
+    Пока вид камеры внутри буфера, кадр - один блит части буфера. Вышли за край - буфер
+    сдвигается на целое смещение (Surface.scroll) и дорисовывает только открывшиеся полосы.
+    Целиком перерисовывается при загрузке уровня и телепорте (старая область не пересекается с новой).
+    """
+    def __init__(self, layers, margin=SCROLL_BUFFER_MARGIN):
+        self.layers = layers  # ChunkedLayer снизу вверх
+        self.margin = margin
+        self.image = None
+        self.rect = None  # Область мира, лежащая в буфере
+        self.full_redraws = 0
+        self.scrolls = 0
+        self.strip_pixels = 0
+
+    def draw(self, surface, camera, shake_offset=(0, 0)):
+        """Нарисовать видимую часть фона, сдвинув буфер при необходимости"""
+        view = pygame.Rect(math.floor(camera.x - shake_offset[0]), math.floor(camera.y - shake_offset[1]),
+                           surface.get_width(), surface.get_height())
+        size = (view.width + 2 * self.margin, view.height + 2 * self.margin)
+        if self.image is None or self.image.get_size() != size:
+            self.image = SurfaceFactory.create(size, alpha=False)
+            self.rect = None
+        if self.rect is None or not self.rect.contains(view):
+            self.scroll_to(view.inflate(2 * self.margin, 2 * self.margin))
+        surface.blit(self.image, (0, 0), view.move(-self.rect.x, -self.rect.y))
+
+    def scroll_to(self, rect):
+        """Перенести буфер на область rect, перерисовав только то, чего в нем не было"""
+        old = self.rect
+        self.rect = rect
+        if old is None or not old.colliderect(rect):
+            self.full_redraws += 1
+            self.redraw(rect)
+            return
+
+        dx, dy = rect.x - old.x, rect.y - old.y
+        self.image.scroll(-dx, -dy)
+        self.scrolls += 1
+        # Открывшиеся столбцы и строки
+        if dx:
+            self.redraw(pygame.Rect(rect.right - dx if dx > 0 else rect.x, rect.y, abs(dx), rect.height))
+        if dy:
+            self.redraw(pygame.Rect(rect.x, rect.bottom - dy if dy > 0 else rect.y, rect.width, abs(dy)))
+
+    def redraw(self, area):
+        """Перерисовать мировую область area из слоев"""
+        local = area.move(-self.rect.x, -self.rect.y)
+        self.strip_pixels += area.width * area.height
+        self.image.set_clip(local)
+        self.image.fill(BLACK)  # За краем мира чанков нет
+        for layer in self.layers:
+            size = layer.chunk_size
+            self.image.blits([(chunk, (col * size - self.rect.x, row * size - self.rect.y))
+                              for col, row, chunk in layer.visible_chunks(area)], doreturn=False)
+        self.image.set_clip(None)
+
+    def stats(self):
+        """Счетчики перерисовок"""
+        return {
+            "full_redraws": self.full_redraws,
+            "scrolls": self.scrolls,
+            "strip_pixels": self.strip_pixels,
+        }
+
+
+class GroundLayer(ChunkedLayer):
+    """Земля уровня, запеченная в крупные чанки (вместо тысяч тайлов-спрайтов)"""
+    def __init__(self, level, chunk_size=GROUND_CHUNK_SIZE):
+        super().__init__(chunk_size)
+        self.level = level
+
+        # Один тайл рисуется во временную поверхность и копируется в чанк,
+        # чтобы детали не вылезали за границы тайла
+        self.tile_image = SurfaceFactory.create((TILE_SIZE, TILE_SIZE), alpha=False)
 
-        if level == 1:  # Лес - детализированная трава
+        for col in range(self.cols):
+            for row in range(self.rows):
+                self.chunks[(col, row)] = self.bake_chunk(col, row)
+
+    def bake_chunk(self, col, row):
+        """Запечь все тайлы одного чанка"""
+        chunk = SurfaceFactory.create(self.chunk_rect(col, row).size, alpha=False)
+
+        for x in range(0, chunk.get_width(), TILE_SIZE):
+            for y in range(0, chunk.get_height(), TILE_SIZE):
+                self.draw_tile()
+                chunk.blit(self.tile_image, (x, y))
+
+        return chunk
+
+    def draw_tile(self):
+        """Нарисовать один тайл земли с улучшенной графикой"""
+        image = self.tile_image
+
+        if self.level == 1:  # Лес - детализированная трава
             base = (40, 100, 40)
             var = random.randint(-15, 15)
-            self.image.fill((base[0] + var, base[1] + var, base[2] + var))
+            image.fill((base[0] + var, base[1] + var, base[2] + var))
 
             # Травинки
             for _ in range(8):
                 gx = random.randint(0, TILE_SIZE)
                 gy = random.randint(0, TILE_SIZE)
                 grass_color = (30 + var, 90 + var, 30 + var)
-                pygame.draw.line(self.image, grass_color, (gx, gy), (gx + 1, gy - 2))
+                pygame.draw.line(image, grass_color, (gx, gy), (gx + 1, gy - 2))
 
             # Темные пятна
             if random.random() < 0.1:
                 for _ in range(3):
                     dx = random.randint(0, TILE_SIZE - 4)
                     dy = random.randint(0, TILE_SIZE - 4)
-                    pygame.draw.circle(self.image, (30, 80, 30), (dx, dy), 2)
+                    pygame.draw.circle(image, (30, 80, 30), (dx, dy), 2)
 
-        elif level == 2:  # Город - асфальт
+        elif self.level == 2:  # Город - асфальт
             base = (60, 60, 60)
             var = random.randint(-10, 10)
-            self.image.fill((base[0] + var, base[1] + var, base[2] + var))
+            image.fill((base[0] + var, base[1] + var, base[2] + var))
 
             # Трещины
             if random.random() < 0.15:
                 start = (random.randint(0, TILE_SIZE), random.randint(0, TILE_SIZE))
                 end = (random.randint(0, TILE_SIZE), random.randint(0, TILE_SIZE))
-                pygame.draw.line(self.image, (40, 40, 40), start, end, 1)
+                pygame.draw.line(image, (40, 40, 40), start, end, 1)
 
             # Пятна
             if random.random() < 0.2:
                 for _ in range(2):
                     px = random.randint(0, TILE_SIZE)
                     py = random.randint(0, TILE_SIZE)
-                    self.image.set_at((px, py), (50, 50, 50))
+                    image.set_at((px, py), (50, 50, 50))
 
         else:  # Пустыня - песок
             base = (200, 170, 120)
             var = random.randint(-20, 20)
-            self.image.fill((base[0] + var, base[1] + var, base[2] + var))
+            image.fill((base[0] + var, base[1] + var, base[2] + var))
 
             # Песчинки
             for _ in range(15):
@@ -2150,17 +2951,426 @@ class GroundTile(pygame.sprite.Sprite):
                 sand_color = (base[0] + var + random.randint(-10, 10),
                             base[1] + var + random.randint(-10, 10),
                             base[2] + var + random.randint(-10, 10))
-                self.image.set_at((sx, sy), sand_color)
+                image.set_at((sx, sy), sand_color)
+
+
+class PropLayer(ChunkedLayer):
+    """Статичные пропы (трава, дороги, декорации), запеченные под персонажами"""
+    def __init__(self, props, chunk_size=GROUND_CHUNK_SIZE):
+        super().__init__(chunk_size)
+
+        # Рисуем в порядке Y, как это делала сортировка при отрисовке
+        for prop in sorted(props, key=lambda prop: prop.rect.bottom):
+            for col, row in self.covered_chunks(prop.rect):
+                chunk = self.chunks.get((col, row))
+                if chunk is None:
+                    # Пропы непрозрачные, поэтому вместо попиксельной альфы
+                    # хватает colorkey с RLE - такие чанки блитятся в разы быстрее
+                    chunk = SurfaceFactory.create(self.chunk_rect(col, row).size, alpha=False)
+                    chunk.fill(PROP_COLORKEY)
+                    self.chunks[(col, row)] = chunk
+                chunk.blit(prop.image, (prop.rect.x - col * self.chunk_size,
+                                        prop.rect.y - row * self.chunk_size))
+
+        for chunk in self.chunks.values():
+            chunk.set_colorkey(PROP_COLORKEY, pygame.RLEACCEL)
+
+    def covered_chunks(self, rect):
+        """Чанки, на которые попадает проп"""
+        rect = rect.clip(pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT))
+        if not rect.width or not rect.height:
+            return
+        for col in range(rect.left // self.chunk_size, (rect.right - 1) // self.chunk_size + 1):
+            for row in range(rect.top // self.chunk_size, (rect.bottom - 1) // self.chunk_size + 1):
+                yield col, row
+
+
+class Minimap:
+    """Миникарта: статичный слой уровня + точки мусора, обновляемые с частотой refresh_hz"""
+    # Цвета препятствий на карте
+    obstacle_colors = {
+        "building": (110, 110, 120),
+        "toxic": (150, 50, 200),
+        "cactus": (60, 140, 60),
+    }
+
+    def __init__(self, size=MINIMAP_SIZE, refresh_hz=MINIMAP_REFRESH_HZ):
+        self.size = size
+        self.scale_x = size / WORLD_WIDTH
+        self.scale_y = size / WORLD_HEIGHT
+        self.refresh_interval = 1 / refresh_hz  # Секунды реального времени, не кадры отрисовки
+        self.static = None  # Пересобирается в build() на каждом уровне
+        self.image = None
+        self.markers = {}  # Мусор -> (позиция на карте, цвет)
+        self.next_refresh = 0.0  # time.perf_counter() следующего обновления точек
+        self.dirty = True
+        self.player_pos = None
+        self.view = None  # Рамка видимой области камеры на карте
+
+    def to_map(self, x, y):
+        """Мировые координаты -> координаты на карте"""
+        return int(x * self.scale_x), int(y * self.scale_y)
+
+    def map_rect(self, rect):
+        """Мировой прямоугольник -> прямоугольник на карте (не меньше пикселя)"""
+        x, y = self.to_map(rect.left, rect.top)
+        right, bottom = self.to_map(rect.right, rect.bottom)
+        return pygame.Rect(x, y, max(1, right - x), max(1, bottom - y))
+
+    def build(self, game):
+        """Отрисовать статичный слой уровня (один раз при загрузке)"""
+        size = self.size
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+
+        # Фон с градиентом
+        for i in range(size):
+            alpha = int(200 - (i * 0.5))
+            pygame.draw.rect(image, (20, 20, 20, alpha), (0, i, size, 1))
+
+        # Уменьшенная земля поверх фона
+        ground = pygame.Surface((size, size))
+        for (col, row), chunk in game.ground_layer.chunks.items():
+            target = self.map_rect(game.ground_layer.chunk_rect(col, row))
+            ground.blit(pygame.transform.smoothscale(chunk, target.size), target)
+        ground.set_alpha(110)
+        image.blit(ground, (0, 0))
+
+        # Дороги, река, дома и препятствия
+        for decoration in game.decorations:
+            if isinstance(decoration, Road):
+                image.fill((70, 70, 75), self.map_rect(decoration.rect))
+        for segment in game.river_segments:
+            image.fill(WATER_BLUE, self.map_rect(segment.rect))
+        for house in game.houses:
+            image.fill(BROWN, self.map_rect(house.rect))
+        for obstacle in game.obstacles_group:
+            color = self.obstacle_colors.get(obstacle.obs_type, DARK_GREEN)
+            pygame.draw.circle(image, color, self.to_map(*obstacle.rect.center), 2)
+
+        # Станция
+        if game.recycling_station:
+            sx, sy = self.to_map(*game.recycling_station.rect.center)
+            pygame.draw.rect(image, GREEN, (sx - 4, sy - 4, 8, 8), 0, 2)
+
+        # Рамка и заголовок
+        pygame.draw.rect(image, WHITE, (0, 0, size, size), 3, 5)
+        image.blit(TextCache.render(game.font_tiny, "КАРТА", WHITE), (8, 5))
+
+        self.static = SurfaceFactory.finish(image)
+        self.image = None
+
+    def add_marker(self, trash):
+        """Мусор появился (вызывается из MinimapGroup)"""
+        self.markers[trash] = (self.to_map(*trash.rect.center), RED if trash.needs_drone else YELLOW)
+        self.dirty = True
+
+    def remove_marker(self, trash):
+        """Мусор убран"""
+        self.markers.pop(trash, None)
+        self.dirty = True
+
+    def refresh(self):
+        """Собрать кадр карты: статичный слой + точки"""
+        image = self.static.copy()
+        if self.view:
+            pygame.draw.rect(image, LIGHT_GREEN, self.view, 1)
+        for pos, color in self.markers.values():
+            pygame.draw.circle(image, color, pos, 3)
+        if self.player_pos:
+            pygame.draw.circle(image, BLUE, self.player_pos, 5)
+            pygame.draw.circle(image, WHITE, self.player_pos, 5, 1)
+        self.image = image
+        self.dirty = False
+
+    def draw(self, surface, pos, player, view_rect=None):
+        """Нарисовать карту, обновляя точки не чаще refresh_hz (view_rect - область камеры в мире)"""
+        now = time.perf_counter()
+        if self.image is None or now >= self.next_refresh:
+            self.next_refresh = now + self.refresh_interval
+            player_pos = self.to_map(*player.rect.center) if player else None
+            view = self.map_rect(view_rect).clip(0, 0, self.size, self.size) if view_rect else None
+            if self.image is None or self.dirty or player_pos != self.player_pos or view != self.view:
+                self.player_pos = player_pos
+                self.view = view
+                self.refresh()
+        surface.blit(self.image, pos)
+
+
+class SurfaceFactory:
+    """Создание поверхностей в формате экрана, чтобы блит не конвертировал пиксели
+
+    Статичные поверхности с альфой (кадры атласов, листы персонажей) получают RLEACCEL.
+    """
+    rle = SURFACE_RLE
+    dynamic = weakref.WeakSet()  # Поверхности, которые перерисовываются на месте
+
+    @classmethod
+    def create(cls, size, alpha=True, dynamic=False):
+        """Новая пустая поверхность (dynamic - перерисовывается на месте каждый кадр)"""
+        surface = pygame.Surface(size, pygame.SRCALPHA) if alpha else pygame.Surface(size)
+        surface = cls.finish(surface)
+        if dynamic:
+            cls.dynamic.add(surface)
+        return surface
+
+    @classmethod
+    def finish(cls, surface, static=False):
+        """Привести нарисованную поверхность к формату экрана (static - больше не меняется)"""
+        if pygame.display.get_surface() is None:
+            return surface  # Окна еще нет - конвертировать не во что
+        if surface.get_flags() & pygame.SRCALPHA:
+            surface = surface.convert_alpha()
+            if static and cls.rle:
+                surface.set_alpha(255, pygame.RLEACCEL)
+        else:
+            surface = surface.convert()
+        return surface
+
+    @staticmethod
+    def composite(target, source, pos):
+        """Наложить source на прозрачный слой target в премультиплицированной альфе
+
+        Обычный блит на SRCALPHA смешивает полупрозрачные слои не так, как на экране;
+        собранный так слой рисуется с BLEND_PREMULTIPLIED и дает тот же результат.
+        """
+        target.blit(source.premul_alpha(), pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+
+class SurfaceRenderer:
+    """Бэкенд отрисовки по умолчанию: блит процессором на Surface экрана
+
+    Мир рисуется между begin_world() и end_world() в буфер размера камеры.
+    """
+    scrolling = True  # Фон через ScrollBuffer
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.view = screen
+        self.target = screen
+
+    def set_view_size(self, size):
+        """Размер буфера мира; меньше экрана - растягивается в end_world()"""
+        self.view = self.screen if size == self.screen.get_size() else SurfaceFactory.create(size, alpha=False)
+
+    def get_width(self):
+        return self.target.get_width()
+
+    def get_height(self):
+        return self.target.get_height()
+
+    def begin(self):
+        """Начать кадр"""
+        self.screen.fill(BLACK)
+
+    def begin_world(self):
+        """Дальше рисуется мир (в координатах камеры)"""
+        self.target = self.view
+
+    def end_world(self):
+        """Растянуть буфер мира на экран"""
+        if self.view is not self.screen:
+            pygame.transform.scale(self.view, self.screen.get_size(), self.screen)
+        self.target = self.screen
+
+    def blit(self, image, pos, area=None):
+        self.target.blit(image, pos, area)
+
+    def blits(self, batch, doreturn=False):
+        self.target.blits(batch, doreturn=False)
+
+    def fill(self, color):
+        """Залить экран цветом (RGBA - полупрозрачно)"""
+        overlay = pygame.Surface(self.target.get_size(), pygame.SRCALPHA)
+        overlay.fill(color)
+        self.target.blit(overlay, (0, 0))
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.target, color, rect, width, border_radius)
+
+    def present(self):
+        """Показать кадр"""
+        pygame.display.flip()
+
+
+class TextureRenderer:
+    """Бэкенд на pygame._sdl2.video: кадр собирает Renderer окна из текстур
+
+    Поверхность загружается в текстуру при первом блите и дальше не копируется;
+    поверхности SurfaceFactory.dynamic перезагружаются при каждом блите.
+    Без видеокарты SDL берет программный рендерер, поэтому бэкенд работает и без GPU.
+    """
+    scrolling = False  # Чанки фона уже лежат в текстурах, буфер прокрутки не нужен
+
+    def __init__(self, screen):
+        # Окно открыто с SCALED, у него уже есть рендерер с логическим размером экрана
+        self.renderer = video.Renderer.from_window(video.Window.from_display_module())
+        self.size = screen.get_size()
+        self.textures = weakref.WeakKeyDictionary()  # Surface -> Texture
+        self.view = None  # Текстура-буфер мира при масштабе < 1
+        self.target_size = self.size
+        self.uploads = 0
+
+    def set_view_size(self, size):
+        """Размер буфера мира; меньше экрана - рисуется в текстуру и растягивается"""
+        self.view = None if size == self.size else video.Texture(self.renderer, size, target=True)
+
+    def get_width(self):
+        return self.target_size[0]
+
+    def get_height(self):
+        return self.target_size[1]
+
+    def texture(self, image):
+        """Текстура поверхности (загружается один раз)"""
+        texture = self.textures.get(image)
+        if texture is None or image in SurfaceFactory.dynamic:
+            texture = video.Texture.from_surface(self.renderer, image)
+            self.textures[image] = texture
+            self.uploads += 1
+        return texture
+
+    def begin(self):
+        """Начать кадр"""
+        self.renderer.draw_color = pygame.Color(BLACK)
+        self.renderer.clear()
+
+    def begin_world(self):
+        """Дальше рисуется мир (в координатах камеры)"""
+        if self.view is not None:
+            self.renderer.target = self.view
+            self.target_size = self.view.get_rect().size
+            self.begin()
+
+    def end_world(self):
+        """Растянуть буфер мира на экран"""
+        if self.view is not None:
+            self.renderer.target = None
+            self.view.draw(dstrect=(0, 0, *self.size))
+            self.target_size = self.size
+
+    def blit(self, image, pos, area=None):
+        if area is None:
+            self.texture(image).draw(dstrect=(int(pos[0]), int(pos[1])))
+        else:
+            self.texture(image).draw(srcrect=area, dstrect=(int(pos[0]), int(pos[1]), area[2], area[3]))
+
+    def blits(self, batch, doreturn=False):
+        for image, pos in batch:
+            self.texture(image).draw(dstrect=(int(pos[0]), int(pos[1])))
+
+    def fill(self, color):
+        """Залить экран цветом (RGBA - полупрозрачно)"""
+        self.renderer.draw_blend_mode = pygame.BLENDMODE_BLEND
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect((0, 0, *self.target_size))
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        """Прямоугольник (у текстурного бэкенда без скругления углов)"""
+        self.renderer.draw_color = pygame.Color(color)
+        if width:
+            self.renderer.draw_rect(rect)
+        else:
+            self.renderer.fill_rect(rect)
+
+    def present(self):
+        """Показать кадр"""
+        self.renderer.present()
+
+
+class FrameAtlas:
+    """Общий кэш кадров анимации пропов (по типу и варианту)"""
+    cache = {}
+
+    @classmethod
+    def get(cls, key, render_frame, frame_count=ANIMATION_FRAMES):
+        """Получить кадры варианта, отрисовав их при первом запросе"""
+        frames = cls.cache.get(key)
+        if frames is None:
+            frames = [SurfaceFactory.finish(render_frame(i * math.pi * 2 / frame_count), static=True)
+                      for i in range(frame_count)]
+            cls.cache[key] = frames
+        return frames
+
+    @staticmethod
+    def frame_index(phase, frame_count=ANIMATION_FRAMES):
+        """Номер кадра для фазы синусоиды (период 2π)"""
+        return int(phase % (math.pi * 2) / (math.pi * 2) * frame_count) % frame_count
+
+
+class CharacterSheet:
+    """Общий лист спрайтов персонажей, заполняется по мере надобности"""
+    cache = {}
+
+    @classmethod
+    def get(cls, key, render):
+        """Получить кадр по ключу (класс, направление, фаза шага...)"""
+        image = cls.cache.get(key)
+        if image is None:
+            image = SurfaceFactory.finish(render(), static=True)
+            cls.cache[key] = image
+        return image
+
+
+class EntityPool:
+    """Общий пул временных сущностей (мусор, аптечки, жители) по классу и варианту"""
+    free = {}  # (класс, вариант) -> список свободных экземпляров
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def acquire(cls, entity_cls, *args, **kwargs):
+        """Взять сущность из пула (reset на месте) или создать новую"""
+        key = (entity_cls, entity_cls.pool_variant(*args, **kwargs))
+        free = cls.free.get(key)
+        if free:
+            cls.hits += 1
+            entity = free.pop()
+            entity.reset(*args, **kwargs)
+        else:
+            cls.misses += 1
+            entity = entity_cls(*args, **kwargs)
+        entity.pool_key = key
+        entity.pooled = False
+        return entity
+
+    @classmethod
+    def release(cls, entity):
+        """Убрать сущность из всех групп и вернуть в пул"""
+        entity.kill()
+        if entity.pooled:
+            return
+        entity.pooled = True
+        cls.free.setdefault(entity.pool_key, []).append(entity)
+
+    @classmethod
+    def release_all(cls, group):
+        """Вернуть в пул всю группу"""
+        for entity in group.sprites():
+            cls.release(entity)
+
+    @classmethod
+    def stats(cls):
+        """Счетчики попаданий и промахов пула"""
+        total = cls.hits + cls.misses
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_rate": cls.hits / total if total else 0.0,
+            "free": sum(len(free) for free in cls.free.values()),
+        }
 
 
 class Player(pygame.sprite.Sprite):
     """Игрок с улучшенной графикой"""
+    layer = RenderLayer.ACTORS
+    moving = True  # Перекладывается в пространственном индексе
+
     def __init__(self, x, y, game=None):
         super().__init__()
         self.game = game
         self.width = 40
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
@@ -2182,130 +3392,143 @@ class Player(pygame.sprite.Sprite):
         self.dash_timer = 0  # Таймер активного рывка
         self.dash_direction = (0, 0)  # Направление рывка
 
+        self.sheet_key = None
         self.draw_character()
 
     def draw_character(self):
+        """Выбрать кадр персонажа из общего листа спрайтов"""
+        if self.has_tractor:
+            walk_offset = int(2 * math.sin(self.animation_frame))
+        else:
+            walk_offset = int(3 * math.sin(self.animation_frame))
+
+        # Кадр меняется только при смене направления, шага или груза
+        key = (Player, self.direction, walk_offset, self.has_tractor, self.carrying_trash)
+        if key != self.sheet_key:
+            self.sheet_key = key
+            self.image = CharacterSheet.get(key, lambda: self.render_character(walk_offset))
+
+    def render_character(self, walk_offset):
         """Рисовать персонажа"""
-        self.image.fill((0, 0, 0, 0))
+        image = SurfaceFactory.create((self.width, self.height))
 
         # Если есть трактор - рисуем трактор
         if self.has_tractor:
-            self.draw_tractor()
-            return
+            self.draw_tractor(image, walk_offset)
+            return image
 
         suit_color = (40, 130, 220)
         skin_color = (255, 220, 177)
         helmet_color = (0, 180, 80)
 
-        walk_offset = int(3 * math.sin(self.animation_frame))
-
         if self.direction == 0:  # Вверх
             # Тень
-            pygame.draw.ellipse(self.image, (0, 0, 0, 100), (5, 35, 30, 8))
+            pygame.draw.ellipse(image, (0, 0, 0, 100), (5, 35, 30, 8))
 
-            pygame.draw.ellipse(self.image, skin_color, (12, 8, 16, 16))
-            pygame.draw.arc(self.image, helmet_color, (10, 4, 20, 12), 0, math.pi, 4)
-            pygame.draw.ellipse(self.image, suit_color, (10, 22, 20, 14))
+            pygame.draw.ellipse(image, skin_color, (12, 8, 16, 16))
+            pygame.draw.arc(image, helmet_color, (10, 4, 20, 12), 0, math.pi, 4)
+            pygame.draw.ellipse(image, suit_color, (10, 22, 20, 14))
 
             # Ноги
-            pygame.draw.rect(self.image, suit_color, (12, 32 + walk_offset, 6, 6), 0, 2)
-            pygame.draw.rect(self.image, suit_color, (22, 32 - walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (12, 32 + walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (22, 32 - walk_offset, 6, 6), 0, 2)
 
         elif self.direction == 1:  # Вправо
-            pygame.draw.ellipse(self.image, (0, 0, 0, 100), (5, 35, 30, 8))
+            pygame.draw.ellipse(image, (0, 0, 0, 100), (5, 35, 30, 8))
 
-            pygame.draw.ellipse(self.image, skin_color, (16, 8, 16, 16))
-            pygame.draw.circle(self.image, BLACK, (26, 14), 2)
-            pygame.draw.arc(self.image, helmet_color, (14, 4, 20, 12), 0, math.pi, 4)
-            pygame.draw.ellipse(self.image, suit_color, (12, 22, 22, 14))
+            pygame.draw.ellipse(image, skin_color, (16, 8, 16, 16))
+            pygame.draw.circle(image, BLACK, (26, 14), 2)
+            pygame.draw.arc(image, helmet_color, (14, 4, 20, 12), 0, math.pi, 4)
+            pygame.draw.ellipse(image, suit_color, (12, 22, 22, 14))
 
             # Ноги
-            pygame.draw.rect(self.image, suit_color, (14, 32 + walk_offset, 6, 6), 0, 2)
-            pygame.draw.rect(self.image, suit_color, (24, 32 - walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (14, 32 + walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (24, 32 - walk_offset, 6, 6), 0, 2)
 
         elif self.direction == 2:  # Вниз
-            pygame.draw.ellipse(self.image, (0, 0, 0, 100), (5, 35, 30, 8))
+            pygame.draw.ellipse(image, (0, 0, 0, 100), (5, 35, 30, 8))
 
-            pygame.draw.ellipse(self.image, skin_color, (12, 8, 16, 16))
-            pygame.draw.circle(self.image, BLACK, (16, 14), 2)
-            pygame.draw.circle(self.image, BLACK, (24, 14), 2)
-            pygame.draw.arc(self.image, BLACK, (16, 18, 8, 4), 0, math.pi, 2)
-            pygame.draw.arc(self.image, helmet_color, (10, 4, 20, 12), 0, math.pi, 4)
-            pygame.draw.ellipse(self.image, suit_color, (10, 22, 20, 14))
+            pygame.draw.ellipse(image, skin_color, (12, 8, 16, 16))
+            pygame.draw.circle(image, BLACK, (16, 14), 2)
+            pygame.draw.circle(image, BLACK, (24, 14), 2)
+            pygame.draw.arc(image, BLACK, (16, 18, 8, 4), 0, math.pi, 2)
+            pygame.draw.arc(image, helmet_color, (10, 4, 20, 12), 0, math.pi, 4)
+            pygame.draw.ellipse(image, suit_color, (10, 22, 20, 14))
 
             # Ноги
-            pygame.draw.rect(self.image, suit_color, (12, 32 + walk_offset, 6, 6), 0, 2)
-            pygame.draw.rect(self.image, suit_color, (22, 32 - walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (12, 32 + walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (22, 32 - walk_offset, 6, 6), 0, 2)
 
         else:  # Влево
-            pygame.draw.ellipse(self.image, (0, 0, 0, 100), (5, 35, 30, 8))
+            pygame.draw.ellipse(image, (0, 0, 0, 100), (5, 35, 30, 8))
 
-            pygame.draw.ellipse(self.image, skin_color, (8, 8, 16, 16))
-            pygame.draw.circle(self.image, BLACK, (14, 14), 2)
-            pygame.draw.arc(self.image, helmet_color, (6, 4, 20, 12), 0, math.pi, 4)
-            pygame.draw.ellipse(self.image, suit_color, (6, 22, 22, 14))
+            pygame.draw.ellipse(image, skin_color, (8, 8, 16, 16))
+            pygame.draw.circle(image, BLACK, (14, 14), 2)
+            pygame.draw.arc(image, helmet_color, (6, 4, 20, 12), 0, math.pi, 4)
+            pygame.draw.ellipse(image, suit_color, (6, 22, 22, 14))
 
             # Ноги
-            pygame.draw.rect(self.image, suit_color, (10, 32 + walk_offset, 6, 6), 0, 2)
-            pygame.draw.rect(self.image, suit_color, (20, 32 - walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (10, 32 + walk_offset, 6, 6), 0, 2)
+            pygame.draw.rect(image, suit_color, (20, 32 - walk_offset, 6, 6), 0, 2)
 
         # Мешок
         if self.carrying_trash > 0:
             bag_x = 28 if self.direction == 1 else 4
-            pygame.draw.circle(self.image, (80, 80, 80), (bag_x, 24), 8)
-            pygame.draw.circle(self.image, (60, 60, 60), (bag_x, 24), 8, 2)
+            pygame.draw.circle(image, (80, 80, 80), (bag_x, 24), 8)
+            pygame.draw.circle(image, (60, 60, 60), (bag_x, 24), 8, 2)
 
-            font = pygame.font.Font(None, 16)
-            num = font.render(str(self.carrying_trash), True, WHITE)
+            font = FontRegistry.get(16)
+            num = TextCache.render(font, str(self.carrying_trash), WHITE)
             num_rect = num.get_rect(center=(bag_x, 24))
-            self.image.blit(num, num_rect)
+            image.blit(num, num_rect)
+
+        return image
 
-    def draw_tractor(self):
+    def draw_tractor(self, image, wheel_offset):
         """Рисовать трактор"""
         tractor_color = (200, 50, 50)  # Красный трактор
         wheel_color = (40, 40, 40)
         window_color = (100, 150, 200)
 
         # Тень
-        pygame.draw.ellipse(self.image, (0, 0, 0, 100), (2, 35, 36, 10))
+        pygame.draw.ellipse(image, (0, 0, 0, 100), (2, 35, 36, 10))
 
         # Корпус трактора
-        pygame.draw.rect(self.image, tractor_color, (8, 15, 24, 18), 0, 3)
+        pygame.draw.rect(image, tractor_color, (8, 15, 24, 18), 0, 3)
 
         # Кабина
-        pygame.draw.rect(self.image, tractor_color, (12, 8, 16, 12), 0, 2)
+        pygame.draw.rect(image, tractor_color, (12, 8, 16, 12), 0, 2)
 
         # Окно
         if self.direction == 0:  # Вверх
-            pygame.draw.rect(self.image, window_color, (14, 10, 12, 6), 0, 1)
+            pygame.draw.rect(image, window_color, (14, 10, 12, 6), 0, 1)
         elif self.direction == 1:  # Вправо
-            pygame.draw.rect(self.image, window_color, (18, 10, 8, 6), 0, 1)
+            pygame.draw.rect(image, window_color, (18, 10, 8, 6), 0, 1)
         elif self.direction == 2:  # Вниз
-            pygame.draw.rect(self.image, window_color, (14, 12, 12, 6), 0, 1)
+            pygame.draw.rect(image, window_color, (14, 12, 12, 6), 0, 1)
         else:  # Влево
-            pygame.draw.rect(self.image, window_color, (14, 10, 8, 6), 0, 1)
+            pygame.draw.rect(image, window_color, (14, 10, 8, 6), 0, 1)
 
         # Колеса
-        wheel_offset = int(2 * math.sin(self.animation_frame))
-        pygame.draw.circle(self.image, wheel_color, (12, 32 + wheel_offset), 4)
-        pygame.draw.circle(self.image, wheel_color, (28, 32 + wheel_offset), 4)
-        pygame.draw.circle(self.image, GRAY, (12, 32 + wheel_offset), 2)
-        pygame.draw.circle(self.image, GRAY, (28, 32 + wheel_offset), 2)
+        pygame.draw.circle(image, wheel_color, (12, 32 + wheel_offset), 4)
+        pygame.draw.circle(image, wheel_color, (28, 32 + wheel_offset), 4)
+        pygame.draw.circle(image, GRAY, (12, 32 + wheel_offset), 2)
+        pygame.draw.circle(image, GRAY, (28, 32 + wheel_offset), 2)
 
         # Труба
-        pygame.draw.rect(self.image, DARK_GRAY, (18, 4, 4, 6))
+        pygame.draw.rect(image, DARK_GRAY, (18, 4, 4, 6))
 
         # Контейнер для мусора (сзади)
         if self.carrying_trash > 0:
             container_x = 2 if self.direction == 3 else 30
-            pygame.draw.rect(self.image, (100, 100, 100), (container_x, 18, 8, 12), 0, 2)
-            pygame.draw.rect(self.image, (80, 80, 80), (container_x, 18, 8, 12), 2, 2)
+            pygame.draw.rect(image, (100, 100, 100), (container_x, 18, 8, 12), 0, 2)
+            pygame.draw.rect(image, (80, 80, 80), (container_x, 18, 8, 12), 2, 2)
 
             # Количество мусора
-            font = pygame.font.Font(None, 14)
-            num = font.render(str(self.carrying_trash), True, WHITE)
+            font = FontRegistry.get(14)
+            num = TextCache.render(font, str(self.carrying_trash), WHITE)
             num_rect = num.get_rect(center=(container_x + 4, 24))
-            self.image.blit(num, num_rect)
+            image.blit(num, num_rect)
 
     def perform_dash(self):
         """Выполнить рывок"""
@@ -2313,7 +3536,7 @@ class Player(pygame.sprite.Sprite):
             return False
 
         # Определяем направление dash на основе текущего направления
-        keys = pygame.key.get_pressed()
+        keys = InputSource.pressed()
         dx, dy = 0, 0
 
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -2355,7 +3578,7 @@ class Player(pygame.sprite.Sprite):
 
     def update(self):
         """Обновление"""
-        keys = pygame.key.get_pressed()
+        keys = InputSource.pressed()
         self.vel_x = 0
         self.vel_y = 0
         moving = False
@@ -2442,7 +3665,7 @@ class Player(pygame.sprite.Sprite):
                 if hasattr(trash, 'points'):
                     total_bonus_points += trash.points
 
-                trash.kill()
+                EntityPool.release(trash)
                 self.carrying_trash = min(self.carrying_trash + 1, self.max_trash)
                 collected += 1
 
@@ -2455,8 +3678,19 @@ class Player(pygame.sprite.Sprite):
 
 class Trash(pygame.sprite.Sprite):
     """Мусор с улучшенной графикой"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y, trash_type, level, needs_drone=False, river_trash=False, rarity="normal"):
         super().__init__()
+        self.reset(x, y, trash_type, level, needs_drone, river_trash, rarity)
+
+    @staticmethod
+    def pool_variant(x, y, trash_type, level, needs_drone=False, river_trash=False, rarity="normal"):
+        """Вариант для EntityPool (совпадает с ключом кадров)"""
+        return (trash_type, rarity, needs_drone, river_trash)
+
+    def reset(self, x, y, trash_type, level, needs_drone=False, river_trash=False, rarity="normal"):
+        """Сбросить состояние (при создании и при выдаче из пула)"""
         self.trash_type = trash_type
         self.level = level
         self.needs_drone = needs_drone
@@ -2467,6 +3701,7 @@ class Trash(pygame.sprite.Sprite):
         # Бонусы и характеристики в зависимости от редкости
         if self.rarity == "golden":
             self.points = 30  # Золотой дает больше очков
+            self.damage = 0
             self.glow_color = (255, 215, 0)  # Золотое свечение
         elif self.rarity == "dangerous":
             self.points = 20  # Опасный дает средне очков
@@ -2474,22 +3709,30 @@ class Trash(pygame.sprite.Sprite):
             self.glow_color = (255, 0, 0)  # Красное свечение
         else:  # normal
             self.points = 10  # Обычный мусор
+            self.damage = 0
             self.glow_color = None
 
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        self.pulse = 0
+
+        # Кадры общие для всех экземпляров с тем же видом
+        variant = (self.trash_type, self.rarity, self.needs_drone, self.river_trash)
+        self.frames = FrameAtlas.get(("trash",) + variant, self.render_frame,
+                                     ANIMATION_FRAMES if self.glow_color else 1)
+        self.image = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
-        self.pulse = 0
-        self.draw_trash()
+    def render_frame(self, pulse):
+        """Отрисовать кадр атласа"""
+        image = SurfaceFactory.create((self.size, self.size))
+        self.draw_trash(image, pulse)
+        return image
 
-    def draw_trash(self):
+    def draw_trash(self, image, pulse):
         """Рисовать мусор с улучшенной графикой"""
-        self.image.fill((0, 0, 0, 0))
-
         # Тень
-        pygame.draw.ellipse(self.image, (0, 0, 0, 80), (4, 22, 20, 6))
+        pygame.draw.ellipse(image, (0, 0, 0, 80), (4, 22, 20, 6))
 
         if self.trash_type == "plastic":
             # Пластиковая бутылка (детальная)
@@ -2497,58 +3740,58 @@ class Trash(pygame.sprite.Sprite):
             cap_color = (200, 50, 50)
 
             # Корпус бутылки
-            pygame.draw.rect(self.image, bottle_color, (10, 8, 10, 14), 0, 3)
-            pygame.draw.rect(self.image, (230, 180, 40), (10, 8, 10, 14), 2, 3)
+            pygame.draw.rect(image, bottle_color, (10, 8, 10, 14), 0, 3)
+            pygame.draw.rect(image, (230, 180, 40), (10, 8, 10, 14), 2, 3)
 
             # Горлышко
-            pygame.draw.rect(self.image, bottle_color, (12, 4, 6, 4), 0, 1)
+            pygame.draw.rect(image, bottle_color, (12, 4, 6, 4), 0, 1)
 
             # Крышка
-            pygame.draw.rect(self.image, cap_color, (11, 2, 8, 3), 0, 1)
-            pygame.draw.circle(self.image, (180, 40, 40), (15, 3), 2)
+            pygame.draw.rect(image, cap_color, (11, 2, 8, 3), 0, 1)
+            pygame.draw.circle(image, (180, 40, 40), (15, 3), 2)
 
             # Блики и детали
-            pygame.draw.circle(self.image, (255, 255, 200), (12, 10), 2)
-            pygame.draw.line(self.image, (200, 150, 30), (13, 12), (13, 18), 2)
+            pygame.draw.circle(image, (255, 255, 200), (12, 10), 2)
+            pygame.draw.line(image, (200, 150, 30), (13, 12), (13, 18), 2)
 
             # Этикетка
-            pygame.draw.rect(self.image, (255, 255, 255), (11, 14, 8, 4))
+            pygame.draw.rect(image, (255, 255, 255), (11, 14, 8, 4))
 
         elif self.trash_type == "bottle":
             # Стеклянная бутылка
             glass_color = (100, 180, 120)
 
             # Корпус
-            pygame.draw.rect(self.image, glass_color, (9, 10, 12, 13), 0, 2)
+            pygame.draw.rect(image, glass_color, (9, 10, 12, 13), 0, 2)
 
             # Горлышко
-            pygame.draw.rect(self.image, glass_color, (11, 5, 8, 6), 0, 1)
+            pygame.draw.rect(image, glass_color, (11, 5, 8, 6), 0, 1)
 
             # Блики стекла
-            pygame.draw.circle(self.image, (200, 255, 220), (12, 12), 3)
-            pygame.draw.line(self.image, (150, 220, 180), (10, 14), (10, 20), 2)
+            pygame.draw.circle(image, (200, 255, 220), (12, 12), 3)
+            pygame.draw.line(image, (150, 220, 180), (10, 14), (10, 20), 2)
 
             # Обводка
-            pygame.draw.rect(self.image, (70, 130, 90), (9, 10, 12, 13), 2, 2)
+            pygame.draw.rect(image, (70, 130, 90), (9, 10, 12, 13), 2, 2)
 
         elif self.trash_type == "can":
             # Алюминиевая банка
             can_color = (180, 180, 200)
 
             # Корпус банки
-            pygame.draw.ellipse(self.image, can_color, (8, 8, 14, 16), 0)
+            pygame.draw.ellipse(image, can_color, (8, 8, 14, 16), 0)
 
             # Металлические полосы
             for y in range(10, 22, 3):
-                pygame.draw.line(self.image, (150, 150, 170), (8, y), (22, y), 1)
+                pygame.draw.line(image, (150, 150, 170), (8, y), (22, y), 1)
 
             # Язычок открывания
-            pygame.draw.rect(self.image, (140, 140, 160), (13, 6, 4, 3), 0, 1)
-            pygame.draw.circle(self.image, (120, 120, 140), (15, 7), 2)
+            pygame.draw.rect(image, (140, 140, 160), (13, 6, 4, 3), 0, 1)
+            pygame.draw.circle(image, (120, 120, 140), (15, 7), 2)
 
             # Блики металла
-            pygame.draw.line(self.image, (220, 220, 240), (10, 10), (10, 20), 2)
-            pygame.draw.circle(self.image, WHITE, (18, 12), 2)
+            pygame.draw.line(image, (220, 220, 240), (10, 10), (10, 20), 2)
+            pygame.draw.circle(image, WHITE, (18, 12), 2)
 
         elif self.trash_type == "paper":
             # Мятая бумага
@@ -2556,84 +3799,86 @@ class Trash(pygame.sprite.Sprite):
 
             # Основа мятой бумаги (неровная)
             points = [(6, 8), (10, 6), (16, 7), (22, 9), (21, 15), (18, 22), (12, 23), (7, 20), (5, 14)]
-            pygame.draw.polygon(self.image, paper_color, points, 0)
-            pygame.draw.polygon(self.image, (200, 200, 180), points, 2)
+            pygame.draw.polygon(image, paper_color, points, 0)
+            pygame.draw.polygon(image, (200, 200, 180), points, 2)
 
             # Складки
-            pygame.draw.line(self.image, (220, 220, 200), (8, 10), (15, 18), 1)
-            pygame.draw.line(self.image, (220, 220, 200), (12, 8), (18, 20), 1)
-            pygame.draw.line(self.image, (220, 220, 200), (16, 9), (10, 20), 1)
+            pygame.draw.line(image, (220, 220, 200), (8, 10), (15, 18), 1)
+            pygame.draw.line(image, (220, 220, 200), (12, 8), (18, 20), 1)
+            pygame.draw.line(image, (220, 220, 200), (16, 9), (10, 20), 1)
 
             # Текст на бумаге
             for i in range(3):
                 y = 12 + i * 4
-                pygame.draw.line(self.image, (100, 100, 100), (9, y), (18, y), 1)
+                pygame.draw.line(image, (100, 100, 100), (9, y), (18, y), 1)
 
         elif self.trash_type == "glass":
             # Разбитое стекло
             glass_color = (150, 200, 255)
 
             # Осколки
-            pygame.draw.polygon(self.image, glass_color, [(8, 12), (14, 8), (18, 14), (12, 20)], 0)
-            pygame.draw.polygon(self.image, BLUE, [(8, 12), (14, 8), (18, 14), (12, 20)], 2)
+            pygame.draw.polygon(image, glass_color, [(8, 12), (14, 8), (18, 14), (12, 20)], 0)
+            pygame.draw.polygon(image, BLUE, [(8, 12), (14, 8), (18, 14), (12, 20)], 2)
 
             # Блики
-            pygame.draw.circle(self.image, WHITE, (13, 11), 3)
-            pygame.draw.circle(self.image, (200, 230, 255), (15, 15), 2)
+            pygame.draw.circle(image, WHITE, (13, 11), 3)
+            pygame.draw.circle(image, (200, 230, 255), (15, 15), 2)
 
             # Острые края
-            pygame.draw.line(self.image, (100, 150, 200), (14, 8), (18, 14), 2)
+            pygame.draw.line(image, (100, 150, 200), (14, 8), (18, 14), 2)
 
         elif self.trash_type == "metal":
             # Металлолом
             metal_color = (140, 140, 140)
 
             # Ржавый металл
-            pygame.draw.rect(self.image, metal_color, (7, 7, 16, 16), 0, 2)
+            pygame.draw.rect(image, metal_color, (7, 7, 16, 16), 0, 2)
 
             # Ржавчина
             rust_color = (180, 100, 60)
-            pygame.draw.circle(self.image, rust_color, (10, 10), 3)
-            pygame.draw.circle(self.image, rust_color, (18, 18), 4)
-            pygame.draw.circle(self.image, (160, 80, 40), (14, 14), 2)
+            pygame.draw.circle(image, rust_color, (10, 10), 3)
+            pygame.draw.circle(image, rust_color, (18, 18), 4)
+            pygame.draw.circle(image, (160, 80, 40), (14, 14), 2)
 
             # Металлические линии
             for i in range(4):
                 c = (100 + i * 15, 100 + i * 15, 100 + i * 15)
-                pygame.draw.line(self.image, c, (9, 10 + i * 3), (21, 10 + i * 3))
+                pygame.draw.line(image, c, (9, 10 + i * 3), (21, 10 + i * 3))
 
         # Свечение для редкого мусора
         if self.glow_color:
-            pulse_size = int(abs(math.sin(self.pulse)) * 4)
+            pulse_size = int(abs(math.sin(pulse)) * 4)
             for i in range(3):
                 alpha = 60 - i * 15
                 radius = self.size // 2 + pulse_size + i * 2
-                glow_surf = pygame.Surface((self.size + i * 6, self.size + i * 6), pygame.SRCALPHA)
+                glow_surf = SurfaceFactory.create((self.size + i * 6, self.size + i * 6))
                 pygame.draw.circle(glow_surf, (*self.glow_color, alpha),
                                  (self.size // 2 + i * 3, self.size // 2 + i * 3), radius)
-                self.image.blit(glow_surf, (-i * 3, -i * 3))
+                image.blit(glow_surf, (-i * 3, -i * 3))
 
         # Индикатор для мусора требующего дрон
         if self.needs_drone:
-            pygame.draw.rect(self.image, RED, (0, 0, self.size, self.size), 3, 3)
-            font = pygame.font.Font(None, 14)
-            d_text = font.render("D", True, RED)
-            self.image.blit(d_text, (2, 2))
+            pygame.draw.rect(image, RED, (0, 0, self.size, self.size), 3, 3)
+            font = FontRegistry.get(14)
+            d_text = TextCache.render(font, "D", RED)
+            image.blit(d_text, (2, 2))
 
         # Индикатор мусора блокирующего ручей
         if self.river_trash:
-            pygame.draw.circle(self.image, (0, 150, 255), (self.size - 5, 5), 4)
-            pygame.draw.circle(self.image, WHITE, (self.size - 5, 5), 4, 1)
+            pygame.draw.circle(image, (0, 150, 255), (self.size - 5, 5), 4)
+            pygame.draw.circle(image, WHITE, (self.size - 5, 5), 4, 1)
 
     def update(self):
         self.pulse += 0.1
-        # Перерисовываем если есть свечение (для анимации)
+        # Анимация свечения - просто выбор кадра
         if self.glow_color:
-            self.draw_trash()
+            self.image = self.frames[FrameAtlas.frame_index(self.pulse)]
 
 
 class Obstacle(pygame.sprite.Sprite):
     """Препятствия с красивой графикой"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y, obs_type):
         super().__init__()
         self.obs_type = obs_type
@@ -2650,13 +3895,25 @@ class Obstacle(pygame.sprite.Sprite):
         }
 
         self.width, self.height = sizes.get(obs_type, (64, 80))
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
         self.glow = 0
-        self.draw_obstacle()
+        if self.toxic:
+            # Кадры свечения общие для всех бочек
+            self.frames = FrameAtlas.get(("toxic",), self.render_frame)
+            self.image = self.frames[0]
+        else:
+            self.draw_obstacle()
+            self.image = SurfaceFactory.finish(self.image, static=True)
+
+    def render_frame(self, glow):
+        """Отрисовать кадр атласа токсичной бочки"""
+        image = SurfaceFactory.create((self.width, self.height))
+        self.draw_toxic(image, glow)
+        return image
 
     def draw_obstacle(self):
         """Рисовать препятствие"""
@@ -2757,24 +4014,7 @@ class Obstacle(pygame.sprite.Sprite):
                     pygame.draw.rect(self.image, window_color, (wx, wy, 12, 8), 0, 2)
 
         elif self.obs_type == "toxic":
-            # Анимированное свечение
-            glow_val = int(60 + 40 * math.sin(self.glow))
-            toxic_color = (140 + glow_val, 0, 240 - glow_val)
-
-            # Бочка
-            pygame.draw.ellipse(self.image, toxic_color, (8, 8, 32, 32))
-            pygame.draw.ellipse(self.image, (255, 0, 255), (8, 8, 32, 32), 3)
-
-            # Полосы опасности
-            for i in range(3):
-                y = 14 + i * 8
-                pygame.draw.rect(self.image, YELLOW, (10, y, 28, 3))
-                pygame.draw.rect(self.image, BLACK, (10, y + 3, 28, 2))
-
-            # Знак
-            font = pygame.font.Font(None, 32)
-            warning = font.render("!", True, YELLOW)
-            self.image.blit(warning, (18, 12))
+            self.draw_toxic(self.image, self.glow)
 
         elif self.obs_type == "cactus":
             # Тень
@@ -2793,21 +4033,50 @@ class Obstacle(pygame.sprite.Sprite):
                 ny = random.randint(16, self.height - 10)
                 pygame.draw.circle(self.image, (40, 100, 40), (nx, ny), 1)
 
+    def draw_toxic(self, image, glow):
+        """Рисовать токсичную бочку"""
+        # Анимированное свечение
+        glow_val = int(60 + 40 * math.sin(glow))
+        toxic_color = (140 + glow_val, 0, 240 - glow_val)
+
+        # Бочка
+        pygame.draw.ellipse(image, toxic_color, (8, 8, 32, 32))
+        pygame.draw.ellipse(image, (255, 0, 255), (8, 8, 32, 32), 3)
+
+        # Полосы опасности
+        for i in range(3):
+            y = 14 + i * 8
+            pygame.draw.rect(image, YELLOW, (10, y, 28, 3))
+            pygame.draw.rect(image, BLACK, (10, y + 3, 28, 2))
+
+        # Знак
+        font = FontRegistry.get(32)
+        warning = TextCache.render(font, "!", YELLOW)
+        image.blit(warning, (18, 12))
+
     def update(self):
         if self.toxic:
             self.glow += 0.1
             if self.glow >= math.pi * 2:
                 self.glow = 0
-            self.draw_obstacle()
+            self.image = self.frames[FrameAtlas.frame_index(self.glow)]
 
 
 class Decoration(pygame.sprite.Sprite):
     """Декорации"""
+    layer = RenderLayer.DECALS
+    static_prop = True  # Запекается в PropLayer при загрузке уровня
+
     def __init__(self, x, y, deco_type, level):
         super().__init__()
         self.deco_type = deco_type
         self.level = level
 
+        # Высокие фонари сортируются по Y вместе с персонажами
+        if deco_type == "streetlight":
+            self.layer = RenderLayer.ACTORS
+            self.static_prop = False
+
         # Размеры
         sizes = {
             "bush": (32, 24), "rock": (24, 20), "flower": (16, 16),
@@ -2817,7 +4086,7 @@ class Decoration(pygame.sprite.Sprite):
         }
 
         self.width, self.height = sizes.get(deco_type, (32, 32))
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -2861,69 +4130,79 @@ class Decoration(pygame.sprite.Sprite):
 
 class RecyclingStation(pygame.sprite.Sprite):
     """Станция переработки - улучшенная"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y):
         super().__init__()
         self.width = 80
         self.height = 80
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.glow = 0
-        self.draw_station()
+        self.frames = FrameAtlas.get(("recycling_station",), self.render_frame)
+        self.image = self.frames[0]
 
-    def draw_station(self):
-        """Рисовать станцию"""
-        self.image.fill((0, 0, 0, 0))
+    def render_frame(self, glow):
+        """Отрисовать кадр атласа"""
+        image = SurfaceFactory.create((self.width, self.height))
+        self.draw_station(image, glow)
+        return image
 
+    def draw_station(self, image, glow):
+        """Рисовать станцию"""
         # Тень
-        pygame.draw.ellipse(self.image, (0, 0, 0, 100), (10, 70, 60, 10))
+        pygame.draw.ellipse(image, (0, 0, 0, 100), (10, 70, 60, 10))
 
         # Здание
         building_color = (0, 140, 40)
-        pygame.draw.rect(self.image, building_color, (12, 24, 56, 56), 0, 5)
-        pygame.draw.rect(self.image, DARK_GREEN, (12, 24, 56, 56), 4, 5)
+        pygame.draw.rect(image, building_color, (12, 24, 56, 56), 0, 5)
+        pygame.draw.rect(image, DARK_GREEN, (12, 24, 56, 56), 4, 5)
 
         # Крыша
         roof_points = [(12, 24), (40, 8), (68, 24)]
-        pygame.draw.polygon(self.image, DARK_GREEN, roof_points)
-        pygame.draw.polygon(self.image, FOREST_GREEN, roof_points, 2)
+        pygame.draw.polygon(image, DARK_GREEN, roof_points)
+        pygame.draw.polygon(image, FOREST_GREEN, roof_points, 2)
 
         # Дверь
-        pygame.draw.rect(self.image, BROWN, (32, 48, 16, 32), 0, 3)
-        pygame.draw.circle(self.image, YELLOW, (44, 64), 2)
+        pygame.draw.rect(image, BROWN, (32, 48, 16, 32), 0, 3)
+        pygame.draw.circle(image, YELLOW, (44, 64), 2)
 
         # Окна
-        pygame.draw.rect(self.image, SKY_BLUE, (20, 32, 12, 12), 0, 2)
-        pygame.draw.rect(self.image, SKY_BLUE, (48, 32, 12, 12), 0, 2)
+        pygame.draw.rect(image, SKY_BLUE, (20, 32, 12, 12), 0, 2)
+        pygame.draw.rect(image, SKY_BLUE, (48, 32, 12, 12), 0, 2)
 
         # Символ переработки с анимацией
-        glow_val = int(200 + 55 * math.sin(self.glow))
+        glow_val = int(200 + 55 * math.sin(glow))
         symbol_color = (0, glow_val, 0)
 
-        pygame.draw.circle(self.image, symbol_color, (40, 16), 6, 2)
+        pygame.draw.circle(image, symbol_color, (40, 16), 6, 2)
         # Стрелки
         points1 = [(40, 10), (37, 14), (40, 14)]
         points2 = [(43, 18), (40, 20), (43, 22)]
-        pygame.draw.polygon(self.image, symbol_color, points1)
-        pygame.draw.polygon(self.image, symbol_color, points2)
+        pygame.draw.polygon(image, symbol_color, points1)
+        pygame.draw.polygon(image, symbol_color, points2)
 
     def update(self):
         self.glow += 0.1
         if self.glow >= math.pi * 2:
             self.glow = 0
-        self.draw_station()
+        self.image = self.frames[FrameAtlas.frame_index(self.glow)]
 
 
 class Drone(pygame.sprite.Sprite):
     """Дрон - улучшенный"""
+    layer = RenderLayer.ACTORS
+    moving = True  # Перекладывается в пространственном индексе
+
     def __init__(self, player):
         super().__init__()
         self.player = player
         self.active = False
         self.width = 40
         self.height = 28
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height), dynamic=True)
         self.rect = self.image.get_rect()
         self.hover_offset = 0
         self.propeller_frame = 0
@@ -2993,19 +4272,22 @@ class Drone(pygame.sprite.Sprite):
         collect_rect = self.rect.inflate(70, 70)
         for trash in trash_group:
             if trash.needs_drone and collect_rect.colliderect(trash.rect):
-                trash.kill()
+                EntityPool.release(trash)
                 return True
         return False
 
 
 class Road(pygame.sprite.Sprite):
     """Дорога для города"""
+    layer = RenderLayer.DECALS
+    static_prop = True  # Запекается в PropLayer при загрузке уровня
+
     def __init__(self, x, y, width, height, orientation='horizontal'):
         super().__init__()
         self.width = width
         self.height = height
         self.orientation = orientation
-        self.image = pygame.Surface((width, height))
+        self.image = SurfaceFactory.create((width, height), alpha=False)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -3030,11 +4312,13 @@ class Road(pygame.sprite.Sprite):
 
 class NPC(pygame.sprite.Sprite):
     """NPC который хвалит игрока"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y, name="Азамат"):
         super().__init__()
         self.width = 35
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -3059,34 +4343,37 @@ class NPC(pygame.sprite.Sprite):
             (150, 50, 200)   # Фиолетовый
         ])
 
-        self.draw_npc()
+        # NPC одного цвета делят один кадр
+        self.image = CharacterSheet.get((NPC, self.shirt_color), self.render_npc)
 
-    def draw_npc(self):
+    def render_npc(self):
         """Рисовать NPC"""
-        self.image.fill((0, 0, 0, 0))
+        image = SurfaceFactory.create((self.width, self.height))
 
         skin_color = (255, 220, 177)
         pants_color = (50, 50, 100)
 
         # Тень
-        pygame.draw.ellipse(self.image, (0, 0, 0, 100), (3, 36, 29, 7))
+        pygame.draw.ellipse(image, (0, 0, 0, 100), (3, 36, 29, 7))
 
         # Голова
-        pygame.draw.ellipse(self.image, skin_color, (10, 5, 15, 15))
+        pygame.draw.ellipse(image, skin_color, (10, 5, 15, 15))
 
         # Глаза
-        pygame.draw.circle(self.image, BLACK, (14, 11), 2)
-        pygame.draw.circle(self.image, BLACK, (21, 11), 2)
+        pygame.draw.circle(image, BLACK, (14, 11), 2)
+        pygame.draw.circle(image, BLACK, (21, 11), 2)
 
         # Улыбка
-        pygame.draw.arc(self.image, BLACK, (12, 12, 11, 8), 0, math.pi, 2)
+        pygame.draw.arc(image, BLACK, (12, 12, 11, 8), 0, math.pi, 2)
 
         # Тело
-        pygame.draw.ellipse(self.image, self.shirt_color, (8, 19, 19, 14))
+        pygame.draw.ellipse(image, self.shirt_color, (8, 19, 19, 14))
 
         # Ноги
-        pygame.draw.rect(self.image, pants_color, (10, 30, 6, 8), 0, 2)
-        pygame.draw.rect(self.image, pants_color, (19, 30, 6, 8), 0, 2)
+        pygame.draw.rect(image, pants_color, (10, 30, 6, 8), 0, 2)
+        pygame.draw.rect(image, pants_color, (19, 30, 6, 8), 0, 2)
+
+        return image
 
     def check_player_nearby(self, player, distance=100):
         """Проверить близость игрока"""
@@ -3111,11 +4398,14 @@ class NPC(pygame.sprite.Sprite):
 
 class Litterer(pygame.sprite.Sprite):
     """Враг-мусорщик, который ходит и бросает мусор"""
+    layer = RenderLayer.ACTORS
+    moving = True  # Перекладывается в пространственном индексе
+
     def __init__(self, x, y, world_width, world_height, level=1):
         super().__init__()
         self.width = 35
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -3149,56 +4439,68 @@ class Litterer(pygame.sprite.Sprite):
         self.star_rotation = 0  # Для анимации звездочек
 
         # Рисуем злодея (темные цвета)
+        self.sheet_key = None
         self.draw_litterer()
 
     def draw_litterer(self):
+        """Выбрать кадр мусорщика из общего листа спрайтов"""
+        # Звездочки вращаются с шагом 5 градусов - не больше 72 кадров
+        star_phase = self.star_rotation % 360 if self.stunned else 0
+        key = (Litterer, self.stunned, star_phase)
+        if key != self.sheet_key:
+            self.sheet_key = key
+            self.image = CharacterSheet.get(key, lambda: self.render_litterer(star_phase))
+
+    def render_litterer(self, star_rotation):
         """Рисовать мусорщика"""
-        self.image.fill((0, 0, 0, 0))
+        image = SurfaceFactory.create((self.width, self.height))
 
         if self.stunned:
             # Присевший злодей
             # Голова (темная, ниже)
-            pygame.draw.circle(self.image, (80, 60, 40), (17, 18), 10)
+            pygame.draw.circle(image, (80, 60, 40), (17, 18), 10)
 
             # Закрытые глаза (крестики)
-            pygame.draw.line(self.image, BLACK, (11, 16), (15, 20), 2)
-            pygame.draw.line(self.image, BLACK, (15, 16), (11, 20), 2)
-            pygame.draw.line(self.image, BLACK, (19, 16), (23, 20), 2)
-            pygame.draw.line(self.image, BLACK, (23, 16), (19, 20), 2)
+            pygame.draw.line(image, BLACK, (11, 16), (15, 20), 2)
+            pygame.draw.line(image, BLACK, (15, 16), (11, 20), 2)
+            pygame.draw.line(image, BLACK, (19, 16), (23, 20), 2)
+            pygame.draw.line(image, BLACK, (23, 16), (19, 20), 2)
 
             # Тело (присевший, короче)
-            pygame.draw.rect(self.image, (40, 40, 40), (7, 26, 20, 10))
+            pygame.draw.rect(image, (40, 40, 40), (7, 26, 20, 10))
 
             # Ноги (согнутые)
-            pygame.draw.rect(self.image, (30, 30, 30), (10, 36, 5, 4))
-            pygame.draw.rect(self.image, (30, 30, 30), (19, 36, 5, 4))
+            pygame.draw.rect(image, (30, 30, 30), (10, 36, 5, 4))
+            pygame.draw.rect(image, (30, 30, 30), (19, 36, 5, 4))
 
             # Звездочки над головой (вращающиеся)
-            self.draw_stars()
+            self.draw_stars(image, star_rotation)
         else:
             # Обычный злодей
             # Голова (темная)
-            pygame.draw.circle(self.image, (80, 60, 40), (17, 12), 10)
+            pygame.draw.circle(image, (80, 60, 40), (17, 12), 10)
 
             # Злобные глаза
-            pygame.draw.circle(self.image, (255, 0, 0), (13, 10), 2)
-            pygame.draw.circle(self.image, (255, 0, 0), (21, 10), 2)
+            pygame.draw.circle(image, (255, 0, 0), (13, 10), 2)
+            pygame.draw.circle(image, (255, 0, 0), (21, 10), 2)
 
             # Тело (грязная одежда)
-            pygame.draw.rect(self.image, (40, 40, 40), (7, 20, 20, 15))
+            pygame.draw.rect(image, (40, 40, 40), (7, 20, 20, 15))
 
             # Ноги
-            pygame.draw.rect(self.image, (30, 30, 30), (10, 35, 5, 5))
-            pygame.draw.rect(self.image, (30, 30, 30), (19, 35, 5, 5))
+            pygame.draw.rect(image, (30, 30, 30), (10, 35, 5, 5))
+            pygame.draw.rect(image, (30, 30, 30), (19, 35, 5, 5))
 
             # Мусор в руке (коричневый мешок)
-            pygame.draw.circle(self.image, (100, 70, 30), (28, 25), 4)
+            pygame.draw.circle(image, (100, 70, 30), (28, 25), 4)
+
+        return image
 
-    def draw_stars(self):
+    def draw_stars(self, image, star_rotation):
         """Рисовать звездочки над головой"""
         # 3 звездочки кружатся над головой
         for i in range(3):
-            angle = self.star_rotation + (i * 120)  # 3 звезды на 120 градусов друг от друга
+            angle = star_rotation + (i * 120)  # 3 звезды на 120 градусов друг от друга
             rad = math.radians(angle)
             x = 17 + int(math.cos(rad) * 15)
             y = 5 + int(math.sin(rad) * 8)
@@ -3207,14 +4509,14 @@ class Litterer(pygame.sprite.Sprite):
             star_size = 4
             points = []
             for j in range(10):
-                star_angle = math.pi / 2 + j * math.pi / 5 + math.radians(self.star_rotation)
+                star_angle = math.pi / 2 + j * math.pi / 5 + math.radians(star_rotation)
                 radius = star_size if j % 2 == 0 else star_size // 2
                 px = x + int(math.cos(star_angle) * radius)
                 py = y + int(math.sin(star_angle) * radius)
                 points.append((px, py))
 
-            pygame.draw.polygon(self.image, YELLOW, points)
-            pygame.draw.polygon(self.image, ORANGE, points, 1)
+            pygame.draw.polygon(image, YELLOW, points)
+            pygame.draw.polygon(image, ORANGE, points, 1)
 
     def get_stunned(self):
         """Оглушить мусорщика"""
@@ -3282,11 +4584,14 @@ class Litterer(pygame.sprite.Sprite):
 
 class AdvancedDrone(pygame.sprite.Sprite):
     """Продвинутый дрон с pathfinding по клику мыши"""
+    layer = RenderLayer.ACTORS
+    moving = True  # Перекладывается в пространственном индексе
+
     def __init__(self, player):
         super().__init__()
         self.width = 30
         self.height = 24
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height), dynamic=True)
         self.rect = self.image.get_rect()
         self.player = player
         self.rect.centerx = player.rect.centerx
@@ -3359,7 +4664,7 @@ class AdvancedDrone(pygame.sprite.Sprite):
         for trash in trash_group:
             if collect_rect.colliderect(trash.rect):
                 self.collected_trash.append(trash)
-                trash.kill()
+                EntityPool.release(trash)
                 return True
         return False
 
@@ -3380,10 +4685,13 @@ class AdvancedDrone(pygame.sprite.Sprite):
 
 class GrassTile(pygame.sprite.Sprite):
     """Трава для леса"""
+    layer = RenderLayer.DECALS
+    static_prop = True  # Запекается в PropLayer при загрузке уровня
+
     def __init__(self, x, y):
         super().__init__()
         self.size = random.randint(30, 50)
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.size, self.size))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -3414,21 +4722,31 @@ class GrassTile(pygame.sprite.Sprite):
 
 class PoisonPlant(pygame.sprite.Sprite):
     """Ядовитое растение которое замедляет игрока"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y):
         super().__init__()
         self.width = 32
         self.height = 32
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.glow = 0
-        self.draw_plant()
 
-    def draw_plant(self):
-        """Рисовать ядовитое растение (похоже на траву но с фиолетовым оттенком)"""
-        self.image.fill((0, 0, 0, 0))
+        # Несколько вариантов расположения листьев, кадры общие
+        self.variant = random.randrange(POISON_PLANT_VARIANTS)
+        self.frames = FrameAtlas.get(("poison_plant", self.variant), self.render_frame)
+        self.image = self.frames[0]
 
+    def render_frame(self, glow):
+        """Отрисовать кадр атласа (раскладка листьев фиксирована для варианта)"""
+        image = SurfaceFactory.create((self.width, self.height))
+        self.draw_plant(image, glow, random.Random(self.variant))
+        return image
+
+    def draw_plant(self, image, glow, rng):
+        """Рисовать ядовитое растение (похоже на траву но с фиолетовым оттенком)"""
         # Ядовитый цвет (темно-зеленый с фиолетовым)
         poison_color = (60, 100, 80)
         highlight_color = (120, 60, 150)  # Фиолетовый
@@ -3436,74 +4754,91 @@ class PoisonPlant(pygame.sprite.Sprite):
         # Стебель
         for i in range(5):
             stalk_x = 8 + i * 5
-            pygame.draw.line(self.image, poison_color,
+            pygame.draw.line(image, poison_color,
                            (stalk_x, 28), (stalk_x, 10), 3)
 
         # Листья с фиолетовым свечением
-        glow_intensity = int(abs(math.sin(self.glow)) * 50)
+        glow_intensity = int(abs(math.sin(glow)) * 50)
         glow_color = (poison_color[0] + glow_intensity,
                      poison_color[1],
                      poison_color[2] + glow_intensity)
 
         for i in range(6):
             leaf_x = 5 + i * 4
-            leaf_y = 15 + random.randint(-3, 3)
-            pygame.draw.circle(self.image, glow_color, (leaf_x, leaf_y), 4)
+            leaf_y = 15 + rng.randint(-3, 3)
+            pygame.draw.circle(image, glow_color, (leaf_x, leaf_y), 4)
 
         # Яркие фиолетовые точки (споры)
         for i in range(3):
-            spore_x = random.randint(8, 24)
-            spore_y = random.randint(8, 20)
-            pygame.draw.circle(self.image, highlight_color, (spore_x, spore_y), 2)
+            spore_x = rng.randint(8, 24)
+            spore_y = rng.randint(8, 20)
+            pygame.draw.circle(image, highlight_color, (spore_x, spore_y), 2)
 
     def update(self):
         self.glow += 0.05
         if self.glow > math.pi * 2:
             self.glow = 0
-        self.draw_plant()
+        self.image = self.frames[FrameAtlas.frame_index(self.glow)]
 
 
 class HealingStation(pygame.sprite.Sprite):
     """Аптечка для лечения отравления"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y):
         super().__init__()
         self.width = 40
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
+        self.frames = FrameAtlas.get(("healing_station",), self.render_frame)
+        self.rect = self.frames[0].get_rect()
+        self.reset(x, y)
+
+    @staticmethod
+    def pool_variant(x, y):
+        """Вариант для EntityPool (аптечки одинаковые)"""
+        return None
+
+    def reset(self, x, y):
+        """Сбросить состояние (при создании и при выдаче из пула)"""
         self.rect.x = x
         self.rect.y = y
         self.pulse = 0
-        self.draw_station()
+        self.image = self.frames[0]
 
-    def draw_station(self):
-        """Рисовать аптечку"""
-        self.image.fill((0, 0, 0, 0))
+    def render_frame(self, pulse):
+        """Отрисовать кадр атласа"""
+        image = SurfaceFactory.create((self.width, self.height))
+        self.draw_station(image, pulse)
+        return image
 
+    def draw_station(self, image, pulse):
+        """Рисовать аптечку"""
         # Пульсация
-        pulse_size = int(3 * abs(math.sin(self.pulse)))
+        pulse_size = int(3 * abs(math.sin(pulse)))
 
         # Белый фон аптечки
         box_rect = pygame.Rect(5 - pulse_size, 5 - pulse_size,
                               30 + pulse_size * 2, 30 + pulse_size * 2)
-        pygame.draw.rect(self.image, WHITE, box_rect, 0, 5)
-        pygame.draw.rect(self.image, RED, box_rect, 3, 5)
+        pygame.draw.rect(image, WHITE, box_rect, 0, 5)
+        pygame.draw.rect(image, RED, box_rect, 3, 5)
 
         # Красный крест
         # Вертикальная линия
-        pygame.draw.rect(self.image, RED, (17, 10, 6, 20), 0, 2)
+        pygame.draw.rect(image, RED, (17, 10, 6, 20), 0, 2)
         # Горизонтальная линия
-        pygame.draw.rect(self.image, RED, (10, 17, 20, 6), 0, 2)
+        pygame.draw.rect(image, RED, (10, 17, 20, 6), 0, 2)
 
     def update(self):
         self.pulse += 0.1
         if self.pulse > math.pi * 2:
             self.pulse = 0
-        self.draw_station()
+        self.image = self.frames[FrameAtlas.frame_index(self.pulse)]
 
 
 class RiverSegment(pygame.sprite.Sprite):
     """Сегмент ручья"""
+    layer = RenderLayer.WATER
+
     def __init__(self, x, y, width, height, flowing=False, angle=0, is_blockage_point=False):
         super().__init__()
         self.width = width
@@ -3511,76 +4846,115 @@ class RiverSegment(pygame.sprite.Sprite):
         self.flowing = flowing
         self.angle = angle  # Угол течения
         self.is_blockage_point = is_blockage_point  # Точка блокировки мусором
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.wave_offset = random.random() * math.pi * 2
+        self.flow_frames = None  # Вырезы ленты волн, берутся при первом кадре течения
 
         # Сила течения (для физики)
         self.flow_strength = 2.0 if flowing else 0
         self.flow_direction_x = math.cos(angle + math.pi / 2)  # Перпендикулярно углу
         self.flow_direction_y = math.sin(angle + math.pi / 2)
 
-        self.draw_water()
-
-    def draw_water(self):
-        """Рисовать воду"""
+        # Стоячая вода рисуется один раз с фиксированным зерном (без мерцания)
+        self.draw_stagnant(random.Random(x * WORLD_HEIGHT + y))
+        self.image = SurfaceFactory.finish(self.image, static=True)
+        if self.flowing:
+            self.draw_water()
+
+    @staticmethod
+    def render_flow_frame(width, height, wave_offset):
+        """Отрисовать кадр текущей воды"""
+        image = SurfaceFactory.create((width, height))
+        base_blue = WATER_BLUE
+
+        # Волны
+        for y in range(0, height, 3):
+            wave = int(10 * math.sin(wave_offset + y * 0.2))
+            color_var = int(20 * abs(math.sin(wave_offset + y * 0.1)))
+            water_color = (
+                base_blue[0] + color_var,
+                base_blue[1] + color_var,
+                base_blue[2] + color_var
+            )
+            pygame.draw.rect(image, water_color, (wave, y, width - wave, 3))
+
+        return image
+
+    @classmethod
+    def flow_strip(cls, width, height):
+        """Кадры ленты волн для ширины ручья, не ниже height (строка волны зависит только от y)"""
+        key = ("river", width)
+        frames = FrameAtlas.cache.get(key)
+        if frames is None or frames[0].get_height() < height:
+            FrameAtlas.cache.pop(key, None)
+            frames = FrameAtlas.get(key, lambda wave_offset: cls.render_flow_frame(width, height, wave_offset))
+        return frames
+
+    @classmethod
+    def bake_flow(cls, segments):
+        """Запечь по одной ленте на ширину - высотой с самый длинный сегмент"""
+        heights = {}
+        for segment in segments:
+            heights[segment.width] = max(heights.get(segment.width, 0), segment.height)
+        for width, height in heights.items():
+            cls.flow_strip(width, height)
+
+    def draw_stagnant(self, rng):
+        """Рисовать стоячую воду"""
         self.image.fill((0, 0, 0, 0))
 
-        if self.flowing:
-            # Текущая вода (анимированная)
-            base_blue = WATER_BLUE
-
-            # Волны
-            for y in range(0, self.height, 3):
-                wave = int(10 * math.sin(self.wave_offset + y * 0.2))
-                color_var = int(20 * abs(math.sin(self.wave_offset + y * 0.1)))
-                water_color = (
-                    base_blue[0] + color_var,
-                    base_blue[1] + color_var,
-                    base_blue[2] + color_var
-                )
-                pygame.draw.rect(self.image, water_color, (wave, y, self.width - wave, 3))
-        else:
-            # Стоячая вода (тусклая)
-            stagnant_color = (40, 80, 100)
-            pygame.draw.rect(self.image, stagnant_color, (0, 0, self.width, self.height))
+        # Стоячая вода (тусклая)
+        stagnant_color = (40, 80, 100)
+        pygame.draw.rect(self.image, stagnant_color, (0, 0, self.width, self.height))
 
-            # Темные пятна (загрязнение)
-            for i in range(5):
-                x = random.randint(0, self.width - 10)
-                y = random.randint(0, self.height - 10)
-                pygame.draw.circle(self.image, (30, 60, 70), (x, y), random.randint(3, 8))
-
-            # Если это точка блокировки - рисуем дополнительное загрязнение
-            if self.is_blockage_point:
-                # Более темная, грязная вода в центре
-                blockage_color = (25, 50, 60)
-                center_y = self.height // 2
-                pygame.draw.ellipse(self.image, blockage_color,
-                                  (5, center_y - 30, self.width - 10, 60))
-
-                # Мусорные пятна
-                for i in range(10):
-                    x = random.randint(10, self.width - 10)
-                    y = random.randint(center_y - 25, center_y + 25)
-                    size = random.randint(2, 6)
-                    mud_color = (20 + random.randint(0, 20),
-                               40 + random.randint(0, 20),
-                               50 + random.randint(0, 20))
-                    pygame.draw.circle(self.image, mud_color, (x, y), size)
+        # Темные пятна (загрязнение)
+        for i in range(5):
+            x = rng.randint(0, self.width - 10)
+            y = rng.randint(0, self.height - 10)
+            pygame.draw.circle(self.image, (30, 60, 70), (x, y), rng.randint(3, 8))
+
+        # Если это точка блокировки - рисуем дополнительное загрязнение
+        if self.is_blockage_point:
+            # Более темная, грязная вода в центре
+            blockage_color = (25, 50, 60)
+            center_y = self.height // 2
+            pygame.draw.ellipse(self.image, blockage_color,
+                              (5, center_y - 30, self.width - 10, 60))
+
+            # Мусорные пятна
+            for i in range(10):
+                x = rng.randint(10, self.width - 10)
+                y = rng.randint(center_y - 25, center_y + 25)
+                size = rng.randint(2, 6)
+                mud_color = (20 + rng.randint(0, 20),
+                           40 + rng.randint(0, 20),
+                           50 + rng.randint(0, 20))
+                pygame.draw.circle(self.image, mud_color, (x, y), size)
+
+    def draw_water(self):
+        """Выбрать кадр текущей воды"""
+        # Кадры - вырезы общей ленты волн этой ширины (у каждого сегмента своя фаза)
+        if self.flow_frames is None:
+            self.flow_frames = [frame.subsurface((0, 0, self.width, self.height))
+                                for frame in RiverSegment.flow_strip(self.width, self.height)]
+        self.image = self.flow_frames[FrameAtlas.frame_index(self.wave_offset)]
 
     def update(self):
         self.wave_offset += 0.1
         if self.wave_offset > math.pi * 2:
             self.wave_offset = 0
-        self.draw_water()
+        # Стоячая вода статична - анимируется только течение
+        if self.flowing:
+            self.draw_water()
 
     def start_flowing(self):
         """Начать течение"""
         self.flowing = True
         self.flow_strength = 2.0
+        self.draw_water()
 
     def apply_current_to_player(self, player):
         """Проверить состояние воды под игроком"""
@@ -3600,61 +4974,219 @@ class RiverSegment(pygame.sprite.Sprite):
             player.rect.y += self.flow_direction_y * self.flow_strength
 
 
-class WaterFlowParticle(pygame.sprite.Sprite):
-    """Частица воды для эффекта течения"""
-    def __init__(self, x, y):
-        super().__init__()
-        self.size = random.randint(2, 5)
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (100, 180, 255), (self.size // 2, self.size // 2), self.size // 2)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        self.vel_x = random.uniform(1, 3)
-        self.vel_y = random.uniform(0.5, 1.5)
-        self.lifetime = random.randint(30, 60)
+class ParticleSystem:
+    """Частицы в массивах NumPy: одно векторное обновление и пакетная отрисовка
+
+    Живые частицы ограничены бюджетом по категориям (EFFECT_BUDGETS), а большие
+    всплески растягиваются на несколько кадров (EFFECT_EMIT_PER_FRAME).
+    """
+    def __init__(self, capacity=MAX_PARTICLES, quality=EFFECT_QUALITY):
+        self.capacity = capacity
+        self.count = 0  # Живые частицы всегда лежат в начале массивов
+
+        self.pos = np.zeros((capacity, 2), np.float32)  # Левый верхний угол точки
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.gravity = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.int32)
+        self.dot = np.zeros(capacity, np.int32)  # Номер заготовки (цвет и размер)
+        self.category = np.zeros(capacity, np.int8)  # EffectCategory.value
+
+        # Заготовки точек: палитра цветов x размеры
+        self.palette = {}  # цвет -> номер в палитре
+        self.dots = []
+
+        # Бюджет эффектов
+        self.set_quality(quality)
+        self.live = [0] * len(EffectCategory)
+        self.dropped = [0] * len(EffectCategory)  # Сброшено из-за бюджета
+        self.deferred = [0] * len(EffectCategory)  # Отложено на следующие кадры
+        self.pending = []  # Отложенные всплески: [параметры, сколько осталось]
+        self.frame_budget = EFFECT_EMIT_PER_FRAME
+
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def set_quality(self, quality):
+        """Пересчитать лимиты категорий для уровня качества"""
+        self.quality = quality
+        scale = EFFECT_QUALITY_SCALE[quality]
+        self.caps = {category: int(cap * scale) for category, cap in EFFECT_BUDGETS.items()}
+
+    def clear(self):
+        """Убрать все частицы (при загрузке уровня)"""
+        self.count = 0
+        self.live = [0] * len(EffectCategory)
+        self.pending.clear()
+        self.frame_budget = EFFECT_EMIT_PER_FRAME
+        # Зерно берем из random, чтобы частицы повторялись при фиксированном seed
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def color_index(self, color):
+        """Номер цвета в палитре (заготовки точек рисуются один раз)"""
+        index = self.palette.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette[color] = index
+            for size in range(MAX_PARTICLE_SIZE + 1):
+                dot = pygame.Surface((max(size, 1), max(size, 1)), pygame.SRCALPHA)
+                pygame.draw.circle(dot, color, (size // 2, size // 2), size // 2)
+                self.dots.append(SurfaceFactory.finish(dot, static=True))
+        return index
+
+    def emit(self, x, y, color, n=1, spread=(0, 0), flow=False, category=EffectCategory.FEEDBACK):
+        """Выпустить n частиц; color - цвет или список цветов (случайный для каждой)
+
+        flow=True - частицы течения воды, разбросанные по области spread от (x, y).
+        Сверх лимита кадра частицы откладываются, сверх бюджета категории - сбрасываются.
+        """
+        burst = (x, y, color, spread, flow, category)
+        now = min(n, self.frame_budget)
+        if n > now:
+            self.pending.append([burst, n - now])
+            self.deferred[category.value] += n - now
+        return self.spawn(burst, now)
+
+    def admit(self, category, n):
+        """Сколько из n частиц пропустить с учетом бюджета категории и приоритета"""
+        allowed = min(n, self.caps[category] - self.live[category.value])
+        shortage = allowed - (self.capacity - self.count)
+        if shortage > 0:
+            # Массив заполнен - вытесняем частицы менее важных категорий
+            self.evict(shortage, EFFECT_PRIORITY[category])
+            allowed = min(allowed, self.capacity - self.count)
+        allowed = max(allowed, 0)
+        self.dropped[category.value] += n - allowed
+        return allowed
+
+    def evict(self, n, priority):
+        """Убрать до n самых старых частиц с приоритетом ниже заданного"""
+        keep = np.ones(self.count, bool)
+        for category in sorted(EffectCategory, key=EFFECT_PRIORITY.get):
+            if n <= 0 or EFFECT_PRIORITY[category] >= priority:
+                break
+            victims = np.flatnonzero(self.category[:self.count] == category.value)[:n]
+            keep[victims] = False
+            self.dropped[category.value] += len(victims)
+            n -= len(victims)
+        if not keep.all():
+            self.compact(keep)
+
+    def spawn(self, burst, n):
+        """Создать частицы всплеска в пределах бюджета"""
+        x, y, color, spread, flow, category = burst
+        n = self.admit(category, n)
+        if n <= 0:
+            return 0
+        rng = self.rng
+        new = slice(self.count, self.count + n)
+
+        if flow:
+            size = rng.integers(2, 6, n)
+            self.pos[new, 0] = x + rng.integers(0, spread[0] + 1, n)
+            self.pos[new, 1] = y + rng.integers(0, spread[1] + 1, n)
+            self.vel[new, 0] = rng.uniform(1, 3, n)
+            self.vel[new, 1] = rng.uniform(0.5, 1.5, n)
+            self.gravity[new] = 0
+            self.life[new] = rng.integers(30, 61, n)
+        else:
+            # Разлет вверх с гравитацией, центр точки в (x, y)
+            size = rng.integers(3, 7, n)
+            self.pos[new, 0] = x + rng.integers(0, spread[0] + 1, n) - size // 2
+            self.pos[new, 1] = y + rng.integers(0, spread[1] + 1, n) - size // 2
+            self.vel[new, 0] = rng.uniform(-3, 3, n)
+            self.vel[new, 1] = rng.uniform(-4, -1, n)
+            self.gravity[new] = 0.2
+            self.life[new] = rng.integers(20, 41, n)
+
+        if isinstance(color, list):
+            indices = np.array([self.color_index(c) for c in color])
+            color_ids = indices[rng.integers(0, len(indices), n)]
+        else:
+            color_ids = self.color_index(color)
+        self.dot[new] = color_ids * (MAX_PARTICLE_SIZE + 1) + size
+        self.category[new] = category.value
+
+        self.count += n
+        self.live[category.value] += n
+        self.frame_budget -= n
+        return n
+
+    def compact(self, keep):
+        """Сжать массивы, оставив отмеченные частицы подряд в начале"""
+        n = self.count
+        alive_count = int(keep.sum())
+        for array in (self.pos, self.vel, self.gravity, self.life, self.dot, self.category):
+            array[:alive_count] = array[:n][keep]
+        self.count = alive_count
+        self.live = np.bincount(self.category[:alive_count], minlength=len(EffectCategory)).tolist()
 
     def update(self):
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.kill()
-
+        """Сдвинуть все частицы, убрать погасшие и выпустить отложенные"""
+        n = self.count
+        if n:
+            self.pos[:n] += self.vel[:n]
+            self.vel[:n, 1] += self.gravity[:n]
+            self.life[:n] -= 1
+
+            alive = self.life[:n] > 0
+            if not alive.all():
+                self.compact(alive)
+
+        # Новый лимит кадра, сначала - отложенные всплески важных категорий
+        self.frame_budget = EFFECT_EMIT_PER_FRAME
+        if self.pending:
+            self.pending.sort(key=lambda entry: -EFFECT_PRIORITY[entry[0][5]])
+            for entry in self.pending:
+                if self.frame_budget <= 0:
+                    break
+                chunk = min(entry[1], self.frame_budget)
+                self.spawn(entry[0], chunk)
+                entry[1] -= chunk
+            self.pending = [entry for entry in self.pending if entry[1] > 0]
+
+    def stats(self):
+        """Счетчики по категориям для настройки лимитов"""
+        return {
+            category.name.lower(): {
+                "live": self.live[category.value],
+                "cap": self.caps[category],
+                "dropped": self.dropped[category.value],
+                "deferred": self.deferred[category.value],
+                "pending": sum(entry[1] for entry in self.pending if entry[0][5] is category),
+            }
+            for category in EffectCategory
+        }
 
-class Particle(pygame.sprite.Sprite):
-    """Частицы с улучшенной графикой"""
-    def __init__(self, x, y, color):
-        super().__init__()
-        self.size = random.randint(3, 6)
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (self.size // 2, self.size // 2), self.size // 2)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.vel_x = random.uniform(-3, 3)
-        self.vel_y = random.uniform(-4, -1)
-        self.lifetime = random.randint(20, 40)
+    def draw(self, surface, camera, shake_offset=(0, 0)):
+        """Нарисовать видимые частицы одним вызовом blits"""
+        n = self.count
+        if not n:
+            return
+        screen_pos = self.pos[:n] - (camera.x - shake_offset[0], camera.y - shake_offset[1])
+        visible = ((screen_pos[:, 0] > -MAX_PARTICLE_SIZE) & (screen_pos[:, 0] < surface.get_width()) &
+                   (screen_pos[:, 1] > -MAX_PARTICLE_SIZE) & (screen_pos[:, 1] < surface.get_height()))
+        coords = screen_pos[visible].astype(np.int32).tolist()
+        dots = self.dots
+        surface.blits([(dots[i], pos) for i, pos in zip(self.dot[:n][visible].tolist(), coords)],
+                      doreturn=False)
 
-    def update(self):
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        self.vel_y += 0.2
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            self.kill()
+    def __len__(self):
+        return self.count
 
 
 class House(pygame.sprite.Sprite):
     """Деревенский дом"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y):
         super().__init__()
         self.width = 80
         self.height = 90
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.draw_house()
+        self.image = SurfaceFactory.finish(self.image, static=True)
 
     def draw_house(self):
         """Рисовать дом"""
@@ -3718,11 +5250,13 @@ class Quest:
 
 class QuestGiver(pygame.sprite.Sprite):
     """НПС дающий квесты (светится желтым)"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y, quest):
         super().__init__()
         self.width = 40
         self.height = 50
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -3730,49 +5264,59 @@ class QuestGiver(pygame.sprite.Sprite):
         self.has_quest = True
         self.glow_offset = 0
         self.interaction_distance = 60
+        self.sheet_key = None
         self.draw_npc()
 
     def draw_npc(self):
+        """Выбрать кадр НПС из общего листа спрайтов"""
+        glow_radius = int(25 + 5 * abs(math.sin(self.glow_offset))) if self.has_quest else 0
+        key = (QuestGiver, self.has_quest, glow_radius)
+        if key != self.sheet_key:
+            self.sheet_key = key
+            self.image = CharacterSheet.get(key, lambda: self.render_npc(glow_radius))
+
+    def render_npc(self, glow_radius):
         """Рисовать НПС"""
-        self.image.fill((0, 0, 0, 0))
+        image = SurfaceFactory.create((self.width, self.height))
 
         # Желтое свечение если есть квест
         if self.has_quest:
-            glow_radius = int(25 + 5 * abs(math.sin(self.glow_offset)))
             glow_color = (255, 215, 0, 80)
-            pygame.draw.circle(self.image, glow_color, (20, 30), glow_radius)
+            pygame.draw.circle(image, glow_color, (20, 30), glow_radius)
 
         # Тело НПС (фермер)
         skin_color = (255, 220, 177)
         clothes_color = (100, 150, 100)
 
         # Тень
-        pygame.draw.ellipse(self.image, (0, 0, 0, 100), (8, 45, 24, 8))
+        pygame.draw.ellipse(image, (0, 0, 0, 100), (8, 45, 24, 8))
 
         # Голова
-        pygame.draw.ellipse(self.image, skin_color, (12, 10, 16, 16))
+        pygame.draw.ellipse(image, skin_color, (12, 10, 16, 16))
 
         # Шляпа (соломенная)
         hat_color = (210, 180, 140)
-        pygame.draw.arc(self.image, hat_color, (8, 8, 24, 16), 0, math.pi, 6)
+        pygame.draw.arc(image, hat_color, (8, 8, 24, 16), 0, math.pi, 6)
 
         # Глаза
-        pygame.draw.circle(self.image, BLACK, (16, 16), 2)
-        pygame.draw.circle(self.image, BLACK, (24, 16), 2)
+        pygame.draw.circle(image, BLACK, (16, 16), 2)
+        pygame.draw.circle(image, BLACK, (24, 16), 2)
 
         # Улыбка
-        pygame.draw.arc(self.image, BLACK, (14, 18, 12, 8), 0, math.pi, 2)
+        pygame.draw.arc(image, BLACK, (14, 18, 12, 8), 0, math.pi, 2)
 
         # Тело
-        pygame.draw.ellipse(self.image, clothes_color, (10, 24, 20, 18))
+        pygame.draw.ellipse(image, clothes_color, (10, 24, 20, 18))
 
         # Руки
-        pygame.draw.rect(self.image, clothes_color, (6, 28, 6, 10), 0, 2)
-        pygame.draw.rect(self.image, clothes_color, (28, 28, 6, 10), 0, 2)
+        pygame.draw.rect(image, clothes_color, (6, 28, 6, 10), 0, 2)
+        pygame.draw.rect(image, clothes_color, (28, 28, 6, 10), 0, 2)
 
         # Ноги
-        pygame.draw.rect(self.image, (60, 40, 20), (12, 38, 6, 10), 0, 2)
-        pygame.draw.rect(self.image, (60, 40, 20), (22, 38, 6, 10), 0, 2)
+        pygame.draw.rect(image, (60, 40, 20), (12, 38, 6, 10), 0, 2)
+        pygame.draw.rect(image, (60, 40, 20), (22, 38, 6, 10), 0, 2)
+
+        return image
 
     def update(self):
         self.glow_offset += 0.1
@@ -3787,61 +5331,82 @@ class QuestGiver(pygame.sprite.Sprite):
 
 class QuestObjective(pygame.sprite.Sprite):
     """Объект квеста (мусорный бак, урна и т.д.)"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y, quest_id):
         super().__init__()
         self.width = 32
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.quest_id = quest_id
         self.glow_offset = 0
         self.collected = False
-        self.draw_bin()
+        self.image = self.get_frames()[0]
 
-    def draw_bin(self):
-        """Рисовать мусорный бак"""
-        self.image.fill((0, 0, 0, 0))
+    def get_frames(self):
+        """Кадры для текущего состояния (со свечением или без)"""
+        return FrameAtlas.get(("quest_bin", self.collected), self.render_frame)
+
+    def render_frame(self, glow_offset):
+        """Отрисовать кадр атласа"""
+        image = SurfaceFactory.create((self.width, self.height))
+        self.draw_bin(image, glow_offset)
+        return image
 
+    def draw_bin(self, image, glow_offset):
+        """Рисовать мусорный бак"""
         # Свечение (желто-зеленое)
         if not self.collected:
-            glow_radius = int(20 + 4 * abs(math.sin(self.glow_offset)))
+            glow_radius = int(20 + 4 * abs(math.sin(glow_offset)))
             glow_color = (255, 255, 0, 100)
-            pygame.draw.circle(self.image, glow_color, (16, 20), glow_radius)
+            pygame.draw.circle(image, glow_color, (16, 20), glow_radius)
 
         # Мусорный бак (серый металлический)
         bin_color = (120, 120, 130)
-        pygame.draw.rect(self.image, bin_color, (6, 10, 20, 26), 0, 3)
+        pygame.draw.rect(image, bin_color, (6, 10, 20, 26), 0, 3)
 
         # Крышка
         lid_color = (100, 100, 110)
-        pygame.draw.ellipse(self.image, lid_color, (4, 8, 24, 8))
-        pygame.draw.circle(self.image, (80, 80, 90), (16, 12), 3)
+        pygame.draw.ellipse(image, lid_color, (4, 8, 24, 8))
+        pygame.draw.circle(image, (80, 80, 90), (16, 12), 3)
 
         # Полосы на баке
         for i in range(15, 35, 6):
-            pygame.draw.line(self.image, (140, 140, 150), (6, i), (26, i), 1)
+            pygame.draw.line(image, (140, 140, 150), (6, i), (26, i), 1)
 
         # Символ переработки
         recycle_color = GREEN
-        pygame.draw.circle(self.image, recycle_color, (16, 22), 6, 2)
-        pygame.draw.polygon(self.image, recycle_color,
+        pygame.draw.circle(image, recycle_color, (16, 22), 6, 2)
+        pygame.draw.polygon(image, recycle_color,
                           [(16, 18), (16, 26), (13, 22)])
 
     def update(self):
         self.glow_offset += 0.15
-        self.draw_bin()
+        self.image = self.get_frames()[FrameAtlas.frame_index(self.glow_offset)]
 
 
 class CelebratingVillager(pygame.sprite.Sprite):
     """Житель деревни празднующий восстановление реки"""
+    layer = RenderLayer.ACTORS
+
     def __init__(self, x, y):
         super().__init__()
         self.width = 30
         self.height = 40
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.image = SurfaceFactory.create((self.width, self.height))
         self.rect = self.image.get_rect()
+        self.reset(x, y)
+
+    @staticmethod
+    def pool_variant(x, y):
+        """Вариант для EntityPool (цвета выбираются в reset)"""
+        return None
+
+    def reset(self, x, y):
+        """Сбросить состояние (при создании и при выдаче из пула)"""
         self.rect.x = x
         self.rect.y = y
         self.jump_offset = 0
@@ -3857,53 +5422,79 @@ class CelebratingVillager(pygame.sprite.Sprite):
             (100, 200, 100),
             (200, 150, 50)
         ])
+        self.sheet_key = None
 
     def draw_villager(self):
-        """Рисовать празднующего жителя"""
-        self.image.fill((0, 0, 0, 0))
-
+        """Выбрать кадр жителя из общего листа спрайтов"""
         jump_y = int(8 * abs(math.sin(self.jump_offset)))
+        key = (CelebratingVillager, self.skin_color, self.clothes_color, jump_y)
+        if key != self.sheet_key:
+            self.sheet_key = key
+            self.image = CharacterSheet.get(key, lambda: self.render_villager(jump_y))
+
+    def render_villager(self, jump_y):
+        """Рисовать празднующего жителя"""
+        image = SurfaceFactory.create((self.width, self.height))
 
         # Тень
         shadow_size = 20 - jump_y // 2
-        pygame.draw.ellipse(self.image, (0, 0, 0, 80),
+        pygame.draw.ellipse(image, (0, 0, 0, 80),
                           (5, 36, shadow_size, 6))
 
         y_offset = -jump_y
 
         # Голова
-        pygame.draw.ellipse(self.image, self.skin_color,
+        pygame.draw.ellipse(image, self.skin_color,
                           (8, 8 + y_offset, 14, 14))
 
         # Глаза (счастливые)
-        pygame.draw.circle(self.image, BLACK, (12, 14 + y_offset), 2)
-        pygame.draw.circle(self.image, BLACK, (18, 14 + y_offset), 2)
+        pygame.draw.circle(image, BLACK, (12, 14 + y_offset), 2)
+        pygame.draw.circle(image, BLACK, (18, 14 + y_offset), 2)
 
         # Широкая улыбка
-        pygame.draw.arc(self.image, BLACK, (10, 16 + y_offset, 10, 6),
+        pygame.draw.arc(image, BLACK, (10, 16 + y_offset, 10, 6),
                        0, math.pi, 2)
 
         # Тело
-        pygame.draw.ellipse(self.image, self.clothes_color,
+        pygame.draw.ellipse(image, self.clothes_color,
                           (7, 20 + y_offset, 16, 12))
 
         # Руки вверх (празднование!)
-        pygame.draw.line(self.image, self.clothes_color,
+        pygame.draw.line(image, self.clothes_color,
                         (9, 24 + y_offset), (5, 18 + y_offset), 4)
-        pygame.draw.line(self.image, self.clothes_color,
+        pygame.draw.line(image, self.clothes_color,
                         (21, 24 + y_offset), (25, 18 + y_offset), 4)
 
         # Ноги
-        pygame.draw.rect(self.image, (60, 40, 20),
+        pygame.draw.rect(image, (60, 40, 20),
                         (10, 30 + y_offset, 4, 8), 0, 2)
-        pygame.draw.rect(self.image, (60, 40, 20),
+        pygame.draw.rect(image, (60, 40, 20),
                         (16, 30 + y_offset, 4, 8), 0, 2)
 
+        return image
+
     def update(self):
         self.jump_offset += self.jump_speed
         self.draw_villager()
 
 
+def parse_args():
+    """Аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="Eco Ranger")
+    parser.add_argument("--headless", action="store_true",
+                        help="без окна и звука, уровень проигрывается по сценарию (ECO_RANGER_HEADLESS=1)")
+    parser.add_argument("--level", type=int, default=1, help="уровень безоконного прогона")
+    parser.add_argument("--steps", type=int, default=None, help="шагов симуляции (по умолчанию до конца уровня)")
+    parser.add_argument("--draw", action="store_true", help="рисовать кадры в безоконном прогоне")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     game = Game()
-    game.run()
+    if HEADLESS:
+        result = game.run_headless(args.level, args.steps, args.draw)
+        print(" ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                       for key, value in result.items()))
+    else:
+        game.run()